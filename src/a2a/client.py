@@ -99,16 +99,36 @@ class A2AClient:
         )
         response.raise_for_status()
         
-        client = sseclient.SSEClient(response)
-        for event in client.events():
-            if event.event == "chunk":
-                yield json.loads(event.data)
-            elif event.event == "completed":
-                yield json.loads(event.data)
-            elif event.event == "status_changed":
-                yield json.loads(event.data)
-            elif event.event == "message_added":
-                yield json.loads(event.data)
+        # Closing the iterator early closes the connection, which cancels the task
+        try:
+            client = sseclient.SSEClient(response)
+            for event in client.events():
+                if event.event == "chunk":
+                    yield json.loads(event.data)
+                elif event.event == "completed":
+                    yield json.loads(event.data)
+                elif event.event == "status_changed":
+                    yield json.loads(event.data)
+                elif event.event == "message_added":
+                    yield json.loads(event.data)
+        finally:
+            response.close()
+    
+    def cancel_task(self, task_id: str) -> Dict[str, Any]:
+        """
+        Cancel a task.
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            The response
+        """
+        response = requests.post(f"{self.endpoint}/tasks/{task_id}/cancel")
+        if response.status_code == 409:
+            return response.json()
+        response.raise_for_status()
+        return response.json()
     
     def process_webhook(self, data: Dict[str, Any]) -> None:
         """
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Any, Callable
 from a2a.core.mcp.mcp_client import MCPClient
 from a2a.core.mcp.mcp_server import MCPServer
 from a2a.core.mcp.mcp_schemas import MCPToolDefinition
+from a2a.core.event_loop import await_in_loop, run_coroutine
 
 # Configure logging
 logging.basicConfig(
@@ -69,10 +70,8 @@ class A2AMCPBridge:
             
         logger.info(f"Registering MCP tool '{tool_name}' as A2A skill")
             
-        # Ensure tools are discovered
-        if not self.mcp_client.available_tools:
-            logger.debug("No tools discovered yet, fetching from MCP server")
-            await self.mcp_client.list_tools()
+        # Ensure tools are discovered; a fresh cached catalog is used as is
+        await self.mcp_client.get_tools()
             
         if tool_name not in self.mcp_client.available_tools:
             logger.error(f"MCP tool not found: {tool_name}")
@@ -140,7 +139,7 @@ class A2AMCPBridge:
         
         # Execute the MCP tool
         try:
-            result = await self.mcp_client.execute_tool(tool_name, params)
+            result = await await_in_loop(self.mcp_client.execute_tool(tool_name, params))
             
             if result.error:
                 logger.error(f"MCP tool execution failed: {result.error}")
@@ -171,6 +170,18 @@ class A2AMCPBridge:
                 "error": str(e)
             }
         
+    def process_a2a_task_with_mcp_sync(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process an A2A task using MCP tools from synchronous code.
+        
+        Args:
+            task: The A2A task
+            
+        Returns:
+            The result of processing the task
+        """
+        return run_coroutine(self.process_a2a_task_with_mcp(task))
+        
     async def expose_agent_skills_as_mcp_tools(self, skills: List[Dict[str, Any]]) -> List[MCPToolDefinition]:
         """
         Expose agent's A2A skills as MCP tools.
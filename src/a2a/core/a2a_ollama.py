@@ -7,16 +7,30 @@ This module provides the main functionality for integrating Ollama with Google's
 import json
 import uuid
 import time
-from typing import Dict, List, Optional, Union, Any, Generator, Iterator
+import asyncio
+import threading
+import concurrent.futures
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Union, Any, Generator, Iterator, AsyncIterator, Tuple, Set, Collection
 
 import ollama
-from ollama import Client
 
 from a2a.core.agent_card import AgentCard
 from a2a.core.task_manager import TaskManager
 from a2a.core.message_handler import MessageHandler
 from a2a.core.mcp.mcp_client import MCPClient
 from a2a.core.a2a_ia_algorithm_interface import IA2AIAAlgorithm
+from a2a.core.concurrency import ConcurrencyLimiter
+from a2a.core.response_cache import ResponseCache
+from a2a.core.semantic_cache import SemanticCache
+from a2a.core.metrics import LatencyStats, GenerationMetrics
+from a2a.core.single_flight import SingleFlight
+from a2a.core.tool_calls import ToolCallDetector, extract_tool_calls
+from a2a.core.prompt_builder import PromptBuilder
+from a2a.core.token_budget import TokenBudget
+from a2a.core.resilience import RetryPolicy, CircuitBreakerRegistry
+from a2a.core.host_pool import HostPool
+from a2a.core.event_loop import run_coroutine, iterate_async
 
 class A2AOllama(IA2AIAAlgorithm):
     """
@@ -34,6 +48,23 @@ class A2AOllama(IA2AIAAlgorithm):
         skills: List[Dict[str, Any]],
         host: str = "http://localhost:11434",
         endpoint: str = "http://localhost:8000",
+        max_in_flight: int = 4,
+        concurrency_limiter: Optional[ConcurrencyLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        keep_alive: Optional[Union[float, str]] = "30m",
+        preload: bool = False,
+        keep_warm_interval: Optional[float] = None,
+        coalesce: bool = True,
+        tool_timeout: float = 30.0,
+        max_parallel_tools: int = 4,
+        tool_mode: str = "native",
+        token_budget: Optional[TokenBudget] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        hosts: Optional[List[str]] = None,
+        load_balancing: str = "least_outstanding",
+        health_check_interval: Optional[float] = None,
     ):
         """
         Initialize A2AOllama.
@@ -45,9 +76,42 @@ class A2AOllama(IA2AIAAlgorithm):
             skills: A list of skills the agent has
             host: The Ollama host URL
             endpoint: The endpoint where this agent is accessible
+            max_in_flight: Maximum concurrent generations on the Ollama host
+            concurrency_limiter: Limiter shared with other agents using the same host
+            response_cache: Exact-match cache for model responses (disabled if None)
+            semantic_cache: Embedding-based cache for near-duplicate prompts (disabled if None)
+            keep_alive: How long Ollama keeps the model loaded after each call
+            preload: Load the model into Ollama memory during initialization
+            keep_warm_interval: Seconds between background keep-warm pings (disabled if None)
+            coalesce: Share one generation between identical concurrent requests
+            tool_timeout: Maximum time for a single MCP tool call, in seconds
+            max_parallel_tools: Maximum MCP tool calls run concurrently for one model turn
+            tool_mode: "native" passes MCP tools through Ollama's tools parameter,
+                "text" describes them in the system prompt and parses JSON from the
+                response. Native mode falls back to text for models without tool support
+            token_budget: Token accounting used to trim prompts and cap tool results
+            retry_policy: Backoff policy for failed generations
+            circuit_breakers: Per-host circuit breakers shared with other agents using the same hosts
+            hosts: Ollama host URLs to balance calls over (host is used if None)
+            load_balancing: Host selection strategy, "least_outstanding" or "latency"
+            health_check_interval: Seconds between host health checks (disabled if None)
         """
+        if tool_mode not in ("native", "text"):
+            raise ValueError(f"Unknown tool mode: {tool_mode}")
+            
         self.model = model
-        self.client = Client(host=host)
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        self.host_pool = HostPool(
+            hosts or [host],
+            strategy=load_balancing,
+            circuit_breakers=self.circuit_breakers
+        )
+        self.host = self.host_pool.primary.url
+        self.client = self.host_pool.primary.client
+        self.async_client = self.host_pool.primary.async_client
+        self.concurrency_limiter = concurrency_limiter or ConcurrencyLimiter(
+            max_in_flight_per_host=max_in_flight
+        )
         self.agent_card = AgentCard(
             name=name,
             description=description,
@@ -56,79 +120,1062 @@ class A2AOllama(IA2AIAAlgorithm):
         )
         self.task_manager = TaskManager()
         self.message_handler = MessageHandler()
+        self.prompt_builder = PromptBuilder(name, description)
         self.mcp_client = None
+        self.response_cache = response_cache
+        self.semantic_cache = semantic_cache
+        self.keep_alive = keep_alive
+        self.single_flight = SingleFlight() if coalesce else None
+        self.tool_timeout = tool_timeout
+        self.max_parallel_tools = max_parallel_tools
+        self.tool_mode = tool_mode
+        self.token_budget = token_budget or TokenBudget()
+        self.retry_policy = retry_policy or RetryPolicy()
+        
+        # Latency of generations that had to load the model versus warm ones
+        self.cold_load_threshold = 0.1
+        self.latency = {
+            "cold": LatencyStats(),
+            "warm": LatencyStats()
+        }
+        self.generation_metrics = GenerationMetrics()
+        
+        # Asyncio tasks currently processing each A2A task, for cancellation
+        self._running: Dict[str, Set[asyncio.Task]] = {}
+        self._running_lock = threading.Lock()
+        
+        self._keep_warm_stop = threading.Event()
+        self._keep_warm_thread = None
+        
+        if preload:
+            self.preload_model()
+        if keep_warm_interval:
+            self.start_keep_warm(keep_warm_interval)
+        if health_check_interval:
+            self.host_pool.start_health_checks(health_check_interval)
+    
+    def preload_model(self) -> bool:
+        """
+        Load the configured model into Ollama memory on every host.
+        
+        Ollama loads a model without generating anything when it receives
+        an empty prompt.
+        
+        Returns:
+            True if the model was loaded on every host, False otherwise
+        """
+        loaded = True
+        for host in self.host_pool.hosts:
+            try:
+                started = time.perf_counter()
+                host.client.generate(model=self.model, prompt="", keep_alive=self.keep_alive)
+                print(f"Preloaded model {self.model} on {host.url} in {time.perf_counter() - started:.2f}s")
+            except Exception as e:
+                print(f"Error preloading model {self.model} on {host.url}: {e}")
+                loaded = False
+        return loaded
+    
+    def start_keep_warm(self, interval: float) -> None:
+        """
+        Start a background thread that keeps the model loaded.
+        
+        Args:
+            interval: Seconds between pings, which should be shorter than keep_alive
+        """
+        if self._keep_warm_thread and self._keep_warm_thread.is_alive():
+            return
+            
+        self._keep_warm_stop.clear()
+        
+        def keep_warm():
+            while not self._keep_warm_stop.wait(interval):
+                self.preload_model()
+                
+        self._keep_warm_thread = threading.Thread(target=keep_warm, daemon=True)
+        self._keep_warm_thread.start()
+    
+    def stop_keep_warm(self) -> None:
+        """Stop the background keep-warm thread."""
+        self._keep_warm_stop.set()
+        if self._keep_warm_thread:
+            self._keep_warm_thread.join(timeout=1)
+            self._keep_warm_thread = None
+    
+    def _record_usage(self, task_id: str, response: Dict[str, Any]) -> None:
+        """
+        Record the token counts and timing of a generation on its task.
+        
+        Args:
+            task_id: The task ID
+            response: The final Ollama response or stream chunk
+        """
+        timing = response.get("timing")
+        if timing:
+            self.task_manager.record_generation(task_id, timing)
+            
+        prompt_tokens = response.get("prompt_eval_count")
+        eval_tokens = response.get("eval_count")
+        if prompt_tokens is None and eval_tokens is None:
+            return
+            
+        self.task_manager.record_usage(task_id, prompt_tokens or 0, eval_tokens or 0)
+    
+    def _with_timing(
+        self,
+        response: Any,
+        host: str,
+        queue_wait: float,
+        total_time: float,
+        ttft: Optional[float] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Attach the timing of a generation to its final response and record it.
+        
+        Ollama reports its durations in nanoseconds. Without a streamed first
+        token, the time to first token is taken from Ollama's model load and
+        prompt evaluation durations.
+        
+        Args:
+            response: The final Ollama response or stream chunk
+            host: The host that generated the response
+            queue_wait: Time spent waiting for a concurrency slot, in seconds
+            total_time: Time from sending the request to the final response, in seconds
+            ttft: Time from sending the request to the first streamed token, in seconds
+            stream: Whether the response was streamed
+            
+        Returns:
+            The response as a dictionary with a "timing" entry
+        """
+        def seconds(name: str) -> Optional[float]:
+            value = response.get(name)
+            return value / 1e9 if value is not None else None
+            
+        def rate(count: Optional[int], duration: Optional[float]) -> Optional[float]:
+            return count / duration if count and duration else None
+            
+        load_duration = seconds("load_duration")
+        prompt_eval_duration = seconds("prompt_eval_duration")
+        eval_duration = seconds("eval_duration")
+        if ttft is None and prompt_eval_duration is not None:
+            ttft = (load_duration or 0.0) + prompt_eval_duration
+            
+        timing = {
+            "model": self.model,
+            "host": host,
+            "stream": stream,
+            "queue_wait": queue_wait,
+            "ttft": ttft,
+            "total_time": total_time,
+            "load_duration": load_duration,
+            "prompt_eval_count": response.get("prompt_eval_count"),
+            "prompt_eval_duration": prompt_eval_duration,
+            "eval_count": response.get("eval_count"),
+            "eval_duration": eval_duration,
+            "prompt_tokens_per_second": rate(response.get("prompt_eval_count"), prompt_eval_duration),
+            "tokens_per_second": rate(response.get("eval_count"), eval_duration)
+        }
+        self.generation_metrics.record(timing)
+        
+        response = dict(response)
+        response["timing"] = timing
+        return response
+    
+    def _record_latency(self, elapsed: float, response: Dict[str, Any]) -> None:
+        """
+        Record the latency of a generation as cold or warm.
+        
+        A generation is cold when Ollama reports having spent more than
+        cold_load_threshold seconds loading the model.
+        
+        Args:
+            elapsed: Wall-clock duration of the generation, in seconds
+            response: The final Ollama response or stream chunk
+        """
+        load_duration = (response.get("load_duration") or 0) / 1e9
+        kind = "cold" if load_duration > self.cold_load_threshold else "warm"
+        self.latency[kind].record(elapsed)
+    
+    def configure_mcp_client(self, mcp_client: MCPClient) -> None:
+        """
+        Configure MCP client for tool access.
+        
+        Args:
+            mcp_client: The MCP client
+        """
+        self.mcp_client = mcp_client
+    
+    def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process an incoming A2A request.
+        
+        Args:
+            request: The A2A request
+            
+        Returns:
+            The response to the request
+        """
+        method = request.get("method")
+        
+        if method == "discovery":
+            return self.agent_card.to_dict()
+        elif method == "create_task":
+            task_id = self.task_manager.create_task(request.get("params", {}))
+            return {"task_id": task_id}
+        elif method == "get_task":
+            task_id = request.get("params", {}).get("task_id")
+            return self.task_manager.get_task(task_id)
+        elif method == "add_message":
+            task_id = request.get("params", {}).get("task_id")
+            message = request.get("params", {}).get("message")
+            return self.message_handler.add_message(task_id, message)
+        elif method == "process_task":
+            task_id = request.get("params", {}).get("task_id")
+            return self._process_task(task_id)
+        elif method == "process_task_stream":
+            task_id = request.get("params", {}).get("task_id")
+            return {"error": "Streaming not available via RPC, use HTTP streaming endpoint"}
+        elif method == "cancel_task":
+            task_id = request.get("params", {}).get("task_id")
+            return {"task_id": task_id, "canceled": self.cancel_task(task_id)}
+        elif method == "get_metrics":
+            return self.get_metrics()
+        else:
+            return {"error": f"Unknown method: {method}"}
+    
+    def _get_ollama_messages(self, task_id: str) -> List[Dict[str, Any]]:
+        """
+        Convert A2A messages to Ollama message format.
+        
+        Args:
+            task_id: The task ID
+            
+        Returns:
+            List of messages in Ollama format
+        """
+        messages = self.message_handler.get_messages(task_id)
+        ollama_messages = []
+        
+        for message in messages:
+            content = ""
+            for part in message.get("parts", []):
+                if part.get("type") == "text":
+                    content += part.get("content", "")
+            
+            ollama_messages.append({
+                "role": message.get("role", "user"),
+                "content": content
+            })
+            
+        return ollama_messages
+    
+    def _build_request_messages(self, ollama_messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Build the messages of a request, describing MCP tools in text mode.
+        
+        The conversation messages are not modified, so every attempt of a
+        request sends the same prompt. The oldest turns are dropped when the
+        request does not fit the token budget of the model.
+        
+        Args:
+            ollama_messages: Messages in Ollama format
+            
+        Returns:
+            New list of messages for the request
+        """
+        if not self.mcp_client or not self.mcp_client.available_tools or self._use_native_tools():
+            messages = list(ollama_messages)
+        else:
+            messages = self.prompt_builder.build_messages(ollama_messages, self.mcp_client.available_tools)
+            
+        tools_tokens = self.token_budget.count_tools(self._get_ollama_tools())
+        return self.token_budget.trim_messages(messages, self.model, tools_tokens)
+    
+    def _complete_task(self, task_id: str, content: str) -> Dict[str, Any]:
+        """
+        Store the agent response and mark the task as completed.
+        
+        A task canceled meanwhile stays canceled and gets no response.
+        
+        Args:
+            task_id: The task ID
+            content: The response content
+            
+        Returns:
+            The result of processing the task
+        """
+        # Update task status
+        if not self._set_final_status(task_id, "completed"):
+            return self._canceled_result(task_id)
+        
+        # Create A2A message from the response
+        message_id = str(uuid.uuid4())
+        a2a_message = {
+            "id": message_id,
+            "role": "agent",
+            "parts": [
+                {
+                    "type": "text",
+                    "content": content
+                }
+            ]
+        }
+        
+        # Add the message to the task
+        self.message_handler.add_message(task_id, a2a_message)
+        
+        return {
+            "task_id": task_id,
+            "message_id": message_id,
+            "status": "completed",
+            "message": a2a_message
+        }
+    
+    def _use_response_cache(self, task: Dict[str, Any]) -> bool:
+        """
+        Check whether responses for a task may be served from the caches.
+        
+        Tasks opt out with ``"cache": false`` in their params, and skills
+        opt out with ``"cacheable": false`` in the agent card.
+        
+        Args:
+            task: The task
+            
+        Returns:
+            True if the response cache should be used
+        """
+        if not self.response_cache and not self.semantic_cache:
+            return False
+            
+        params = task.get("params") or {}
+        if params.get("cache") is False:
+            return False
+            
+        skill_name = params.get("skill")
+        if skill_name:
+            for skill in self.agent_card.skills:
+                if skill_name in (skill.get("id"), skill.get("name")):
+                    return skill.get("cacheable", True)
+                    
+        return True
+    
+    def _semantic_prompt(self, messages: List[Dict[str, Any]]) -> Optional[Tuple[int, str]]:
+        """
+        Split a conversation into the semantic cache context and the prompt.
+        
+        Args:
+            messages: Messages in Ollama format
+            
+        Returns:
+            The context key and the last user message, or None if the
+            conversation does not end with a user message
+        """
+        if not messages or messages[-1].get("role") != "user":
+            return None
+            
+        context_key = SemanticCache.make_context_key(self.model, messages[:-1])
+        return context_key, messages[-1].get("content", "")
+    
+    def _cacheable_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reduce an Ollama response to the plain data kept in the response cache.
+        
+        Args:
+            response: The Ollama response
+            
+        Returns:
+            The response message as a dictionary
+        """
+        message = response.get("message", {})
+        cached = {
+            "message": {
+                "role": message.get("role", "assistant"),
+                "content": message.get("content", "")
+            }
+        }
+        
+        tool_calls = self._native_tool_calls(message)
+        if tool_calls:
+            cached["message"]["tool_calls"] = [
+                {"function": {"name": call["name"], "arguments": call["parameters"]}}
+                for call in tool_calls
+            ]
+            
+        return cached
+    
+    def _process_task(self, task_id: str) -> Dict[str, Any]:
+        """
+        Process a task using Ollama.
+        
+        The task runs on the shared background event loop, so the async
+        Ollama client, its connection pool and the concurrency limits are
+        shared by every caller.
+        
+        Args:
+            task_id: The ID of the task to process
+            
+        Returns:
+            The result of processing the task
+        """
+        try:
+            return run_coroutine(self._aprocess_task(task_id))
+        except (asyncio.CancelledError, concurrent.futures.CancelledError):
+            return self._canceled_result(task_id)
+    
+    @contextmanager
+    def _track_task(self, task_id: str) -> Iterator[None]:
+        """
+        Register the running asyncio task as working on an A2A task.
+        
+        Args:
+            task_id: The A2A task ID
+        """
+        current = asyncio.current_task()
+        with self._running_lock:
+            self._running.setdefault(task_id, set()).add(current)
+        try:
+            yield
+        finally:
+            with self._running_lock:
+                running = self._running.get(task_id)
+                if running is not None:
+                    running.discard(current)
+                    if not running:
+                        del self._running[task_id]
+    
+    def cancel_task(self, task_id: str) -> bool:
+        """
+        Cancel a task, stopping its generation and pending tool calls.
+        
+        Cancelling the asyncio tasks processing the task closes the Ollama
+        stream and cancels tool calls in flight. The task is marked canceled.
+        
+        Args:
+            task_id: The ID of the task to cancel
+            
+        Returns:
+            True if the task was canceled, False if it does not exist or has finished
+        """
+        if not self._mark_canceled(task_id):
+            return False
+            
+        with self._running_lock:
+            running = list(self._running.get(task_id, ()))
+        for asyncio_task in running:
+            asyncio_task.get_loop().call_soon_threadsafe(asyncio_task.cancel)
+            
+        return True
+    
+    def _mark_canceled(self, task_id: str) -> bool:
+        """
+        Mark a task canceled unless it has already finished.
+        
+        Args:
+            task_id: The task ID
+            
+        Returns:
+            True if the task was marked canceled
+        """
+        with self._running_lock:
+            task = self.task_manager.get_task(task_id)
+            if not task or task["status"] in ("completed", "failed", "canceled"):
+                return False
+            return self.task_manager.update_task_status(task_id, "canceled")
+        
+    def _is_canceled(self, task_id: str) -> bool:
+        """
+        Check whether a task was canceled.
+        
+        Args:
+            task_id: The task ID
+            
+        Returns:
+            True if the task is marked canceled
+        """
+        task = self.task_manager.get_task(task_id)
+        return bool(task) and task["status"] == "canceled"
+        
+    def _set_final_status(self, task_id: str, status: str) -> bool:
+        """
+        Mark a task completed or failed unless it was canceled.
+        
+        Args:
+            task_id: The task ID
+            status: The final status
+            
+        Returns:
+            False if the task was canceled, and keeps that status
+        """
+        with self._running_lock:
+            if self._is_canceled(task_id):
+                return False
+            self.task_manager.update_task_status(task_id, status)
+            return True
+            
+    def _canceled_result(self, task_id: str) -> Dict[str, Any]:
+        return {
+            "task_id": task_id,
+            "status": "canceled"
+        }
+    
+    def _extract_tool_calls(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Extract MCP tool calls from an Ollama response.
+        
+        Tool calls are JSON objects of the form
+        {"name": "tool_name", "parameters": {"param1": "value1"}} naming an
+        available tool, and parameters may be nested.
+        
+        Args:
+            content: The response content
+            
+        Returns:
+            List of extracted tool calls
+        """
+        return extract_tool_calls(content, self._tool_names())
+        
+    def _tool_names(self) -> Collection[str]:
+        """
+        Get the names of the available MCP tools.
+        
+        Returns:
+            The tool names, empty without an MCP client
+        """
+        return self.mcp_client.available_tools.keys() if self.mcp_client else ()
+        
+    def _use_native_tools(self) -> bool:
+        """
+        Check whether MCP tools are passed through Ollama's tools parameter.
+        
+        Returns:
+            True in native tool mode when MCP tools are available
+        """
+        return (
+            self.tool_mode == "native"
+            and self.mcp_client is not None
+            and bool(self.mcp_client.available_tools)
+        )
+        
+    def _get_ollama_tools(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the MCP tools in Ollama's function-calling format.
+        
+        Returns:
+            Tool definitions for Ollama, or None outside native tool mode
+        """
+        if not self._use_native_tools():
+            return None
+            
+        return self.prompt_builder.ollama_tools(self.mcp_client.available_tools)
+        
+    def _native_tool_calls(self, message: Any) -> List[Dict[str, Any]]:
+        """
+        Extract the structured tool calls of an Ollama response message.
+        
+        Args:
+            message: The response message
+            
+        Returns:
+            List of tool calls, with name and parameters
+        """
+        tool_calls = []
+        
+        for call in message.get("tool_calls") or []:
+            function = call.get("function") or {}
+            tool_calls.append({
+                "name": function.get("name"),
+                "parameters": dict(function.get("arguments") or {})
+            })
+            
+        return tool_calls
+        
+    def _disable_native_tools_if_unsupported(self, error: Exception) -> bool:
+        """
+        Switch to text tool mode when the model rejects the tools parameter.
+        
+        Args:
+            error: The error raised by Ollama
+            
+        Returns:
+            True if native tool mode was switched off
+        """
+        if self.tool_mode != "native" or not isinstance(error, ollama.ResponseError):
+            return False
+        if "does not support tools" not in str(error.error):
+            return False
+            
+        print(f"Model {self.model} does not support native tool calling, using text mode")
+        self.tool_mode = "text"
+        return True
+        
+    def _append_tool_results(
+        self,
+        messages: List[Dict[str, Any]],
+        content: str,
+        tool_calls: List[Dict[str, Any]],
+        tool_results: List[Dict[str, Any]],
+        native: bool
+    ) -> None:
+        """
+        Add a model turn with tool calls and their results to the conversation.
+        
+        Native tool calls are answered with one tool message per call; in
+        text mode the results are reported in a system message.
+        
+        Args:
+            messages: Messages in Ollama format, modified in place
+            content: Content of the model turn
+            tool_calls: The tool calls of the turn
+            tool_results: The tool result entries, in the order of the calls
+            native: Whether the calls came from Ollama's tool_calls
+        """
+        tool_results = [self.token_budget.cap_tool_result(tool_result) for tool_result in tool_results]
+        
+        if not native:
+            messages.append({
+                "role": "assistant",
+                "content": content
+            })
+            messages.append({
+                "role": "system",
+                "content": f"Tool results: {json.dumps(tool_results)}"
+            })
+            return
+            
+        messages.append({
+            "role": "assistant",
+            "content": content,
+            "tool_calls": [
+                {"function": {"name": call["name"], "arguments": call["parameters"]}}
+                for call in tool_calls
+            ]
+        })
+        for tool_result in tool_results:
+            messages.append({
+                "role": "tool",
+                "tool_name": tool_result["name"],
+                "content": json.dumps(
+                    tool_result["result"] if tool_result["error"] is None
+                    else {"error": tool_result["error"]}
+                )
+            })
+        
+    async def _execute_tool_call(self, tool_call: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """
+        Execute one MCP tool call with the per-call timeout.
+        
+        Args:
+            tool_call: The tool call, with name and parameters
+            semaphore: Limits how many calls of the same turn run at once
+            
+        Returns:
+            The tool result entry (name, result, error)
+        """
+        tool_name = tool_call.get("name")
+        parameters = tool_call.get("parameters", {})
+        
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    self.mcp_client.execute_tool(tool_name, parameters),
+                    timeout=self.tool_timeout
+                )
+                return {
+                    "name": tool_name,
+                    "result": result.result,
+                    "error": result.error
+                }
+            except asyncio.TimeoutError:
+                return {
+                    "name": tool_name,
+                    "result": None,
+                    "error": f"Tool call timed out after {self.tool_timeout}s"
+                }
+            except Exception as e:
+                return {
+                    "name": tool_name,
+                    "result": None,
+                    "error": str(e)
+                }
+    
+    async def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute the tool calls of one model turn concurrently.
+        
+        When the MCP client supports batches, the calls are sent to the
+        server in one request. Either way at most max_parallel_tools calls
+        run at once and each call is limited to tool_timeout, as in streaming.
+        
+        Args:
+            tool_calls: The tool calls
+            
+        Returns:
+            The tool result entries, in the order of the calls
+        """
+        if len(tool_calls) > 1 and hasattr(self.mcp_client, "execute_tools"):
+            return await self._execute_tool_batch(tool_calls)
+            
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        return list(await asyncio.gather(
+            *(self._execute_tool_call(tool_call, semaphore) for tool_call in tool_calls)
+        ))
+    
+    async def _execute_tool_batch(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute the tool calls of one model turn with a single MCP request.
+        
+        Args:
+            tool_calls: The tool calls
+            
+        Returns:
+            The tool result entries, in the order of the calls
+        """
+        try:
+            results = await self.mcp_client.execute_tools(
+                [{"name": call.get("name"), "parameters": call.get("parameters", {})} for call in tool_calls],
+                max_parallel=self.max_parallel_tools,
+                timeout=self.tool_timeout
+            )
+        except Exception as e:
+            return [{"name": call.get("name"), "result": None, "error": str(e)} for call in tool_calls]
+            
+        return [
+            {"name": call.get("name"), "result": result.result, "error": result.error}
+            for call, result in zip(tool_calls, results)
+        ]
     
-    def configure_mcp_client(self, mcp_client: MCPClient) -> None:
+    def _start_tool_call(
+        self, index: int, tool_call: Dict[str, Any], semaphore: asyncio.Semaphore
+    ) -> "asyncio.Task[Tuple[int, Dict[str, Any]]]":
         """
-        Configure MCP client for tool access.
+        Start executing a tool call in the background.
         
         Args:
-            mcp_client: The MCP client
+            index: Position of the call within the model turn
+            tool_call: The tool call, with name and parameters
+            semaphore: Limits how many calls of the same turn run at once
+            
+        Returns:
+            Task resolving to the index and the tool result entry
         """
-        self.mcp_client = mcp_client
+        async def run() -> Tuple[int, Dict[str, Any]]:
+            return index, await self._execute_tool_call(tool_call, semaphore)
+            
+        return asyncio.ensure_future(run())
     
-    def process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    async def _iter_completed_tool_calls(
+        self, tasks: List["asyncio.Task[Tuple[int, Dict[str, Any]]]"]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
         """
-        Process an incoming A2A request.
+        Yield the results of started tool calls as they complete.
+        
+        Calls still running when the iteration is abandoned are cancelled.
         
         Args:
-            request: The A2A request
+            tasks: Tasks returned by _start_tool_call
+            
+        Yields:
+            The index of the call and its tool result entry, in completion order
+        """
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _format_tool_result(self, tool_result: Dict[str, Any]) -> str:
+        """
+        Format a tool result entry as a streaming chunk.
+        
+        Args:
+            tool_result: The tool result entry
             
         Returns:
-            The response to the request
+            Text describing the result
         """
-        method = request.get("method")
+        if tool_result["result"] is None and tool_result["error"]:
+            return f"\nTool '{tool_result['name']}' error: {tool_result['error']}"
+        return f"\nTool '{tool_result['name']}' result: {json.dumps(tool_result['result'])}"
+    
+    def _get_mcp_tools_description(self) -> str:
+        """
+        Get a description of available MCP tools.
         
-        if method == "discovery":
-            return self.agent_card.to_dict()
-        elif method == "create_task":
-            task_id = self.task_manager.create_task(request.get("params", {}))
-            return {"task_id": task_id}
-        elif method == "get_task":
-            task_id = request.get("params", {}).get("task_id")
-            return self.task_manager.get_task(task_id)
-        elif method == "add_message":
-            task_id = request.get("params", {}).get("task_id")
-            message = request.get("params", {}).get("message")
-            return self.message_handler.add_message(task_id, message)
-        elif method == "process_task":
-            task_id = request.get("params", {}).get("task_id")
-            return self._process_task(task_id)
-        elif method == "process_task_stream":
-            task_id = request.get("params", {}).get("task_id")
-            return {"error": "Streaming not available via RPC, use HTTP streaming endpoint"}
+        Returns:
+            Description of MCP tools
+        """
+        if not self.mcp_client or not self.mcp_client.available_tools:
+            return ""
+            
+        return self.prompt_builder.tools_description(self.mcp_client.available_tools)
+        
+    def _process_task_stream(self, task_id: str, heartbeat_interval: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Process a task using Ollama with streaming.
+        
+        The task runs on the shared background event loop; closing the
+        returned iterator cancels the generation.
+        
+        Args:
+            task_id: The ID of the task to process
+            heartbeat_interval: Yield a heartbeat chunk after this many seconds
+                without output, so servers notice disconnected clients (never if None)
+            
+        Returns:
+            Iterator of streaming chunks
+        """
+        return iterate_async(
+            self._aprocess_task_stream(task_id),
+            idle_interval=heartbeat_interval,
+            idle_item={"task_id": task_id, "heartbeat": True, "done": False}
+        )
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get runtime metrics for this agent.
+        
+        Returns:
+            Metrics dictionary
+        """
+        metrics = {
+            "model": self.model,
+            "host": self.host,
+            "concurrency": self.concurrency_limiter.get_metrics(),
+            "latency": {kind: stats.to_dict() for kind, stats in self.latency.items()},
+            "generation": self.generation_metrics.to_dict(),
+            "prompt_builder": self.prompt_builder.get_metrics(),
+            "hosts": self.host_pool.get_metrics(),
+            "tokens": self.token_budget.get_metrics(),
+            "retries": self.retry_policy.get_metrics(),
+            "circuit_breakers": self.circuit_breakers.get_metrics()
+        }
+        
+        if self.response_cache:
+            metrics["response_cache"] = self.response_cache.get_metrics()
+        if self.semantic_cache:
+            metrics["semantic_cache"] = self.semantic_cache.get_metrics()
+        if self.single_flight:
+            metrics["coalescing"] = self.single_flight.get_metrics()
+            
+        return metrics
+    
+    async def _achat(
+        self,
+        messages: List[Dict[str, Any]],
+        use_cache: bool = False,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        affinity_key: Optional[str] = None,
+        exclude: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a non-streaming chat on the async client within the concurrency limits.
+        
+        Cache hits and requests coalesced with an identical one in flight
+        are answered without taking a concurrency slot.
+        
+        Args:
+            messages: Messages in Ollama format
+            use_cache: Whether the response cache may be used
+            tools: Tool definitions for native function calling
+            affinity_key: Conversation to keep on the same host
+            exclude: URLs of hosts to avoid, updated with a host that fails
+            
+        Returns:
+            The Ollama response
+        """
+        key = ResponseCache.make_key(self.model, messages, {"tools": tools} if tools else None)
+        if use_cache and self.response_cache:
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+                
+        if self.single_flight:
+            response = await self.single_flight.ado(
+                key, lambda: self._aollama_chat(messages, tools, affinity_key, exclude)
+            )
         else:
-            return {"error": f"Unknown method: {method}"}
+            response = await self._aollama_chat(messages, tools, affinity_key, exclude)
+            
+        if use_cache and self.response_cache:
+            self.response_cache.put(key, self._cacheable_response(response))
+            
+        return response
     
-    def _get_ollama_messages(self, task_id: str) -> List[Dict[str, Any]]:
+    async def _aollama_chat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        affinity_key: Optional[str] = None,
+        exclude: Optional[Set[str]] = None
+    ) -> Dict[str, Any]:
         """
-        Convert A2A messages to Ollama message format.
+        Run a non-streaming chat on a pool host within the concurrency limits.
+        
+        Calls fail fast without queueing while the host's circuit is open.
         
         Args:
-            task_id: The task ID
+            messages: Messages in Ollama format
+            tools: Tool definitions for native function calling
+            affinity_key: Conversation to keep on the same host
+            exclude: URLs of hosts to avoid, updated with the host if it fails
             
         Returns:
-            List of messages in Ollama format
+            The Ollama response
         """
-        messages = self.message_handler.get_messages(task_id)
-        ollama_messages = []
+        async with self.host_pool.lease(affinity_key, exclude) as host:
+            with self.host_pool.breaker(host).guard():
+                async with self.concurrency_limiter.slot(host.url, self.model) as queue_wait:
+                    started = time.perf_counter()
+                    response = await host.async_client.chat(
+                        model=self.model,
+                        messages=messages,
+                        tools=tools,
+                        keep_alive=self.keep_alive
+                    )
+                    elapsed = time.perf_counter() - started
+                    self._record_latency(elapsed, response)
+                    return self._with_timing(response, host.url, queue_wait, elapsed)
+    
+    async def _asemantic_cache_lookup(
+        self, messages: List[Dict[str, Any]], affinity_key: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[Tuple[int, List[float]]]]:
+        """
+        Look up a conversation in the semantic cache.
         
-        for message in messages:
-            content = ""
-            for part in message.get("parts", []):
-                if part.get("type") == "text":
-                    content += part.get("content", "")
+        The prompt is embedded on a pool host within the concurrency limits,
+        so a host with an open circuit is skipped and an unreachable one is
+        left for another.
+        
+        Args:
+            messages: Messages in Ollama format
+            affinity_key: Conversation to keep on the same host
             
-            ollama_messages.append({
-                "role": message.get("role", "user"),
-                "content": content
-            })
+        Returns:
+            The cached response (None on a miss) and the entry to store the
+            generated response under (None if it should not be stored)
+        """
+        prompt = self._semantic_prompt(messages)
+        if not prompt:
+            return None, None
             
-        return ollama_messages
+        context_key, content = prompt
+        model = self.semantic_cache.embedding_model
+        failed_hosts: Set[str] = set()
+        while True:
+            tried = len(failed_hosts)
+            try:
+                async with self.host_pool.lease(affinity_key, failed_hosts) as host:
+                    with self.host_pool.breaker(host).guard():
+                        async with self.concurrency_limiter.slot(host.url, model):
+                            response = await host.async_client.embed(model=model, input=content)
+                embedding = response["embeddings"][0]
+                break
+            except Exception as e:
+                print(f"Error embedding prompt for semantic cache: {e}")
+                # Move to another host if this one is unreachable
+                if len(failed_hosts) == tried or not self.host_pool.can_fail_over(failed_hosts):
+                    return None, None
+            
+        return self.semantic_cache.lookup(context_key, embedding), (context_key, embedding)
     
-    def _process_task(self, task_id: str) -> Dict[str, Any]:
+    async def _achat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        affinity_key: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Process a task using Ollama.
+        Run a streaming chat on the async client within the concurrency limits.
+        
+        Identical concurrent streams share a single generation whose chunks
+        are fanned out to every caller.
+        
+        Args:
+            messages: Messages in Ollama format
+            tools: Tool definitions for native function calling
+            affinity_key: Conversation to keep on the same host
+            
+        Yields:
+            Ollama response chunks
+        """
+        if self.single_flight:
+            key = ResponseCache.make_key(self.model, messages, {"stream": True, "tools": tools})
+            async for chunk in self.single_flight.astream(
+                key, lambda: self._aollama_chat_stream(messages, tools, affinity_key)
+            ):
+                yield chunk
+        else:
+            async for chunk in self._aollama_chat_stream(messages, tools, affinity_key):
+                yield chunk
+    
+    async def _aollama_chat_stream(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        affinity_key: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a streaming chat on a pool host within the concurrency limits.
+        
+        The concurrency slot is held until the stream is exhausted or closed.
+        Streams fail fast without queueing while the host's circuit is open.
+        
+        Args:
+            messages: Messages in Ollama format
+            tools: Tool definitions for native function calling
+            affinity_key: Conversation to keep on the same host
+            
+        Yields:
+            Ollama response chunks
+        """
+        async with self.host_pool.lease(affinity_key) as host:
+            with self.host_pool.breaker(host).guard():
+                async with self.concurrency_limiter.slot(host.url, self.model) as queue_wait:
+                    started = time.perf_counter()
+                    ttft = None
+                    async for chunk in await host.async_client.chat(
+                        model=self.model,
+                        messages=messages,
+                        tools=tools,
+                        stream=True,
+                        keep_alive=self.keep_alive
+                    ):
+                        message = chunk.get("message") or {}
+                        if ttft is None and (message.get("content") or message.get("tool_calls")):
+                            ttft = time.perf_counter() - started
+                        if chunk.get("done"):
+                            elapsed = time.perf_counter() - started
+                            self._record_latency(elapsed, chunk)
+                            chunk = self._with_timing(chunk, host.url, queue_wait, elapsed, ttft, stream=True)
+                        yield chunk
+    
+    async def _aprocess_task(self, task_id: str) -> Dict[str, Any]:
+        """
+        Process a task using the async Ollama client.
+        
+        The task can be stopped with cancel_task while it runs.
+        
+        Args:
+            task_id: The ID of the task to process
+            
+        Returns:
+            The result of processing the task
+        """
+        with self._track_task(task_id):
+            # A task canceled before it started is not run; once registered,
+            # cancel_task reaches it through the asyncio task
+            if self._is_canceled(task_id):
+                return self._canceled_result(task_id)
+            try:
+                return await self._arun_task(task_id)
+            except asyncio.CancelledError:
+                self._mark_canceled(task_id)
+                raise
+    
+    async def _arun_task(self, task_id: str) -> Dict[str, Any]:
+        """
+        Run the processing of a task.
         
         Args:
             task_id: The ID of the task to process
@@ -144,125 +1191,85 @@ class A2AOllama(IA2AIAAlgorithm):
         # Check if this is an MCP task
         if self.task_manager.mcp_bridge and self.task_manager._can_use_mcp_for_task(task):
             try:
-                import asyncio
-                return asyncio.run(self.task_manager.process_task(task_id))
+                return await self.task_manager.process_task(task_id)
             except Exception as e:
                 print(f"Error processing MCP task: {e}")
                 # Fall back to normal processing
         
         ollama_messages = self._get_ollama_messages(task_id)
+        use_cache = self._use_response_cache(task)
         
-        # Set up retry parameters
-        max_retries = 3
-        retry_count = 0
+        # Answer near-duplicate prompts from the semantic cache
+        semantic_entry = None
+        if use_cache and self.semantic_cache:
+            cached_content, semantic_entry = await self._asemantic_cache_lookup(ollama_messages, task_id)
+            if cached_content is not None:
+                return self._complete_task(task_id, cached_content)
+        started = time.perf_counter()
+        
+        # Retry transient failures with backoff, as configured by the retry policy,
+        # moving off the hosts that failed
+        attempt = 0
         last_error = None
+        failed_hosts: Set[str] = set()
         
-        while retry_count < max_retries:
+        while True:
+            attempt += 1
             try:
-                # Add available MCP tools to the system message if MCP is configured
-                if self.mcp_client and self.mcp_client.available_tools:
-                    # Check if we have a system message, if not add one
-                    has_system_message = False
-                    for msg in ollama_messages:
-                        if msg.get("role") == "system":
-                            has_system_message = True
-                            # Add MCP tools to existing system message
-                            msg["content"] += self._get_mcp_tools_description()
-                            break
-                            
-                    if not has_system_message:
-                        # Create a new system message with MCP tools
-                        ollama_messages.insert(0, {
-                            "role": "system",
-                            "content": f"You are {self.agent_card.name}, {self.agent_card.description}. {self._get_mcp_tools_description()}"
-                        })
+                # Offer MCP tools natively, or describe them in the system message
+                request_messages = self._build_request_messages(ollama_messages)
+                tools = self._get_ollama_tools()
                 
                 # Generate a response using Ollama
-                response = self.client.chat(
-                    model=self.model,
-                    messages=ollama_messages
+                response = await self._achat(
+                    request_messages, use_cache=use_cache, tools=tools, affinity_key=task_id, exclude=failed_hosts
                 )
+                self._record_usage(task_id, response)
                 
                 # Check for MCP tool calls in the response
                 response_content = response.get("message", {}).get("content", "")
-                tool_calls = self._extract_tool_calls(response_content)
+                if tools:
+                    tool_calls = self._native_tool_calls(response.get("message", {}))
+                else:
+                    tool_calls = self._extract_tool_calls(response_content)
                 
                 if tool_calls and self.mcp_client:
-                    # Execute the tool calls and append results
-                    tool_results = []
-                    for tool_call in tool_calls:
-                        tool_name = tool_call.get("name")
-                        parameters = tool_call.get("parameters", {})
-                        
-                        try:
-                            import asyncio
-                            result = asyncio.run(self.mcp_client.execute_tool(tool_name, parameters))
-                            tool_results.append({
-                                "name": tool_name,
-                                "result": result.result,
-                                "error": result.error
-                            })
-                        except Exception as e:
-                            tool_results.append({
-                                "name": tool_name,
-                                "result": None,
-                                "error": str(e)
-                            })
+                    # Execute the tool calls concurrently
+                    tool_results = await self._execute_tool_calls(tool_calls)
                     
-                    # Add the tool results to the messages
-                    ollama_messages.append({
-                        "role": "assistant",
-                        "content": response_content
-                    })
-                    
-                    # Add tool results message
-                    ollama_messages.append({
-                        "role": "system",
-                        "content": f"Tool results: {json.dumps(tool_results)}"
-                    })
+                    # Add the tool calls and their results to the messages
+                    self._append_tool_results(
+                        request_messages, response_content, tool_calls, tool_results, native=bool(tools)
+                    )
                     
                     # Generate a final response that incorporates the tool results
-                    final_response = self.client.chat(
-                        model=self.model,
-                        messages=ollama_messages
+                    response = await self._achat(
+                        request_messages, use_cache=use_cache, affinity_key=task_id, exclude=failed_hosts
                     )
-                    
-                    response = final_response
+                    self._record_usage(task_id, response)
                 
-                # Update task status
-                self.task_manager.update_task_status(task_id, "completed")
-                
-                # Create A2A message from the response
-                message_id = str(uuid.uuid4())
-                a2a_message = {
-                    "id": message_id,
-                    "role": "agent",
-                    "parts": [
-                        {
-                            "type": "text",
-                            "content": response.get("message", {}).get("content", "")
-                        }
-                    ]
-                }
-                
-                # Add the message to the task
-                self.message_handler.add_message(task_id, a2a_message)
-                
-                return {
-                    "task_id": task_id,
-                    "message_id": message_id,
-                    "status": "completed",
-                    "message": a2a_message
-                }
+                content = response.get("message", {}).get("content", "")
+                # Answers built from tool results depend on when the tools ran
+                if semantic_entry and not tool_calls:
+                    context_key, embedding = semantic_entry
+                    self.semantic_cache.store(context_key, embedding, content, time.perf_counter() - started)
+                    
+                return self._complete_task(task_id, content)
                 
             except Exception as e:
+                if self._disable_native_tools_if_unsupported(e):
+                    attempt -= 1
+                    continue
+                    
                 last_error = str(e)
-                retry_count += 1
-                print(f"Error processing task (attempt {retry_count}): {e}")
-                time.sleep(1)  # Wait before retrying
+                print(f"Error processing task (attempt {attempt}): {e}")
+                if not self.retry_policy.should_retry(e, attempt, self.host_pool.can_fail_over(failed_hosts)):
+                    break
+                await asyncio.sleep(self.retry_policy.backoff(attempt))
         
-        # If we get here, all retries failed
-        self.task_manager.update_task_status(task_id, "failed")
+        # If we get here, the error was not retryable or all attempts failed
+        if not self._set_final_status(task_id, "failed"):
+            return self._canceled_result(task_id)
         
         return {
             "task_id": task_id,
@@ -270,77 +1277,42 @@ class A2AOllama(IA2AIAAlgorithm):
             "error": last_error
         }
     
-    def _extract_tool_calls(self, content: str) -> List[Dict[str, Any]]:
+    async def _aprocess_task_stream(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
         """
-        Extract MCP tool calls from an Ollama response.
+        Process a task using the async Ollama client with streaming.
+        
+        The task is marked canceled if it is stopped with cancel_task or the
+        consumer closes the stream before the end.
         
         Args:
-            content: The response content
+            task_id: The ID of the task to process
             
-        Returns:
-            List of extracted tool calls
+        Yields:
+            Streaming chunks
         """
-        tool_calls = []
-        
-        # Simple parsing for tool calls - in reality this would need to be more robust
-        # Example format to detect: {"name": "tool_name", "parameters": {"param1": "value1"}}
-        import re
-        
-        # Look for JSON objects that might be tool calls
-        json_pattern = r'\{\s*"name"\s*:\s*"([^"]*)"\s*,\s*"parameters"\s*:\s*(\{[^}]*\})\s*\}'
-        matches = re.finditer(json_pattern, content)
-        
-        for match in matches:
+        chunks = self._arun_task_stream(task_id)
+        with self._track_task(task_id):
+            if self._is_canceled(task_id):
+                yield dict(self._canceled_result(task_id), done=True)
+                return
             try:
-                tool_name = match.group(1)
-                parameters_str = match.group(2)
-                parameters = json.loads(parameters_str)
-                
-                tool_calls.append({
-                    "name": tool_name,
-                    "parameters": parameters
-                })
-            except Exception as e:
-                print(f"Error parsing tool call: {e}")
-        
-        return tool_calls
-        
-    def _get_mcp_tools_description(self) -> str:
-        """
-        Get a description of available MCP tools.
-        
-        Returns:
-            Description of MCP tools
-        """
-        if not self.mcp_client or not self.mcp_client.available_tools:
-            return ""
-            
-        tools_description = "You have access to the following tools:\n\n"
-        
-        for name, tool in self.mcp_client.available_tools.items():
-            tools_description += f"- {name}: {tool.description}\n"
-            
-            if tool.parameters:
-                tools_description += "  Parameters:\n"
-                for param in tool.parameters:
-                    required = " (required)" if param.required else ""
-                    tools_description += f"  - {param.name}{required}: {param.description}\n"
-                    
-            tools_description += "\n"
-            
-        tools_description += "\nTo use a tool, respond with JSON in this format: {\"name\": \"tool_name\", \"parameters\": {\"param1\": \"value1\"}}\n"
-        
-        return tools_description
-        
-    def _process_task_stream(self, task_id: str) -> Iterator[Dict[str, Any]]:
+                async for chunk in chunks:
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                self._mark_canceled(task_id)
+                raise
+            finally:
+                await chunks.aclose()
+    
+    async def _arun_task_stream(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
         """
-        Process a task using Ollama with streaming.
+        Run the streaming processing of a task.
         
         Args:
             task_id: The ID of the task to process
             
-        Returns:
-            Iterator of streaming chunks
+        Yields:
+            Streaming chunks
         """
         task = self.task_manager.get_task(task_id)
         
@@ -372,32 +1344,36 @@ class A2AOllama(IA2AIAAlgorithm):
         # Initialize content buffer
         full_content = ""
         
-        # Add available MCP tools to the system message if MCP is configured
-        if self.mcp_client and self.mcp_client.available_tools:
-            # Check if we have a system message, if not add one
-            has_system_message = False
-            for msg in ollama_messages:
-                if msg.get("role") == "system":
-                    has_system_message = True
-                    # Add MCP tools to existing system message
-                    msg["content"] += self._get_mcp_tools_description()
-                    break
-                    
-            if not has_system_message:
-                # Create a new system message with MCP tools
-                ollama_messages.insert(0, {
-                    "role": "system",
-                    "content": f"You are {self.agent_card.name}, {self.agent_card.description}. {self._get_mcp_tools_description()}"
-                })
+        # Offer MCP tools natively, or describe them in the system message
+        request_messages = self._build_request_messages(ollama_messages)
+        tools = self._get_ollama_tools()
+        
+        # Tool calls are started as soon as they arrive in the stream, or as
+        # soon as their JSON closes in text mode, while the model is still generating
+        detector = ToolCallDetector(tool_names=self._tool_names())
+        tool_semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        tool_calls = []
+        tool_tasks = []
         
         try:
             # Stream response from Ollama
-            for chunk in self.client.chat(
-                model=self.model,
-                messages=ollama_messages,
-                stream=True
-            ):
-                content = chunk.get("message", {}).get("content", "")
+            async for chunk in self._achat_stream(request_messages, tools, affinity_key=task_id):
+                if chunk.get("done"):
+                    self._record_usage(task_id, chunk)
+                    
+                message = chunk.get("message", {})
+                content = message.get("content", "")
+                
+                if tools:
+                    new_tool_calls = self._native_tool_calls(message)
+                elif self.mcp_client and content:
+                    new_tool_calls = detector.feed(content)
+                else:
+                    new_tool_calls = []
+                    
+                for tool_call in new_tool_calls:
+                    tool_tasks.append(self._start_tool_call(len(tool_tasks), tool_call, tool_semaphore))
+                    tool_calls.append(tool_call)
                 
                 if content:
                     full_content += content
@@ -412,25 +1388,33 @@ class A2AOllama(IA2AIAAlgorithm):
                         },
                         "done": False
                     }
-        except Exception as e:
+        except BaseException as e:
+            for task in tool_tasks:
+                task.cancel()
+            if not isinstance(e, Exception):
+                raise
+                
+            # Start over in text mode if the model has no native tool support
+            if not full_content and self._disable_native_tools_if_unsupported(e):
+                async for chunk in self._arun_task_stream(task_id):
+                    yield chunk
+                return
+                
             # Handle error
-            error_message = str(e)
-            self.task_manager.update_task_status(task_id, "failed")
-            
+            if not self._set_final_status(task_id, "failed"):
+                yield dict(self._canceled_result(task_id), done=True)
+                return
+                
             yield {
                 "task_id": task_id,
                 "message_id": message_id,
-                "error": error_message,
+                "error": str(e),
                 "status": "failed",
                 "done": True
             }
             return
         
-        # Check for MCP tool calls in the response
-        tool_calls = self._extract_tool_calls(full_content)
-        
-        if tool_calls and self.mcp_client:
-            # Execute the tool calls and append results
+        if tool_tasks:
             yield {
                 "task_id": task_id,
                 "message_id": message_id,
@@ -441,62 +1425,26 @@ class A2AOllama(IA2AIAAlgorithm):
                 "done": False
             }
             
-            tool_results = []
-            for tool_call in tool_calls:
-                tool_name = tool_call.get("name")
-                parameters = tool_call.get("parameters", {})
+            # Stream tool results as they complete
+            tool_results = [None] * len(tool_tasks)
+            async for index, tool_result in self._iter_completed_tool_calls(tool_tasks):
+                tool_results[index] = tool_result
                 
-                try:
-                    import asyncio
-                    result = asyncio.run(self.mcp_client.execute_tool(tool_name, parameters))
-                    tool_results.append({
-                        "name": tool_name,
-                        "result": result.result,
-                        "error": result.error
-                    })
-                    
-                    # Send a chunk with the tool result
-                    yield {
-                        "task_id": task_id,
-                        "message_id": message_id,
-                        "chunk": {
-                            "type": "text",
-                            "content": f"\nTool '{tool_name}' result: {json.dumps(result.result)}"
-                        },
-                        "done": False
-                    }
-                except Exception as e:
-                    error_msg = str(e)
-                    tool_results.append({
-                        "name": tool_name,
-                        "result": None,
-                        "error": error_msg
-                    })
-                    
-                    # Send a chunk with the tool error
-                    yield {
-                        "task_id": task_id,
-                        "message_id": message_id,
-                        "chunk": {
-                            "type": "text",
-                            "content": f"\nTool '{tool_name}' error: {error_msg}"
-                        },
-                        "done": False
-                    }
-            
-            # Add the tool results to the messages
-            ollama_messages.append({
-                "role": "assistant",
-                "content": full_content
-            })
+                yield {
+                    "task_id": task_id,
+                    "message_id": message_id,
+                    "chunk": {
+                        "type": "text",
+                        "content": self._format_tool_result(tool_result)
+                    },
+                    "done": False
+                }
             
-            # Add tool results message
-            ollama_messages.append({
-                "role": "system",
-                "content": f"Tool results: {json.dumps(tool_results)}"
-            })
+            # Add the tool calls and their results to the messages
+            self._append_tool_results(
+                request_messages, full_content, tool_calls, tool_results, native=bool(tools)
+            )
             
-            # Generate a final response that incorporates the tool results
             yield {
                 "task_id": task_id,
                 "message_id": message_id,
@@ -510,17 +1458,15 @@ class A2AOllama(IA2AIAAlgorithm):
             final_content = ""
             try:
                 # Stream final response
-                for chunk in self.client.chat(
-                    model=self.model,
-                    messages=ollama_messages,
-                    stream=True
-                ):
+                async for chunk in self._achat_stream(request_messages, affinity_key=task_id):
+                    if chunk.get("done"):
+                        self._record_usage(task_id, chunk)
+                        
                     content = chunk.get("message", {}).get("content", "")
                     
                     if content:
                         final_content += content
                         
-                        # Send chunk
                         yield {
                             "task_id": task_id,
                             "message_id": message_id,
@@ -532,13 +1478,12 @@ class A2AOllama(IA2AIAAlgorithm):
                         }
             except Exception as e:
                 # Handle error in final response
-                error_message = str(e)
                 yield {
                     "task_id": task_id,
                     "message_id": message_id,
                     "chunk": {
                         "type": "text",
-                        "content": f"\n\nError generating final response: {error_message}"
+                        "content": f"\n\nError generating final response: {e}"
                     },
                     "done": False
                 }
@@ -558,12 +1503,14 @@ class A2AOllama(IA2AIAAlgorithm):
             ]
         }
         
+        # Update task status, unless it was canceled meanwhile
+        if not self._set_final_status(task_id, "completed"):
+            yield dict(self._canceled_result(task_id), done=True)
+            return
+            
         # Store the complete message
         self.message_handler.add_message(task_id, a2a_message)
         
-        # Update task status
-        self.task_manager.update_task_status(task_id, "completed")
-        
         # Send final message
         yield {
             "task_id": task_id,
@@ -571,4 +1518,4 @@ class A2AOllama(IA2AIAAlgorithm):
             "status": "completed",
             "done": True,
             "message": a2a_message
-        } 
\ No newline at end of file
+        }
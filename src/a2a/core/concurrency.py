@@ -0,0 +1,284 @@
+"""
+Concurrency Module
+
+This module provides admission control for LLM calls so that concurrent
+generations do not overload an Ollama host, and the fair semaphores used to
+limit concurrent work.
+"""
+
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Any, AsyncIterator, Deque, Tuple
+
+
+class FairSemaphore:
+    """
+    FIFO semaphore for asyncio.
+
+    Waiters are served strictly in arrival order and a released slot is
+    handed directly to the oldest waiter, so a burst of new requests can
+    never overtake callers that are already queued.
+    """
+
+    def __init__(self, value: int):
+        """
+        Initialize the semaphore.
+
+        Args:
+            value: Number of slots available
+        """
+        if value < 1:
+            raise ValueError("Semaphore value must be at least 1")
+        self._value = value
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently queued for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self) -> None:
+        """Acquire a slot, waiting in FIFO order if none is free."""
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed to us just before the cancellation
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Release a slot, handing it to the oldest waiter if any."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._value += 1
+
+
+
+class WeightedSemaphore:
+    """
+    FIFO semaphore for asyncio whose callers take several units at once.
+
+    A caller waits until its weight fits in the free capacity. Waiters are
+    served strictly in arrival order, so a heavy caller is never starved by
+    a stream of light ones.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the semaphore.
+
+        Args:
+            capacity: Number of units available
+        """
+        if capacity < 1:
+            raise ValueError("Semaphore capacity must be at least 1")
+        self.capacity = capacity
+        self._free = capacity
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    @property
+    def in_use(self) -> int:
+        """Number of units currently taken."""
+        return self.capacity - self._free
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently queued."""
+        return sum(1 for _, waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, weight: int = 1) -> int:
+        """
+        Take units, waiting in FIFO order until they are free.
+
+        Args:
+            weight: Number of units, capped at the capacity
+
+        Returns:
+            Number of units taken, to pass to release
+        """
+        weight = max(1, min(weight, self.capacity))
+        if weight <= self._free and not self._waiters:
+            self._free -= weight
+            return weight
+
+        entry = (weight, asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        try:
+            await entry[1]
+        except asyncio.CancelledError:
+            if entry[1].done() and not entry[1].cancelled():
+                # The units were handed to us just before the cancellation
+                self.release(weight)
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                # The next waiter may fit now that this one left the head
+                self._wake()
+            raise
+        return weight
+
+    def release(self, weight: int) -> None:
+        """
+        Return units taken by acquire.
+
+        Args:
+            weight: Number of units returned by acquire
+        """
+        self._free += weight
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            weight, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if weight > self._free:
+                return
+            self._waiters.popleft()
+            self._free -= weight
+            waiter.set_result(None)
+
+
+class ConcurrencyLimiter:
+    """
+    Per-host and per-model concurrency limits for LLM calls.
+
+    A call first waits for a slot on its model and then for a slot on its
+    host. Model limits apply per host, since each host loads and serves its
+    own copy of a model, so a pool of hosts adds up their capacity. Both
+    queues are fair, and the time spent waiting is recorded so queueing can
+    be told apart from generation time.
+    """
+
+    def __init__(
+        self,
+        max_in_flight_per_host: int = 4,
+        max_in_flight_per_model: Optional[int] = None,
+        model_limits: Optional[Dict[str, int]] = None
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_in_flight_per_host: Maximum concurrent generations per Ollama host
+            max_in_flight_per_model: Default maximum concurrent generations of a model
+                on one host (defaults to the host limit)
+            model_limits: Overrides of the per-model limit keyed by model name
+        """
+        self.max_in_flight_per_host = max_in_flight_per_host
+        self.max_in_flight_per_model = max_in_flight_per_model or max_in_flight_per_host
+        self.model_limits = model_limits or {}
+        self._host_semaphores: Dict[str, FairSemaphore] = {}
+        self._model_semaphores: Dict[Tuple[str, str], FairSemaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._stats = {
+            "acquired": 0,
+            "total_queue_time": 0.0,
+            "max_queue_time": 0.0,
+        }
+
+    def _host_semaphore(self, host: str) -> FairSemaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = FairSemaphore(self.max_in_flight_per_host)
+        return self._host_semaphores[host]
+
+    def _model_semaphore(self, host: str, model: str) -> FairSemaphore:
+        key = (host, model)
+        if key not in self._model_semaphores:
+            limit = self.model_limits.get(model, self.max_in_flight_per_model)
+            self._model_semaphores[key] = FairSemaphore(limit)
+        return self._model_semaphores[key]
+
+    async def acquire(self, host: str, model: str) -> float:
+        """
+        Wait for a model slot and a host slot.
+
+        Args:
+            host: The Ollama host URL
+            model: The model name
+
+        Returns:
+            Time spent queueing, in seconds
+        """
+        start = time.perf_counter()
+        model_semaphore = self._model_semaphore(host, model)
+        await model_semaphore.acquire()
+        try:
+            await self._host_semaphore(host).acquire()
+        except BaseException:
+            model_semaphore.release()
+            raise
+
+        queue_time = time.perf_counter() - start
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        self._stats["acquired"] += 1
+        self._stats["total_queue_time"] += queue_time
+        self._stats["max_queue_time"] = max(self._stats["max_queue_time"], queue_time)
+        return queue_time
+
+    def release(self, host: str, model: str) -> None:
+        """
+        Release the slots taken by acquire.
+
+        Args:
+            host: The Ollama host URL
+            model: The model name
+        """
+        self._in_flight[host] = max(0, self._in_flight.get(host, 0) - 1)
+        self._host_semaphore(host).release()
+        self._model_semaphore(host, model).release()
+
+    @asynccontextmanager
+    async def slot(self, host: str, model: str) -> AsyncIterator[float]:
+        """
+        Hold a host and model slot for the duration of the context.
+
+        Args:
+            host: The Ollama host URL
+            model: The model name
+
+        Yields:
+            Time spent queueing, in seconds
+        """
+        queue_time = await self.acquire(host, model)
+        try:
+            yield queue_time
+        finally:
+            self.release(host, model)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get queueing and in-flight metrics.
+
+        Returns:
+            Metrics dictionary
+        """
+        acquired = self._stats["acquired"]
+        queued_by_model: Dict[str, int] = {}
+        for (_, model), semaphore in self._model_semaphores.items():
+            queued_by_model[model] = queued_by_model.get(model, 0) + semaphore.waiting
+        return {
+            "max_in_flight_per_host": self.max_in_flight_per_host,
+            "acquired": acquired,
+            "avg_queue_time": self._stats["total_queue_time"] / acquired if acquired else 0.0,
+            "max_queue_time": self._stats["max_queue_time"],
+            "in_flight": dict(self._in_flight),
+            "queued": {
+                host: semaphore.waiting for host, semaphore in self._host_semaphores.items()
+            },
+            "queued_by_model": queued_by_model
+        }
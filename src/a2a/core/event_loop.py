@@ -0,0 +1,300 @@
+"""
+Event Loop Module
+
+This module provides a long-lived background event loop so synchronous code
+can run coroutines without creating and tearing down a loop for each call.
+"""
+
+import queue
+import asyncio
+import threading
+import concurrent.futures
+from typing import Optional, Any, Awaitable, AsyncIterable, AsyncIterator, Iterator
+
+
+_END = object()
+
+
+class EventLoopThread:
+    """
+    An asyncio event loop running forever in a daemon thread.
+
+    Coroutines submitted from other threads run on this loop, so resources
+    bound to a loop (client sessions, connection pools, semaphores) survive
+    across calls.
+    """
+
+    def __init__(self, name: str = "a2a-event-loop"):
+        """
+        Initialize the loop thread.
+
+        Args:
+            name: Name of the thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The running loop, started on first use."""
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                self._start()
+            return self._loop
+
+    def _start(self) -> None:
+        ready = threading.Event()
+        loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._loop = loop
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def in_loop_thread(self) -> bool:
+        """Whether the caller is running on this loop's thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the loop.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            Future for the coroutine result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Maximum time to wait, in seconds
+
+        Returns:
+            The coroutine result
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("Cannot block on the background event loop from its own thread")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def iterate(
+        self,
+        async_iterable: AsyncIterable[Any],
+        idle_interval: Optional[float] = None,
+        idle_item: Any = None
+    ) -> Iterator[Any]:
+        """
+        Consume an async iterable from synchronous code.
+
+        Items are produced on the loop and handed over through a queue. If
+        the consumer stops early, the producing task is cancelled; if the
+        producing task is cancelled, the iteration ends.
+
+        Args:
+            async_iterable: The async iterable to consume
+            idle_interval: Yield idle_item after this many seconds without items
+                (never if None)
+            idle_item: Item yielded while the iterable is idle
+
+        Yields:
+            The items of the async iterable
+        """
+        items: "queue.Queue[Any]" = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in async_iterable:
+                    items.put((item, None))
+            except asyncio.CancelledError:
+                items.put((_END, None))
+                raise
+            except Exception as e:
+                items.put((_END, e))
+                return
+            items.put((_END, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                try:
+                    item, error = items.get(timeout=idle_interval)
+                except queue.Empty:
+                    yield idle_item
+                    continue
+                if item is _END:
+                    if error:
+                        raise error
+                    return
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+    async def run_async(self, coro: Awaitable[Any]) -> Any:
+        """
+        Await a coroutine on the loop from any other event loop.
+
+        When called from the loop itself the coroutine is simply awaited.
+        Cancelling the caller cancels the coroutine.
+
+        Args:
+            coro: The coroutine to run
+
+        Returns:
+            The coroutine result
+        """
+        if self.in_loop_thread():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    async def aiterate(self, async_iterable: AsyncIterable[Any]) -> AsyncIterator[Any]:
+        """
+        Consume an async iterable on the loop from any other event loop.
+
+        Args:
+            async_iterable: The async iterable to consume
+
+        Yields:
+            The items of the async iterable
+        """
+        if self.in_loop_thread():
+            async for item in async_iterable:
+                yield item
+            return
+
+        caller_loop = asyncio.get_running_loop()
+        items: asyncio.Queue = asyncio.Queue()
+
+        def put(item: Any, error: Optional[BaseException]) -> None:
+            caller_loop.call_soon_threadsafe(items.put_nowait, (item, error))
+
+        async def pump():
+            try:
+                async for item in async_iterable:
+                    put(item, None)
+            except asyncio.CancelledError:
+                put(_END, None)
+                raise
+            except Exception as e:
+                put(_END, e)
+                return
+            put(_END, None)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = await items.get()
+                if item is _END:
+                    if error:
+                        raise error
+                    return
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        with self._lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+
+
+_default_loop_thread: Optional[EventLoopThread] = None
+_default_lock = threading.Lock()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """
+    Get the process-wide background event loop.
+
+    Returns:
+        The shared EventLoopThread
+    """
+    global _default_loop_thread
+    with _default_lock:
+        if _default_loop_thread is None:
+            _default_loop_thread = EventLoopThread()
+        return _default_loop_thread
+
+
+def run_coroutine(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared background loop and wait for its result.
+
+    Args:
+        coro: The coroutine to run
+        timeout: Maximum time to wait, in seconds
+
+    Returns:
+        The coroutine result
+    """
+    return get_event_loop_thread().run(coro, timeout)
+
+
+def iterate_async(
+    async_iterable: AsyncIterable[Any],
+    idle_interval: Optional[float] = None,
+    idle_item: Any = None
+) -> Iterator[Any]:
+    """
+    Consume an async iterable on the shared background loop.
+
+    Args:
+        async_iterable: The async iterable to consume
+        idle_interval: Yield idle_item after this many seconds without items
+        idle_item: Item yielded while the iterable is idle
+
+    Yields:
+        The items of the async iterable
+    """
+    return get_event_loop_thread().iterate(async_iterable, idle_interval, idle_item)
+
+
+async def await_in_loop(coro: Awaitable[Any]) -> Any:
+    """
+    Await a coroutine on the shared background loop from any event loop.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        The coroutine result
+    """
+    return await get_event_loop_thread().run_async(coro)
+
+
+def aiterate_in_loop(async_iterable: AsyncIterable[Any]) -> AsyncIterator[Any]:
+    """
+    Consume an async iterable on the shared background loop from any event loop.
+
+    Args:
+        async_iterable: The async iterable to consume
+
+    Yields:
+        The items of the async iterable
+    """
+    return get_event_loop_thread().aiterate(async_iterable)
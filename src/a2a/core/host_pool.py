@@ -0,0 +1,298 @@
+"""
+Host Pool Module
+
+This module spreads LLM calls over several Ollama hosts.
+"""
+
+import random
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Any, AsyncIterator, Collection, Set
+
+from ollama import Client, AsyncClient
+
+from a2a.core.resilience import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError, is_retryable_error
+from a2a.core.event_loop import get_event_loop_thread
+
+
+class OllamaHost:
+    """State of one Ollama host in a pool."""
+
+    def __init__(self, url: str):
+        """
+        Initialize the host.
+
+        Args:
+            url: The Ollama host URL
+        """
+        self.url = url
+        self.client = Client(host=url)
+        self.async_client = AsyncClient(host=url)
+        self.healthy = True
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        # Exponentially weighted moving average of call latency, in seconds
+        self.latency: Optional[float] = None
+
+    def record_latency(self, elapsed: float, alpha: float = 0.2) -> None:
+        """
+        Update the latency average.
+
+        Args:
+            elapsed: Duration of a call, in seconds
+            alpha: Weight of the new value
+        """
+        self.latency = elapsed if self.latency is None else (1 - alpha) * self.latency + alpha * elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the host state to a dictionary.
+
+        Returns:
+            The host state
+        """
+        return {
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "latency": self.latency
+        }
+
+
+class HostPool:
+    """
+    Load balancing over Ollama hosts.
+
+    Calls go to the host with the fewest outstanding requests, or to the
+    one with the lowest expected wait (latency average times queue length)
+    with the "latency" strategy. A conversation sticks to the host that
+    served it while that host stays available and not much busier than the
+    others, so Ollama can reuse its cached context. Hosts whose circuit
+    breaker is open or that fail the periodic health check are left out
+    until they recover. A host that fails a call with a transient error
+    loses its conversation, and can be excluded from the retry.
+    """
+
+    STRATEGIES = ("least_outstanding", "latency")
+
+    def __init__(
+        self,
+        hosts: List[str],
+        strategy: str = "least_outstanding",
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        affinity_slack: int = 2,
+        max_affinity_entries: int = 4096
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            hosts: The Ollama host URLs
+            strategy: "least_outstanding" or "latency"
+            circuit_breakers: Breakers used to eject failing hosts
+            affinity_slack: Extra outstanding requests tolerated on a
+                conversation's host before moving it elsewhere
+            max_affinity_entries: Maximum conversations remembered
+        """
+        if not hosts:
+            raise ValueError("A host pool needs at least one host")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown load balancing strategy: {strategy}")
+
+        self.hosts = [OllamaHost(url) for url in dict.fromkeys(hosts)]
+        self.strategy = strategy
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        self.affinity_slack = affinity_slack
+        self.max_affinity_entries = max_affinity_entries
+        self._lock = threading.Lock()
+        self._affinity: "OrderedDict[str, OllamaHost]" = OrderedDict()
+        self._health_task = None
+        self.affinity_hits = 0
+        self.affinity_misses = 0
+
+    @property
+    def primary(self) -> OllamaHost:
+        """The first configured host."""
+        return self.hosts[0]
+
+    def breaker(self, host: OllamaHost) -> CircuitBreaker:
+        """
+        Get the circuit breaker of a host.
+
+        Args:
+            host: The host
+
+        Returns:
+            The host's circuit breaker
+        """
+        return self.circuit_breakers.get(host.url)
+
+    def _available(self, exclude: Collection[str] = ()) -> List[OllamaHost]:
+        candidates = [host for host in self.hosts if host.url not in exclude] or list(self.hosts)
+        available = [
+            host for host in candidates
+            if host.healthy and self.breaker(host).state != CircuitBreaker.OPEN
+        ]
+        # With every host ejected, keep trying them all rather than failing outright
+        return available or candidates
+
+    def can_fail_over(self, exclude: Collection[str]) -> bool:
+        """
+        Check whether a host outside of exclude could take a call.
+
+        Args:
+            exclude: URLs of the hosts to avoid
+
+        Returns:
+            True if another host is available
+        """
+        return any(
+            host.url not in exclude and host.healthy and self.breaker(host).state != CircuitBreaker.OPEN
+            for host in self.hosts
+        )
+
+    def _score(self, host: OllamaHost) -> float:
+        if self.strategy == "latency":
+            return (host.latency or 0.0) * (host.outstanding + 1)
+        return host.outstanding
+
+    def select(self, affinity_key: Optional[str] = None, exclude: Collection[str] = ()) -> OllamaHost:
+        """
+        Choose the host for a call.
+
+        Args:
+            affinity_key: Identity of the conversation, if any
+            exclude: URLs of hosts to avoid, used unless no other host is left
+
+        Returns:
+            The chosen host
+        """
+        with self._lock:
+            available = self._available(exclude)
+            least = min(host.outstanding for host in available)
+
+            if affinity_key is not None:
+                host = self._affinity.get(affinity_key)
+                if host in available and host.outstanding <= least + self.affinity_slack:
+                    self._affinity.move_to_end(affinity_key)
+                    self.affinity_hits += 1
+                    return host
+                if host is not None:
+                    self.affinity_misses += 1
+
+            best = min(self._score(host) for host in available)
+            host = random.choice([host for host in available if self._score(host) == best])
+
+            if affinity_key is not None:
+                self._affinity[affinity_key] = host
+                self._affinity.move_to_end(affinity_key)
+                while len(self._affinity) > self.max_affinity_entries:
+                    self._affinity.popitem(last=False)
+            return host
+
+    def _forget(self, affinity_key: str, host: OllamaHost) -> None:
+        with self._lock:
+            if self._affinity.get(affinity_key) is host:
+                del self._affinity[affinity_key]
+
+    @asynccontextmanager
+    async def lease(
+        self, affinity_key: Optional[str] = None, exclude: Optional[Set[str]] = None
+    ) -> AsyncIterator[OllamaHost]:
+        """
+        Choose a host and count the call as outstanding on it.
+
+        A transient failure, or an open circuit, moves the conversation off
+        the host and adds the host to exclude, so a retry passing the same
+        set goes to another host.
+
+        Args:
+            affinity_key: Identity of the conversation, if any
+            exclude: URLs of hosts to avoid, updated with the host on failure
+
+        Yields:
+            The chosen host
+        """
+        host = self.select(affinity_key, exclude or ())
+        started = asyncio.get_running_loop().time()
+        with self._lock:
+            host.outstanding += 1
+            host.requests += 1
+        try:
+            yield host
+        except Exception as e:
+            with self._lock:
+                host.failures += 1
+            if isinstance(e, CircuitOpenError) or is_retryable_error(e):
+                if affinity_key is not None:
+                    self._forget(affinity_key, host)
+                if exclude is not None:
+                    exclude.add(host.url)
+            raise
+        else:
+            host.record_latency(asyncio.get_running_loop().time() - started)
+        finally:
+            with self._lock:
+                host.outstanding -= 1
+
+    async def check_health(self) -> Dict[str, bool]:
+        """
+        Check every host by listing its loaded models.
+
+        Returns:
+            Health by host URL
+        """
+        async def check(host: OllamaHost) -> None:
+            try:
+                await asyncio.wait_for(host.async_client.ps(), timeout=5)
+                host.healthy = True
+            except Exception:
+                host.healthy = False
+
+        await asyncio.gather(*(check(host) for host in self.hosts))
+        return {host.url: host.healthy for host in self.hosts}
+
+    def start_health_checks(self, interval: float) -> None:
+        """
+        Check host health periodically on the shared background loop.
+
+        Args:
+            interval: Seconds between checks
+        """
+        if self._health_task and not self._health_task.done():
+            return
+
+        async def run():
+            while True:
+                await self.check_health()
+                await asyncio.sleep(interval)
+
+        self._health_task = get_event_loop_thread().submit(run())
+
+    def stop_health_checks(self) -> None:
+        """Stop the periodic health checks."""
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the state of every host.
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            hosts = {host.url: host.to_dict() for host in self.hosts}
+            affinity = {
+                "conversations": len(self._affinity),
+                "hits": self.affinity_hits,
+                "misses": self.affinity_misses
+            }
+        for host in self.hosts:
+            hosts[host.url]["circuit"] = self.breaker(host).state
+        return {"strategy": self.strategy, "hosts": hosts, "affinity": affinity}
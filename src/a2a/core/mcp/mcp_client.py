@@ -5,11 +5,19 @@ This module provides a client for connecting to MCP servers.
 """
 
 import json
-import requests
+import time
+import asyncio
+import functools
 import logging
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Tuple, AsyncIterator, Iterator
 
-from a2a.core.mcp.mcp_schemas import MCPToolDefinition, MCPToolCall, MCPToolResult
+import aiohttp
+
+from a2a.core.mcp.mcp_schemas import MCPToolDefinition, MCPParameterDefinition, MCPToolCall, MCPToolResult
+from a2a.core.mcp.mcp_validation import Validator, compile_validator
+from a2a.core.event_loop import (
+    get_event_loop_thread, await_in_loop, run_coroutine, aiterate_in_loop, iterate_async
+)
 
 # Configure logging
 logging.basicConfig(
@@ -18,23 +26,166 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp_client")
 
+# Errors raised before a request reached the server, so it can be sent elsewhere
+CONNECT_ERRORS = (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError)
+
+# Statuses of requests the server turned away without running them
+UNAVAILABLE_STATUSES = {429, 503}
+
+
+async def gather_tool_calls(
+    calls: List[Tuple[str, Callable[[], Awaitable[MCPToolResult]]]],
+    max_parallel: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> List[MCPToolResult]:
+    """
+    Run tool calls concurrently, within a parallelism limit and a per-call timeout.
+    
+    Args:
+        calls: The name of each call and a function starting it
+        max_parallel: Maximum calls running at once (unlimited if None)
+        timeout: Seconds each call may take (unlimited if None)
+    
+    Returns:
+        Results of the calls, in order; a call that timed out gets a failed result
+    """
+    semaphore = asyncio.Semaphore(max_parallel or len(calls) or 1)
+    
+    async def run(name: str, start: Callable[[], Awaitable[MCPToolResult]]) -> MCPToolResult:
+        async with semaphore:
+            execution = asyncio.ensure_future(start())
+            try:
+                await asyncio.wait({execution}, timeout=timeout)
+                if not execution.done():
+                    logger.error(f"Tool '{name}' timed out after {timeout}s")
+                    return MCPToolResult(name=name, result=None, error=f"Tool call timed out after {timeout}s")
+                return execution.result()
+            finally:
+                execution.cancel()
+                
+    return list(await asyncio.gather(*(run(name, start) for name, start in calls)))
+
+
+class MCPToolError(Exception):
+    """Raised when a streamed tool execution fails."""
+    
+    def __init__(self, tool_name: str, error: str):
+        super().__init__(f"Tool '{tool_name}' failed: {error}")
+        self.tool_name = tool_name
+        self.error = error
+
+
+class MCPServerUnavailableError(Exception):
+    """Raised when an MCP server could not take a request, which was not run."""
+    
+    def __init__(self, server_url: str, reason: str, status: Optional[int] = None):
+        super().__init__(f"MCP server {server_url} unavailable: {reason}")
+        self.server_url = server_url
+        self.reason = reason
+        # HTTP status of the refusal, None if the server could not be reached
+        self.status = status
+
 
 class MCPClient:
-    """Client for connecting to MCP servers and discovering/using tools."""
+    """
+    Client for connecting to MCP servers and discovering/using tools.
     
-    def __init__(self, server_url: str, auth_config: Optional[Dict[str, Any]] = None):
+    Requests go through one aiohttp session that lives on the shared
+    background event loop, so connections to the server are kept alive and
+    reused by callers on any thread or event loop. The *_sync methods serve
+    callers without an event loop.
+    
+    The tool catalog is cached for tools_ttl seconds. After connect, it is
+    revalidated in the background (with the server's ETag) before it
+    expires, so callers reading available_tools never wait for discovery.
+    
+    Tool parameters are checked against the tool's JSON Schema before a
+    call is sent, so invalid calls fail without a round trip to the server.
+    """
+    
+    def __init__(
+        self,
+        server_url: str,
+        auth_config: Optional[Dict[str, Any]] = None,
+        timeout: float = 10.0,
+        execute_timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30.0,
+        tools_ttl: float = 300.0,
+        refresh_ahead: float = 0.8,
+        validate_calls: bool = True
+    ):
         """
         Initialize MCP client with server URL and optional auth.
         
         Args:
             server_url: URL of the MCP server
             auth_config: Authentication configuration
+            timeout: Timeout of discovery requests, in seconds
+            execute_timeout: Timeout of tool executions, in seconds
+            connect_timeout: Timeout for opening a connection, in seconds
+            limit: Maximum open connections
+            limit_per_host: Maximum open connections to one host
+            keepalive_timeout: Seconds an idle connection is kept open
+            tools_ttl: Seconds the discovered tool catalog stays fresh
+            refresh_ahead: Fraction of tools_ttl after which the catalog is
+                refreshed in the background
+            validate_calls: Check tool parameters locally before execution
         """
         self.server_url = server_url.rstrip("/")
         self.auth_config = auth_config
+        self.timeout = timeout
+        self.execute_timeout = execute_timeout
+        self.connect_timeout = connect_timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.tools_ttl = tools_ttl
+        self.refresh_ahead = refresh_ahead
+        self.validate_calls = validate_calls
         self.available_tools: Dict[str, MCPToolDefinition] = {}
+        self.tools_version: Optional[int] = None
+        self._tools_etag: Optional[str] = None
+        self._tools_fetched_at: Optional[float] = None
+        self._tools_callbacks: List[Callable[[Dict[str, MCPToolDefinition]], None]] = []
+        # Compiled parameter validators by tool name, with the definition they belong to
+        self._validators: Dict[str, Tuple[MCPToolDefinition, Validator]] = {}
+        # Created on the background loop on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background_refresh = None
+        self.tool_fetches = 0
+        self.tool_not_modified = 0
+        self.tool_changes = 0
+        self.tool_refresh_errors = 0
+        self.invalid_calls = 0
+        # Whether the server accepts batch requests, None until known
+        self.batch_supported: Optional[bool] = None
         logger.info(f"Initialized MCP client for server: {self.server_url}")
         
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the HTTP session, creating it on first use.
+        
+        Must be called on the shared background loop, which owns the session.
+        
+        Returns:
+            The client session
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout)
+            )
+        return self._session
+        
     async def connect(self) -> Dict[str, Any]:
         """
         Establish connection to MCP server and discover available tools.
@@ -42,6 +193,9 @@ class MCPClient:
         Returns:
             Server information
         """
+        return await await_in_loop(self._connect())
+        
+    async def _connect(self) -> Dict[str, Any]:
         # Fetch server information
         discovery_url = f"{self.server_url}/.well-known/mcp.json"
         logger.info(f"Attempting to connect to MCP server at: {discovery_url}")
@@ -50,29 +204,25 @@ class MCPClient:
             headers = self._get_headers()
             logger.debug(f"Using headers: {headers}")
             
-            response = requests.get(
-                discovery_url,
-                headers=headers,
-                timeout=10  # Added timeout
-            )
-            
-            logger.debug(f"Server response status: {response.status_code}")
-            response.raise_for_status()
+            async with self._get_session().get(discovery_url, headers=headers) as response:
+                logger.debug(f"Server response status: {response.status}")
+                response.raise_for_status()
+                server_info = await response.json(content_type=None)
             
-            server_info = response.json()
             logger.info(f"Successfully connected to MCP server: {server_info.get('name', 'Unknown')}")
             
             # Discover available tools
-            await self.list_tools()
+            await self._refresh_tools()
+            self.start_background_refresh()
             
             return server_info
-        except requests.exceptions.Timeout:
-            logger.error(f"Connection to {discovery_url} timed out after 10 seconds")
+        except asyncio.TimeoutError:
+            logger.error(f"Connection to {discovery_url} timed out after {self.timeout} seconds")
             raise
-        except requests.exceptions.ConnectionError as e:
+        except aiohttp.ClientConnectionError as e:
             logger.error(f"Connection error to {discovery_url}: {e}")
             raise
-        except requests.exceptions.HTTPError as e:
+        except aiohttp.ClientResponseError as e:
             logger.error(f"HTTP error connecting to {discovery_url}: {e}")
             raise
         except json.JSONDecodeError as e:
@@ -86,45 +236,255 @@ class MCPClient:
         """
         Return list of available tools from the MCP server.
         
+        The catalog is revalidated with the server even if the cached one
+        is still fresh.
+        
         Returns:
             List of tool definitions
         """
+        await await_in_loop(self._refresh_tools())
+        return list(self.available_tools.values())
+        
+    async def get_tools(self, force: bool = False) -> Dict[str, MCPToolDefinition]:
+        """
+        Get the tool catalog, fetching it only when needed.
+        
+        An empty or expired catalog is fetched before returning. A fresh one
+        is returned at once, and refreshed in the background if it is close
+        to expiring.
+        
+        Args:
+            force: Revalidate the catalog with the server first
+        
+        Returns:
+            The available tools by name
+        """
+        return await await_in_loop(self._get_tools(force))
+        
+    async def _get_tools(self, force: bool = False) -> Dict[str, MCPToolDefinition]:
+        age = self.tools_age()
+        if force or age is None or age >= self.tools_ttl:
+            await self._refresh_tools()
+        elif age >= self.tools_ttl * self.refresh_ahead:
+            self._start_refresh()
+        return self.available_tools
+        
+    def tools_age(self) -> Optional[float]:
+        """
+        Get the age of the cached tool catalog.
+        
+        Returns:
+            Seconds since the catalog was last fetched or revalidated, or None
+            if it was never fetched
+        """
+        if self._tools_fetched_at is None:
+            return None
+        return time.monotonic() - self._tools_fetched_at
+        
+    def on_tools_changed(self, callback: Callable[[Dict[str, MCPToolDefinition]], None]) -> None:
+        """
+        Register a function called with the new catalog whenever it changes.
+        
+        Callbacks run on the shared background loop and must not block.
+        
+        Args:
+            callback: The function to call
+        """
+        self._tools_callbacks.append(callback)
+        
+    def _start_refresh(self) -> asyncio.Task:
+        # Concurrent refreshes share one request to the server
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._fetch_tools())
+        return self._refresh_task
+        
+    async def _refresh_tools(self) -> None:
+        # A cancelled caller does not cancel the refresh other callers wait for
+        await asyncio.shield(self._start_refresh())
+        
+    async def _fetch_tools(self) -> None:
         tools_url = f"{self.server_url}/tools"
         logger.info(f"Fetching available tools from: {tools_url}")
         
+        headers = self._get_headers()
+        if self._tools_etag and self.available_tools:
+            headers["If-None-Match"] = self._tools_etag
+        
         try:
-            response = requests.get(
-                tools_url,
-                headers=self._get_headers(),
-                timeout=10  # Added timeout
-            )
-            
-            logger.debug(f"Tools endpoint response status: {response.status_code}")
-            response.raise_for_status()
+            async with self._get_session().get(tools_url, headers=headers) as response:
+                logger.debug(f"Tools endpoint response status: {response.status}")
+                self.tool_fetches += 1
+                
+                if response.status == 304:
+                    self.tool_not_modified += 1
+                    self._tools_fetched_at = time.monotonic()
+                    logger.debug("Tool catalog not modified")
+                    return
+                
+                response.raise_for_status()
+                tools_data = await response.json(content_type=None)
+                etag = response.headers.get("ETag")
             
-            tools_data = response.json()
             logger.debug(f"Received tools data: {json.dumps(tools_data)[:200]}...")
             
-            # Parse tools and store them
-            tools = []
+            # Parse tools, keeping the definitions that did not change so
+            # their cached renderings stay valid
+            tools = {}
             for tool_data in tools_data.get("tools", []):
                 tool = MCPToolDefinition(
                     name=tool_data.get("name", ""),
                     description=tool_data.get("description", ""),
                     # Convert from JSONSchema format to our internal format
-                    parameters=[],  # This is simplified; would need to properly parse parameters
+                    parameters=self._parse_parameters(tool_data.get("parameters")),
                     return_schema=tool_data.get("return", {})
                 )
-                tools.append(tool)
-                self.available_tools[tool.name] = tool
-                logger.info(f"Registered tool: {tool.name}")
-                
+                previous = self.available_tools.get(tool.name)
+                tools[tool.name] = previous if previous == tool else tool
+            
+            changed = (
+                tools.keys() != self.available_tools.keys()
+                or any(tool is not self.available_tools[name] for name, tool in tools.items())
+            )
+            
+            self._tools_etag = etag
+            self._tools_fetched_at = time.monotonic()
+            self.tools_version = tools_data.get("version")
             logger.info(f"Successfully discovered {len(tools)} tools")
-            return tools
+            
+            if changed:
+                self.available_tools = tools
+                self.tool_changes += 1
+                logger.info(f"Tool catalog changed: {', '.join(tools) or 'no tools'}")
+                for callback in self._tools_callbacks:
+                    try:
+                        callback(tools)
+                    except Exception as e:
+                        logger.error(f"Error in tools changed callback: {e}")
         except Exception as e:
+            self.tool_refresh_errors += 1
             logger.error(f"Error fetching tools from {tools_url}: {e}")
             raise
         
+    @staticmethod
+    def _parse_parameters(schema: Optional[Dict[str, Any]]) -> List[MCPParameterDefinition]:
+        """
+        Convert the JSON Schema of a tool's parameters to parameter definitions.
+        
+        Args:
+            schema: Object schema with the parameters as properties
+        
+        Returns:
+            The parameter definitions
+        """
+        if not isinstance(schema, dict):
+            return []
+        
+        required = set(schema.get("required") or [])
+        parameters = []
+        for name, prop in (schema.get("properties") or {}).items():
+            prop = prop if isinstance(prop, dict) else {}
+            param_type = prop.get("type", "string")
+            # Keywords other than the description and a single type go to schema_def
+            schema_def = {
+                key: value for key, value in prop.items()
+                if key != "description" and not (key == "type" and isinstance(value, str))
+            }
+            if isinstance(param_type, list):
+                param_type = next((t for t in param_type if t != "null"), "string")
+            
+            parameters.append(MCPParameterDefinition(
+                name=name,
+                description=prop.get("description", ""),
+                type=param_type,
+                required=name in required,
+                schema_def=schema_def or None
+            ))
+        return parameters
+        
+    def validate_call(self, tool_name: str, params: Dict[str, Any]) -> Optional[str]:
+        """
+        Check tool parameters against the tool's schema.
+        
+        The validator of a tool is compiled on first use and reused until
+        the tool definition changes.
+        
+        Args:
+            tool_name: Name of the tool
+            params: Parameters for the tool
+        
+        Returns:
+            The first error found, or None if the parameters are valid
+        """
+        tool = self.available_tools.get(tool_name)
+        if tool is None:
+            return f"Tool not found: {tool_name}"
+        
+        entry = self._validators.get(tool_name)
+        if entry is None or entry[0] is not tool:
+            entry = (tool, compile_validator(tool.to_jsonschema()["parameters"]))
+            self._validators[tool_name] = entry
+        return entry[1](params)
+        
+    def _check_call(self, tool_name: str, params: Dict[str, Any]) -> Optional[MCPToolResult]:
+        """
+        Check a tool call before sending it.
+        
+        Args:
+            tool_name: Name of the tool
+            params: Parameters for the tool
+        
+        Returns:
+            A failed result if the parameters are invalid, None otherwise
+        
+        Raises:
+            ValueError: If the tool is not available
+        """
+        if tool_name not in self.available_tools:
+            logger.error(f"Tool not found: {tool_name}")
+            raise ValueError(f"Tool not found: {tool_name}")
+        
+        if not self.validate_calls:
+            return None
+        
+        error = self.validate_call(tool_name, params)
+        if error is None:
+            return None
+        
+        self.invalid_calls += 1
+        logger.warning(f"Rejected call to tool '{tool_name}': {error}")
+        return MCPToolResult(
+            name=tool_name,
+            result=None,
+            error=f"Invalid parameters: {error}"
+        )
+        
+    def start_background_refresh(self) -> None:
+        """Refresh the tool catalog before it expires, on the shared background loop."""
+        if self._background_refresh and not self._background_refresh.done():
+            return
+        
+        async def run():
+            while True:
+                age = self.tools_age()
+                refresh_at = self.tools_ttl * self.refresh_ahead
+                if age is not None and age < refresh_at:
+                    # Also covers a refresh made meanwhile by a caller
+                    await asyncio.sleep(refresh_at - age)
+                    continue
+                try:
+                    await self._refresh_tools()
+                except Exception:
+                    # Keep serving the cached catalog and try again shortly
+                    await asyncio.sleep(max(1.0, min(self.tools_ttl - refresh_at, 30.0)))
+        
+        self._background_refresh = get_event_loop_thread().submit(run())
+        
+    def stop_background_refresh(self) -> None:
+        """Stop refreshing the tool catalog in the background."""
+        if self._background_refresh:
+            self._background_refresh.cancel()
+            self._background_refresh = None
+        
     async def execute_tool(self, tool_name: str, params: Dict[str, Any]) -> MCPToolResult:
         """
         Execute a tool on the MCP server with given parameters.
@@ -132,14 +492,36 @@ class MCPClient:
         Args:
             tool_name: Name of the tool to execute
             params: Parameters for the tool
-            
+        
+        Returns:
+            Result of the tool execution, failed without contacting the server
+            if the parameters do not match the tool's schema
+        
+        Raises:
+            ValueError: If the tool is not available
+        """
+        rejected = self._check_call(tool_name, params)
+        if rejected:
+            return rejected
+        
+        return await await_in_loop(self._execute_tool(tool_name, params))
+        
+    async def _execute_tool(
+        self, tool_name: str, params: Dict[str, Any], raise_unavailable: bool = False
+    ) -> MCPToolResult:
+        """
+        Send a tool call to the server.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            params: Parameters for the tool
+            raise_unavailable: Raise MCPServerUnavailableError, instead of
+                returning a failed result, when the server could not take
+                the call, so it can be sent to another server
+        
         Returns:
             Result of the tool execution
         """
-        if tool_name not in self.available_tools:
-            logger.error(f"Tool not found: {tool_name}")
-            raise ValueError(f"Tool not found: {tool_name}")
-            
         call = MCPToolCall(name=tool_name, parameters=params)
         execute_url = f"{self.server_url}/execute"
         logger.info(f"Executing tool '{tool_name}' with parameters: {json.dumps(params)}")
@@ -148,42 +530,60 @@ class MCPClient:
             payload = {"name": call.name, "parameters": call.parameters}
             logger.debug(f"Sending execution request to {execute_url} with payload: {json.dumps(payload)}")
             
-            response = requests.post(
+            async with self._get_session().post(
                 execute_url,
                 headers=self._get_headers(),
                 json=payload,
-                timeout=30  # Longer timeout for execution
-            )
-            
-            logger.debug(f"Tool execution response status: {response.status_code}")
-            
-            try:
-                response.raise_for_status()
-                result_data = response.json()
-                logger.info(f"Tool '{tool_name}' executed successfully")
-                logger.debug(f"Tool result: {json.dumps(result_data)[:200]}...")
+                timeout=aiohttp.ClientTimeout(total=self.execute_timeout, sock_connect=self.connect_timeout)
+            ) as response:
+                logger.debug(f"Tool execution response status: {response.status}")
                 
-                return MCPToolResult(
-                    name=tool_name,
-                    result=result_data.get("result"),
-                    error=None
-                )
-            except requests.HTTPError as e:
-                error_msg = str(e)
-                try:
-                    error_data = response.json()
-                    if "error" in error_data:
-                        error_msg = error_data["error"]
-                        logger.error(f"Tool execution returned error: {error_msg}")
-                except:
-                    logger.error(f"Tool execution failed with status {response.status_code}, but no error details available")
-                    pass
+                if response.status >= 400:
+                    error_msg = f"{response.status} {response.reason} for url: {response.url}"
+                    try:
+                        error_data = await response.json(content_type=None)
+                        if "error" in error_data:
+                            error_msg = error_data["error"]
+                            logger.error(f"Tool execution returned error: {error_msg}")
+                    except Exception:
+                        logger.error(f"Tool execution failed with status {response.status}, but no error details available")
                     
-                return MCPToolResult(
-                    name=tool_name,
-                    result=None,
-                    error=error_msg
-                )
+                    if raise_unavailable and response.status in UNAVAILABLE_STATUSES:
+                        raise MCPServerUnavailableError(self.server_url, error_msg, response.status)
+                    return MCPToolResult(
+                        name=tool_name,
+                        result=None,
+                        error=error_msg
+                    )
+                
+                result_data = await response.json(content_type=None)
+            
+            logger.info(f"Tool '{tool_name}' executed successfully")
+            logger.debug(f"Tool result: {json.dumps(result_data)[:200]}...")
+            
+            return MCPToolResult(
+                name=tool_name,
+                result=result_data.get("result"),
+                error=None
+            )
+        except MCPServerUnavailableError:
+            raise
+        except CONNECT_ERRORS as e:
+            logger.error(f"Could not connect to {self.server_url} to execute tool '{tool_name}': {e}")
+            if raise_unavailable:
+                raise MCPServerUnavailableError(self.server_url, str(e)) from e
+            return MCPToolResult(
+                name=tool_name,
+                result=None,
+                error=str(e)
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Tool '{tool_name}' timed out after {self.execute_timeout} seconds")
+            return MCPToolResult(
+                name=tool_name,
+                result=None,
+                error=f"Tool execution timed out after {self.execute_timeout}s"
+            )
         except Exception as e:
             logger.error(f"Unexpected error executing tool '{tool_name}': {e}")
             return MCPToolResult(
@@ -191,7 +591,362 @@ class MCPClient:
                 result=None,
                 error=str(e)
             )
+        
+    async def execute_tools(
+        self,
+        calls: List[Dict[str, Any]],
+        max_parallel: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[MCPToolResult]:
+        """
+        Execute several tools with one request to the MCP server.
+        
+        Calls that fail local validation, or name an unknown tool, get a
+        failed result without being sent. If the server does not support
+        batch requests, the calls are sent concurrently one by one. Either
+        way max_parallel and timeout apply to every call.
+        
+        Args:
+            calls: The calls, each with name and parameters
+            max_parallel: Maximum calls running at once (unlimited if None)
+            timeout: Seconds each call may take (unlimited if None)
+            
+        Returns:
+            Results of the calls, in order
+        """
+        results, pending = self._check_calls(calls)
+        if pending:
+            sent = await await_in_loop(
+                self._execute_batch([call for _, call in pending], max_parallel=max_parallel, timeout=timeout)
+            )
+            for (i, _), result in zip(pending, sent):
+                results[i] = result
+        return results
+        
+    def _check_calls(
+        self, calls: List[Dict[str, Any]]
+    ) -> Tuple[List[Optional[MCPToolResult]], List[Tuple[int, MCPToolCall]]]:
+        """
+        Check the calls of a batch before sending them.
+        
+        Args:
+            calls: The calls, each with name and parameters
+            
+        Returns:
+            The results list, holding the failed results of rejected calls,
+            and the calls to send with their positions
+        """
+        results: List[Optional[MCPToolResult]] = [None] * len(calls)
+        pending = []
+        for i, call in enumerate(calls):
+            tool_name = call.get("name") or ""
+            params = call.get("parameters") or {}
+            try:
+                results[i] = self._check_call(tool_name, params)
+            except ValueError as e:
+                results[i] = MCPToolResult(name=tool_name, result=None, error=str(e))
+            if results[i] is None:
+                pending.append((i, MCPToolCall(name=tool_name, parameters=params)))
+        return results, pending
+        
+    async def _execute_batch(
+        self,
+        calls: List[MCPToolCall],
+        raise_unavailable: bool = False,
+        max_parallel: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[MCPToolResult]:
+        """
+        Send tool calls to the server, in one request if it supports batches.
+        
+        Args:
+            calls: The calls to send
+            raise_unavailable: Raise MCPServerUnavailableError when the
+                server could not take the batch. Calls sent one by one only
+                raise it when there is a single call, since the others may
+                have run.
+            max_parallel: Maximum calls running at once (unlimited if None)
+            timeout: Seconds each call may take (unlimited if None)
+        
+        Returns:
+            Results of the calls, in order
+        """
+        if len(calls) == 1 or self.batch_supported is False:
+            single = raise_unavailable and len(calls) == 1
+            return await gather_tool_calls(
+                [
+                    (call.name, functools.partial(self._execute_tool, call.name, call.parameters, single))
+                    for call in calls
+                ],
+                max_parallel,
+                timeout
+            )
+            
+        batch_url = f"{self.server_url}/execute/batch"
+        logger.info(f"Executing batch of {len(calls)} tool calls: {', '.join(call.name for call in calls)}")
+        
+        def failed(error: str) -> List[MCPToolResult]:
+            return [MCPToolResult(name=call.name, result=None, error=error) for call in calls]
+            
+        # The server applies the limits to each call of the batch
+        limits = {}
+        if max_parallel:
+            limits["concurrency"] = str(max_parallel)
+        if timeout:
+            limits["timeout"] = str(timeout)
+            
+        try:
+            async with self._get_session().post(
+                batch_url,
+                params=limits,
+                headers=self._get_headers(),
+                json=[{"name": call.name, "parameters": call.parameters} for call in calls],
+                timeout=aiohttp.ClientTimeout(total=self.execute_timeout, sock_connect=self.connect_timeout)
+            ) as response:
+                logger.debug(f"Batch execution response status: {response.status}")
+                
+                if response.status in (404, 405):
+                    self.batch_supported = False
+                    logger.info(f"Server {self.server_url} does not support batch execution, using single calls")
+                elif response.status >= 400:
+                    error_msg = f"{response.status} {response.reason} for url: {response.url}"
+                    try:
+                        error_msg = (await response.json(content_type=None)).get("error", error_msg)
+                    except Exception:
+                        pass
+                    logger.error(f"Batch execution failed: {error_msg}")
+                    if raise_unavailable and response.status in UNAVAILABLE_STATUSES:
+                        raise MCPServerUnavailableError(self.server_url, error_msg, response.status)
+                    return failed(error_msg)
+                else:
+                    self.batch_supported = True
+                    entries = (await response.json(content_type=None)).get("results", [])
+                    if len(entries) != len(calls):
+                        return failed(f"Expected {len(calls)} batch results, got {len(entries)}")
+                    return [
+                        MCPToolResult(name=call.name, result=entry.get("result"), error=entry.get("error"))
+                        for call, entry in zip(calls, entries)
+                    ]
+        except MCPServerUnavailableError:
+            raise
+        except CONNECT_ERRORS as e:
+            logger.error(f"Could not connect to {self.server_url} to execute batch: {e}")
+            if raise_unavailable:
+                raise MCPServerUnavailableError(self.server_url, str(e)) from e
+            return failed(str(e))
+        except asyncio.TimeoutError:
+            logger.error(f"Batch of {len(calls)} tool calls timed out after {self.execute_timeout} seconds")
+            return failed(f"Tool execution timed out after {self.execute_timeout}s")
+        except Exception as e:
+            logger.error(f"Unexpected error executing batch of {len(calls)} tool calls: {e}")
+            return failed(str(e))
+            
+        return await self._execute_batch(calls, raise_unavailable, max_parallel, timeout)
+        
+    def stream_tool(self, tool_name: str, params: Dict[str, Any]) -> AsyncIterator[Any]:
+        """
+        Execute a tool, yielding its result chunks as the server produces them.
+        
+        Tools that do not stream yield their whole result as one chunk.
+        Stopping the iteration closes the connection, which stops the tool
+        on the server.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            params: Parameters for the tool
+            
+        Returns:
+            Async iterator over the result chunks
+            
+        Raises:
+            ValueError: If the tool is not available
+            MCPToolError: If the parameters are invalid or the tool fails
+        """
+        rejected = self._check_call(tool_name, params)
+        if rejected:
+            raise MCPToolError(tool_name, rejected.error)
+        return aiterate_in_loop(self._stream_tool(tool_name, params))
+        
+    async def _stream_tool(
+        self, tool_name: str, params: Dict[str, Any], raise_unavailable: bool = False
+    ) -> AsyncIterator[Any]:
+        """
+        Stream a tool's result chunks from the server.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            params: Parameters for the tool
+            raise_unavailable: Raise MCPServerUnavailableError, instead of
+                MCPToolError, when the server could not take the call
+        
+        Yields:
+            The result chunks
+        """
+        stream_url = f"{self.server_url}/execute/stream"
+        logger.info(f"Streaming tool '{tool_name}' with parameters: {json.dumps(params)}")
+        
+        headers = self._get_headers()
+        headers["Accept"] = "application/x-ndjson"
+        
+        try:
+            async with self._get_session().post(
+                stream_url,
+                headers=headers,
+                json={"name": tool_name, "parameters": params},
+                # No total limit for streams; execute_timeout bounds the wait between chunks
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=self.connect_timeout, sock_read=self.execute_timeout
+                )
+            ) as response:
+                if response.status >= 400:
+                    error_msg = f"{response.status} {response.reason} for url: {response.url}"
+                    try:
+                        error_msg = (await response.json(content_type=None)).get("error", error_msg)
+                    except Exception:
+                        pass
+                    logger.error(f"Tool streaming failed: {error_msg}")
+                    if raise_unavailable and response.status in UNAVAILABLE_STATUSES:
+                        raise MCPServerUnavailableError(self.server_url, error_msg, response.status)
+                    raise MCPToolError(tool_name, error_msg)
+                    
+                # Split lines manually: a chunk may be longer than aiohttp's line limit
+                buffer = b""
+                async for data in response.content.iter_any():
+                    buffer += data
+                    *lines, buffer = buffer.split(b"\n")
+                    for line in lines:
+                        if not line.strip():
+                            continue
+                        try:
+                            message = json.loads(line)
+                        except ValueError:
+                            message = None
+                        if not isinstance(message, dict):
+                            logger.error(f"Invalid stream message for tool '{tool_name}': {line[:200]!r}")
+                            raise MCPToolError(tool_name, "Invalid stream message from server")
+                        if "chunk" in message:
+                            yield message["chunk"]
+                        elif "error" in message:
+                            logger.error(f"Tool '{tool_name}' failed while streaming: {message['error']}")
+                            raise MCPToolError(tool_name, message["error"])
+                        elif message.get("done"):
+                            logger.info(f"Tool '{tool_name}' streamed {message.get('chunks', 0)} chunks")
+                            return
+        except CONNECT_ERRORS as e:
+            logger.error(f"Could not connect to {self.server_url} to stream tool '{tool_name}': {e}")
+            if raise_unavailable:
+                raise MCPServerUnavailableError(self.server_url, str(e)) from e
+            raise
             
+        raise MCPToolError(tool_name, "Stream ended before the tool finished")
+        
+    async def close(self) -> None:
+        """Close the HTTP session and its pooled connections."""
+        await await_in_loop(self._close())
+        
+    async def _close(self) -> None:
+        self.stop_background_refresh()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    def connect_sync(self) -> Dict[str, Any]:
+        """
+        Connect to the MCP server from synchronous code.
+        
+        Returns:
+            Server information
+        """
+        return run_coroutine(self._connect())
+        
+    def list_tools_sync(self) -> List[MCPToolDefinition]:
+        """
+        Fetch the available tools from synchronous code.
+        
+        Returns:
+            List of tool definitions
+        """
+        run_coroutine(self._refresh_tools())
+        return list(self.available_tools.values())
+        
+    def execute_tool_sync(self, tool_name: str, params: Dict[str, Any]) -> MCPToolResult:
+        """
+        Execute a tool from synchronous code.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            params: Parameters for the tool
+        
+        Returns:
+            Result of the tool execution, failed without contacting the server
+            if the parameters do not match the tool's schema
+        
+        Raises:
+            ValueError: If the tool is not available
+        """
+        rejected = self._check_call(tool_name, params)
+        if rejected:
+            return rejected
+        
+        return run_coroutine(self._execute_tool(tool_name, params))
+        
+    def execute_tools_sync(self, calls: List[Dict[str, Any]]) -> List[MCPToolResult]:
+        """
+        Execute several tools from synchronous code.
+        
+        Args:
+            calls: The calls, each with name and parameters
+            
+        Returns:
+            Results of the calls, in order
+        """
+        results, pending = self._check_calls(calls)
+        if pending:
+            sent = run_coroutine(self._execute_batch([call for _, call in pending]))
+            for (i, _), result in zip(pending, sent):
+                results[i] = result
+        return results
+        
+    def stream_tool_sync(self, tool_name: str, params: Dict[str, Any]) -> Iterator[Any]:
+        """
+        Execute a tool from synchronous code, iterating over its result chunks.
+        
+        Args:
+            tool_name: Name of the tool to execute
+            params: Parameters for the tool
+            
+        Returns:
+            Iterator over the result chunks
+        """
+        rejected = self._check_call(tool_name, params)
+        if rejected:
+            raise MCPToolError(tool_name, rejected.error)
+        return iterate_async(self._stream_tool(tool_name, params))
+        
+    def close_sync(self) -> None:
+        """Close the HTTP session from synchronous code."""
+        run_coroutine(self._close())
+        
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get tool discovery counters.
+        
+        Returns:
+            Metrics dictionary
+        """
+        return {
+            "server_url": self.server_url,
+            "tools": len(self.available_tools),
+            "tools_version": self.tools_version,
+            "tools_age": self.tools_age(),
+            "fetches": self.tool_fetches,
+            "not_modified": self.tool_not_modified,
+            "changes": self.tool_changes,
+            "refresh_errors": self.tool_refresh_errors,
+            "invalid_calls": self.invalid_calls,
+            "batch_supported": self.batch_supported
+        }
+        
     def _get_headers(self) -> Dict[str, str]:
         """
         Get HTTP headers for MCP requests.
@@ -217,5 +972,5 @@ class MCPClient:
                 key_name = self.auth_config.get("key_name", "X-API-Key")
                 headers[key_name] = key
                 logger.debug(f"Added API key authentication with key name: {key_name}")
-                
-        return headers 
\ No newline at end of file
+        
+        return headers
@@ -0,0 +1,641 @@
+"""
+MCP Client Pool Module
+
+This module provides a client combining the tools of several MCP servers.
+"""
+
+import time
+import random
+import asyncio
+import functools
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Union, Tuple, Set, Iterable, AsyncIterator, Iterator
+
+from a2a.core.mcp.mcp_client import MCPClient, MCPToolError, MCPServerUnavailableError, gather_tool_calls
+from a2a.core.mcp.mcp_schemas import MCPToolDefinition, MCPToolCall, MCPToolResult
+from a2a.core.resilience import CircuitBreaker, CircuitOpenError
+from a2a.core.event_loop import (
+    get_event_loop_thread, await_in_loop, run_coroutine, aiterate_in_loop, iterate_async
+)
+
+logger = logging.getLogger("mcp_client")
+
+# Errors after which a call can be sent to another replica, as it did not run
+FAILOVER_ERRORS = (MCPServerUnavailableError, CircuitOpenError)
+
+
+def _is_server_failure(error: BaseException) -> bool:
+    # A busy tool (429) says nothing about the health of the server
+    return isinstance(error, MCPServerUnavailableError) and error.status != 429
+
+
+class PooledServer:
+    """State of one MCP server in a pool."""
+    
+    def __init__(
+        self,
+        namespace: str,
+        client: MCPClient,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0
+    ):
+        """
+        Initialize the server.
+        
+        Args:
+            namespace: Namespace of the server's tools
+            client: Client connected to the server
+            failure_threshold: Consecutive failures that open the server's circuit
+            recovery_timeout: Seconds the circuit stays open before probing
+        """
+        self.namespace = namespace
+        self.client = client
+        self.url = client.server_url
+        self.breaker = CircuitBreaker(
+            self.url,
+            failure_threshold=failure_threshold,
+            recovery_timeout=recovery_timeout,
+            is_failure=_is_server_failure
+        )
+        self.connected = False
+        self.healthy = False
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        # Exponentially weighted moving average of call latency, in seconds
+        self.latency: Optional[float] = None
+        
+    def record_latency(self, elapsed: float, alpha: float = 0.2) -> None:
+        """
+        Update the latency average.
+        
+        Args:
+            elapsed: Duration of a call, in seconds
+            alpha: Weight of the new value
+        """
+        self.latency = elapsed if self.latency is None else (1 - alpha) * self.latency + alpha * elapsed
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the server state to a dictionary.
+        
+        Returns:
+            The server state
+        """
+        return {
+            "namespace": self.namespace,
+            "connected": self.connected,
+            "healthy": self.healthy,
+            "circuit": self.breaker.state,
+            "tools": len(self.client.available_tools),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "latency": self.latency,
+            "last_error": self.last_error
+        }
+
+
+class MCPClientPool:
+    """
+    Client for the tools of several MCP servers.
+    
+    Each server belongs to a namespace, and its tools are exposed as
+    "<namespace><separator><tool>" in one routing table. A tool name that
+    exists in a single namespace can also be called without its prefix.
+    Servers listed under the same namespace are replicas: a call goes to
+    the replica exposing the tool with the lowest expected wait (latency
+    average times outstanding calls), and moves to the next one if the
+    server could not take it. Calls that reached a server are never sent
+    twice, since tools may have side effects.
+    
+    Servers whose circuit opens after repeated connection failures, or that
+    fail the periodic health check, are left out until they recover.
+    
+    The pool offers the interface of MCPClient (available_tools,
+    execute_tool, execute_tools, stream_tool, get_tools and their sync
+    variants), so it can be configured on an agent or a bridge in place of
+    a single client.
+    """
+    
+    def __init__(
+        self,
+        servers: Dict[str, Union[str, MCPClient, List[Union[str, MCPClient]]]],
+        separator: str = "__",
+        client_options: Optional[Dict[str, Any]] = None,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            servers: Server URLs or clients by namespace; a list holds replicas
+            separator: Separator between namespace and tool name. The default
+                keeps names valid for models restricting function names to
+                letters, digits, "_" and "-".
+            client_options: Keyword arguments for the clients created from URLs
+            failure_threshold: Consecutive failures that take a server out of rotation
+            recovery_timeout: Seconds before a failed server is tried again
+        """
+        if not servers:
+            raise ValueError("A client pool needs at least one server")
+        
+        self.separator = separator
+        self.servers: List[PooledServer] = []
+        for namespace, entries in servers.items():
+            for entry in entries if isinstance(entries, list) else [entries]:
+                client = entry if isinstance(entry, MCPClient) else MCPClient(entry, **(client_options or {}))
+                server = PooledServer(namespace, client, failure_threshold, recovery_timeout)
+                client.on_tools_changed(lambda tools: self._rebuild_routes())
+                self.servers.append(server)
+        
+        self.available_tools: Dict[str, MCPToolDefinition] = {}
+        # Tool name on the servers and replicas exposing it, by routed name
+        self._routes: Dict[str, Tuple[str, List[PooledServer]]] = {}
+        # Routed name of tool names found in a single namespace
+        self._aliases: Dict[str, str] = {}
+        self._health_task = None
+        self.failovers = 0
+        logger.info(f"Initialized MCP client pool for {len(self.servers)} servers in {len(servers)} namespaces")
+        
+    @property
+    def server_url(self) -> str:
+        """URLs of the pooled servers."""
+        return ", ".join(server.url for server in self.servers)
+        
+    def _rebuild_routes(self) -> None:
+        """Rebuild the routing table from the catalogs of the servers."""
+        routes: Dict[str, Tuple[str, List[PooledServer]]] = {}
+        tools: Dict[str, MCPToolDefinition] = {}
+        namespaces: Dict[str, Set[str]] = {}
+        for server in self.servers:
+            for name, tool in server.client.available_tools.items():
+                routed = f"{server.namespace}{self.separator}{name}"
+                if routed in routes:
+                    routes[routed][1].append(server)
+                    continue
+                routes[routed] = (name, [server])
+                namespaces.setdefault(name, set()).add(server.namespace)
+                renamed = MCPToolDefinition(
+                    name=routed,
+                    description=tool.description,
+                    parameters=tool.parameters,
+                    return_schema=tool.return_schema
+                )
+                # Keep unchanged definitions so their cached renderings stay valid
+                previous = self.available_tools.get(routed)
+                tools[routed] = previous if previous == renamed else renamed
+        
+        # Replace whole tables so readers on other threads never see a partial one
+        self._routes = routes
+        self._aliases = {
+            name: f"{next(iter(found))}{self.separator}{name}"
+            for name, found in namespaces.items() if len(found) == 1
+        }
+        if tools.keys() != self.available_tools.keys() or any(
+            tool is not self.available_tools[name] for name, tool in tools.items()
+        ):
+            self.available_tools = tools
+            logger.info(f"Routing {len(tools)} tools over {len(self.servers)} servers")
+        
+    def _resolve(self, tool_name: str) -> Tuple[str, str, List[PooledServer]]:
+        """
+        Find the servers of a tool.
+        
+        Args:
+            tool_name: Routed name of the tool, or its name if unambiguous
+        
+        Returns:
+            The routed name, the tool name on the servers and the replicas
+        
+        Raises:
+            ValueError: If the tool is not available
+        """
+        routed = tool_name if tool_name in self._routes else self._aliases.get(tool_name)
+        route = self._routes.get(routed) if routed else None
+        if route is None:
+            logger.error(f"Tool not found: {tool_name}")
+            raise ValueError(f"Tool not found: {tool_name}")
+        return routed, route[0], route[1]
+        
+    def _candidates(self, replicas: List[PooledServer], exclude: Iterable[PooledServer] = ()) -> List[PooledServer]:
+        """
+        Order the replicas of a tool by preference.
+        
+        Args:
+            replicas: The servers exposing the tool
+            exclude: Servers already tried
+        
+        Returns:
+            The servers to try, best first
+        """
+        remaining = [server for server in replicas if server not in exclude]
+        available = [
+            server for server in remaining
+            if server.healthy and server.breaker.state != CircuitBreaker.OPEN
+        ]
+        # With every replica out of rotation, keep trying them rather than failing outright
+        candidates = available or remaining
+        random.shuffle(candidates)
+        return sorted(candidates, key=lambda server: (server.latency or 0.0) * (server.outstanding + 1))
+        
+    @contextmanager
+    def _lease(self, server: PooledServer) -> Iterator[None]:
+        """
+        Count a call as outstanding on a server and record its outcome.
+        
+        Args:
+            server: The server taking the call
+        
+        Raises:
+            CircuitOpenError: If the server's circuit is open
+        """
+        started = time.monotonic()
+        server.outstanding += 1
+        server.requests += 1
+        try:
+            with server.breaker.guard():
+                yield
+        except FAILOVER_ERRORS as e:
+            server.failures += 1
+            server.last_error = str(e)
+            raise
+        else:
+            server.healthy = True
+            server.record_latency(time.monotonic() - started)
+        finally:
+            server.outstanding -= 1
+        
+    async def connect(self) -> Dict[str, Any]:
+        """
+        Connect to all servers concurrently and build the routing table.
+        
+        Servers that cannot be reached are left out until a health check
+        reaches them.
+        
+        Returns:
+            Server information by URL, with the error of unreachable servers
+        
+        Raises:
+            ConnectionError: If no server could be reached
+        """
+        return await await_in_loop(self._connect())
+        
+    async def _connect(self) -> Dict[str, Any]:
+        results = await asyncio.gather(
+            *(server.client._connect() for server in self.servers), return_exceptions=True
+        )
+        servers_info = {}
+        for server, result in zip(self.servers, results):
+            if isinstance(result, BaseException):
+                server.connected = server.healthy = False
+                server.last_error = str(result) or type(result).__name__
+                logger.error(f"Could not connect to MCP server {server.url}: {server.last_error}")
+                servers_info[server.url] = {"error": server.last_error}
+            else:
+                server.connected = server.healthy = True
+                servers_info[server.url] = result
+        
+        self._rebuild_routes()
+        if not any(server.connected for server in self.servers):
+            raise ConnectionError("Could not connect to any MCP server")
+        return {"servers": servers_info, "tools": len(self.available_tools)}
+        
+    async def list_tools(self) -> List[MCPToolDefinition]:
+        """
+        Revalidate the catalogs of all servers and list the routed tools.
+        
+        Returns:
+            List of tool definitions, named with their namespace
+        """
+        return list((await self.get_tools(force=True)).values())
+        
+    async def get_tools(self, force: bool = False) -> Dict[str, MCPToolDefinition]:
+        """
+        Get the routed tools, refreshing the catalogs that need it.
+        
+        Args:
+            force: Revalidate every catalog with its server first
+        
+        Returns:
+            The available tools by routed name
+        """
+        return await await_in_loop(self._get_tools(force))
+        
+    async def _get_tools(self, force: bool = False) -> Dict[str, MCPToolDefinition]:
+        # A server failing here keeps its cached catalog; health checks deal with it
+        await asyncio.gather(
+            *(server.client._get_tools(force) for server in self.servers if server.connected),
+            return_exceptions=True
+        )
+        self._rebuild_routes()
+        return self.available_tools
+        
+    async def execute_tool(self, tool_name: str, params: Dict[str, Any]) -> MCPToolResult:
+        """
+        Execute a tool on one of the servers exposing it.
+        
+        Args:
+            tool_name: Routed name of the tool, or its name if unambiguous
+            params: Parameters for the tool
+        
+        Returns:
+            Result of the tool execution, named with the routed name
+        
+        Raises:
+            ValueError: If the tool is not available
+        """
+        self._resolve(tool_name)
+        return await await_in_loop(self._execute_tool(tool_name, params))
+        
+    async def _execute_tool(
+        self, tool_name: str, params: Dict[str, Any], exclude: Iterable[PooledServer] = ()
+    ) -> MCPToolResult:
+        routed, name, replicas = self._resolve(tool_name)
+        tried = set(exclude)
+        error = None
+        while True:
+            candidates = self._candidates(replicas, tried)
+            if not candidates:
+                return MCPToolResult(name=routed, result=None, error=f"No server available for tool '{routed}': {error}")
+            server = candidates[0]
+            tried.add(server)
+            
+            rejected = server.client._check_call(name, params)
+            if rejected:
+                return MCPToolResult(name=routed, result=None, error=rejected.error)
+            
+            try:
+                with self._lease(server):
+                    result = await server.client._execute_tool(name, params, raise_unavailable=True)
+                return MCPToolResult(name=routed, result=result.result, error=result.error)
+            except FAILOVER_ERRORS as e:
+                error = e
+                self.failovers += 1
+                logger.warning(f"Tool '{routed}' failed over from {server.url}: {e}")
+        
+    async def execute_tools(
+        self,
+        calls: List[Dict[str, Any]],
+        max_parallel: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[MCPToolResult]:
+        """
+        Execute several tools, with one request per server involved.
+        
+        Calls that fail local validation, or name an unknown tool, get a
+        failed result without being sent. If a server cannot take its part
+        of the batch, those calls fail over one by one.
+        
+        Args:
+            calls: The calls, each with name and parameters
+            max_parallel: Maximum calls running at once on each server
+                (unlimited if None)
+            timeout: Seconds each call may take (unlimited if None)
+        
+        Returns:
+            Results of the calls, in order
+        """
+        return await await_in_loop(self._execute_tools(calls, max_parallel, timeout))
+        
+    async def _execute_tools(
+        self,
+        calls: List[Dict[str, Any]],
+        max_parallel: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List[MCPToolResult]:
+        results: List[Optional[MCPToolResult]] = [None] * len(calls)
+        groups: Dict[PooledServer, List[Tuple[int, str, MCPToolCall]]] = {}
+        for i, call in enumerate(calls):
+            tool_name = call.get("name") or ""
+            params = call.get("parameters") or {}
+            try:
+                routed, name, replicas = self._resolve(tool_name)
+            except ValueError as e:
+                results[i] = MCPToolResult(name=tool_name, result=None, error=str(e))
+                continue
+            server = self._candidates(replicas)[0]
+            rejected = server.client._check_call(name, params)
+            if rejected:
+                results[i] = MCPToolResult(name=routed, result=None, error=rejected.error)
+                continue
+            groups.setdefault(server, []).append((i, routed, MCPToolCall(name=name, parameters=params)))
+        
+        def one_by_one(group: List[Tuple[int, str, MCPToolCall]], exclude: List[PooledServer]):
+            return gather_tool_calls(
+                [
+                    (routed, functools.partial(self._execute_tool, routed, call.parameters, exclude))
+                    for _, routed, call in group
+                ],
+                max_parallel,
+                timeout
+            )
+            
+        async def run(server: PooledServer, group: List[Tuple[int, str, MCPToolCall]]) -> None:
+            if len(group) == 1 or server.client.batch_supported is False:
+                # Single calls fail over individually
+                sent = await one_by_one(group, [])
+            else:
+                try:
+                    with self._lease(server):
+                        sent = await server.client._execute_batch(
+                            [call for _, _, call in group], True, max_parallel, timeout
+                        )
+                except FAILOVER_ERRORS as e:
+                    self.failovers += 1
+                    logger.warning(f"Batch of {len(group)} tool calls failed over from {server.url}: {e}")
+                    sent = await one_by_one(group, [server])
+            for (i, routed, _), result in zip(group, sent):
+                results[i] = MCPToolResult(name=routed, result=result.result, error=result.error)
+        
+        await asyncio.gather(*(run(server, group) for server, group in groups.items()))
+        return results
+        
+    def stream_tool(self, tool_name: str, params: Dict[str, Any]) -> AsyncIterator[Any]:
+        """
+        Execute a tool on one of the servers exposing it, yielding its result chunks.
+        
+        A stream fails over to another replica only before its first chunk.
+        
+        Args:
+            tool_name: Routed name of the tool, or its name if unambiguous
+            params: Parameters for the tool
+        
+        Returns:
+            Async iterator over the result chunks
+        
+        Raises:
+            ValueError: If the tool is not available
+            MCPToolError: If the parameters are invalid or the tool fails
+        """
+        self._resolve(tool_name)
+        return aiterate_in_loop(self._stream_tool(tool_name, params))
+        
+    async def _stream_tool(self, tool_name: str, params: Dict[str, Any]) -> AsyncIterator[Any]:
+        routed, name, replicas = self._resolve(tool_name)
+        tried = set()
+        error = None
+        while True:
+            candidates = self._candidates(replicas, tried)
+            if not candidates:
+                raise MCPToolError(routed, f"No server available: {error}")
+            server = candidates[0]
+            tried.add(server)
+            
+            rejected = server.client._check_call(name, params)
+            if rejected:
+                raise MCPToolError(routed, rejected.error)
+            
+            try:
+                with self._lease(server):
+                    chunks = server.client._stream_tool(name, params, raise_unavailable=True)
+                    try:
+                        async for chunk in chunks:
+                            yield chunk
+                    finally:
+                        await chunks.aclose()
+                return
+            except FAILOVER_ERRORS as e:
+                error = e
+                self.failovers += 1
+                logger.warning(f"Tool '{routed}' failed over from {server.url}: {e}")
+        
+    async def check_health(self) -> Dict[str, bool]:
+        """
+        Check every server by revalidating its catalog.
+        
+        Servers that could not be reached at startup are connected again.
+        
+        Returns:
+            Health by server URL
+        """
+        return await await_in_loop(self._check_health())
+        
+    async def _check_health(self) -> Dict[str, bool]:
+        async def check(server: PooledServer) -> None:
+            try:
+                if server.connected:
+                    await server.client._refresh_tools()
+                else:
+                    await server.client._connect()
+                    server.connected = True
+                server.healthy = True
+            except Exception as e:
+                server.healthy = False
+                server.last_error = str(e) or type(e).__name__
+        
+        await asyncio.gather(*(check(server) for server in self.servers))
+        self._rebuild_routes()
+        return {server.url: server.healthy for server in self.servers}
+        
+    def start_health_checks(self, interval: float) -> None:
+        """
+        Check server health periodically on the shared background loop.
+        
+        Args:
+            interval: Seconds between checks
+        """
+        if self._health_task and not self._health_task.done():
+            return
+        
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+                await self._check_health()
+        
+        self._health_task = get_event_loop_thread().submit(run())
+        
+    def stop_health_checks(self) -> None:
+        """Stop the periodic health checks."""
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+        
+    async def close(self) -> None:
+        """Close the clients of all servers."""
+        await await_in_loop(self._close())
+        
+    async def _close(self) -> None:
+        self.stop_health_checks()
+        await asyncio.gather(*(server.client._close() for server in self.servers))
+        
+    def connect_sync(self) -> Dict[str, Any]:
+        """
+        Connect to all servers from synchronous code.
+        
+        Returns:
+            Server information by URL
+        """
+        return run_coroutine(self._connect())
+        
+    def list_tools_sync(self) -> List[MCPToolDefinition]:
+        """
+        Revalidate the catalogs and list the routed tools from synchronous code.
+        
+        Returns:
+            List of tool definitions
+        """
+        return list(run_coroutine(self._get_tools(force=True)).values())
+        
+    def execute_tool_sync(self, tool_name: str, params: Dict[str, Any]) -> MCPToolResult:
+        """
+        Execute a tool from synchronous code.
+        
+        Args:
+            tool_name: Routed name of the tool, or its name if unambiguous
+            params: Parameters for the tool
+        
+        Returns:
+            Result of the tool execution
+        
+        Raises:
+            ValueError: If the tool is not available
+        """
+        self._resolve(tool_name)
+        return run_coroutine(self._execute_tool(tool_name, params))
+        
+    def execute_tools_sync(self, calls: List[Dict[str, Any]]) -> List[MCPToolResult]:
+        """
+        Execute several tools from synchronous code.
+        
+        Args:
+            calls: The calls, each with name and parameters
+        
+        Returns:
+            Results of the calls, in order
+        """
+        return run_coroutine(self._execute_tools(calls))
+        
+    def stream_tool_sync(self, tool_name: str, params: Dict[str, Any]) -> Iterator[Any]:
+        """
+        Execute a tool from synchronous code, iterating over its result chunks.
+        
+        Args:
+            tool_name: Routed name of the tool, or its name if unambiguous
+            params: Parameters for the tool
+        
+        Returns:
+            Iterator over the result chunks
+        """
+        self._resolve(tool_name)
+        return iterate_async(self._stream_tool(tool_name, params))
+        
+    def close_sync(self) -> None:
+        """Close the clients of all servers from synchronous code."""
+        run_coroutine(self._close())
+        
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the state of every server and the routing counters.
+        
+        Returns:
+            Metrics dictionary
+        """
+        return {
+            "tools": len(self.available_tools),
+            "failovers": self.failovers,
+            "servers": {server.url: server.to_dict() for server in self.servers}
+        }
@@ -5,12 +5,15 @@ This module provides a server for exposing tools via the MCP protocol.
 """
 
 import json
+import gzip
 import asyncio
+import hashlib
 import logging
 from typing import Dict, List, Optional, Any, Callable
 from aiohttp import web
 
-from a2a.core.mcp.mcp_tool_manager import MCPToolManager
+from a2a.core.mcp.mcp_tool_manager import MCPToolManager, ToolBusyError, ToolTimeoutError
+from a2a.core.response_cache import ResponseCache
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +22,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp_server")
 
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, If-None-Match',
+    'Access-Control-Expose-Headers': 'ETag'
+}
+
+# Payloads smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+
+class EncodedPayload:
+    """A JSON payload serialized once, with its ETag and gzip encoding."""
+    
+    def __init__(self, data: Any):
+        """
+        Serialize the payload.
+        
+        Args:
+            data: The JSON-serializable payload
+        """
+        self.body = json.dumps(data).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        # mtime=0 keeps the compressed bytes identical across rebuilds
+        self.gzip_body = gzip.compress(self.body, mtime=0) if len(self.body) >= GZIP_MIN_SIZE else None
+        
+    def not_modified(self, request: web.Request) -> bool:
+        """
+        Check whether the request's If-None-Match matches the payload.
+        
+        Args:
+            request: The HTTP request
+            
+        Returns:
+            True if the client's copy is current
+        """
+        if_none_match = request.headers.get("If-None-Match", "")
+        return if_none_match.strip() == "*" or self.etag in [tag.strip() for tag in if_none_match.split(",")]
+        
+    def response(self, request: web.Request) -> web.Response:
+        """
+        Build the response to a request for the payload.
+        
+        Args:
+            request: The HTTP request
+            
+        Returns:
+            An empty 304 response if the client's copy is current, otherwise
+            the payload, gzipped if the client accepts it
+        """
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        if self.not_modified(request):
+            return web.Response(status=304, headers=headers)
+        if self.gzip_body is not None and _accepts_gzip(request):
+            headers["Content-Encoding"] = "gzip"
+            return web.Response(body=self.gzip_body, content_type="application/json", headers=headers)
+        return web.Response(body=self.body, content_type="application/json", headers=headers)
+
+
+def _accepts_gzip(request: web.Request) -> bool:
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            quality = params.strip().lower()
+            return not quality.startswith("q=") or quality[2:].strip() not in ("0", "0.0", "0.00", "0.000")
+    return False
+
 
 class MCPServer:
     """Server for exposing tools via the MCP protocol."""
@@ -29,7 +99,13 @@ class MCPServer:
         port: int = 3000,
         name: str = "MCP Server",
         description: str = "A server implementing the Model Context Protocol",
-        version: str = "1.0.0"
+        version: str = "1.0.0",
+        max_batch_size: int = 64,
+        batch_concurrency: int = 8,
+        max_thread_workers: int = 8,
+        max_process_workers: Optional[int] = None,
+        result_cache: Optional[ResponseCache] = None,
+        max_total_cost: Optional[int] = None
     ):
         """
         Initialize MCP server.
@@ -40,13 +116,27 @@ class MCPServer:
             name: Name of the server
             description: Description of the server
             version: Version of the server
+            max_batch_size: Maximum number of calls in a batch request
+            batch_concurrency: Maximum calls of one batch running at once
+            max_thread_workers: Maximum threads running "thread" tools
+            max_process_workers: Maximum processes running "process" tools
+            result_cache: Cache for the results of cacheable tools
+            max_total_cost: Capacity shared by all tool executions, each
+                taking its tool's cost (unlimited if None)
         """
         self.host = host
         self.port = port
         self.name = name
         self.description = description
         self.version = version
-        self.tool_manager = MCPToolManager()
+        self.max_batch_size = max_batch_size
+        self.batch_concurrency = batch_concurrency
+        self.tool_manager = MCPToolManager(max_thread_workers, max_process_workers, result_cache, max_total_cost)
+        # Incremented whenever the tool catalog changes
+        self.tools_version = 0
+        # Serialized responses, rebuilt when the catalog changes
+        self._catalog: Optional[EncodedPayload] = None
+        self._discovery: Optional[EncodedPayload] = None
         self.app = None
         self.runner = None
         self.site = None
@@ -57,7 +147,14 @@ class MCPServer:
         name: str,
         description: str,
         function: Callable,
-        parameters: List[Dict[str, Any]]
+        parameters: List[Dict[str, Any]],
+        execution_mode: str = "auto",
+        cacheable: bool = False,
+        cache_ttl: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cost: int = 1
     ) -> Dict[str, Any]:
         """
         Register a tool with the MCP server.
@@ -67,13 +164,32 @@ class MCPServer:
             description: Description of the tool
             function: Function to execute when the tool is called
             parameters: List of parameters for the tool
+            execution_mode: "async" for coroutine functions and cheap code,
+                "thread" for blocking I/O, "process" for CPU-heavy work, or
+                "auto" to await coroutine functions and thread the others
+            cacheable: Serve identical calls from the result cache; only for
+                deterministic tools
+            cache_ttl: Seconds a cached result stays valid
+            max_concurrency: Maximum concurrent executions of the tool
+            max_queued: Maximum calls waiting for an execution slot; further
+                calls get a 429 response
+            timeout: Maximum duration of an execution, in seconds; slower
+                calls get a 504 response
+            cost: Units of max_total_cost taken by an execution
             
         Returns:
             The registered tool definition
         """
         logger.info(f"Registering tool: {name}")
         logger.debug(f"Tool details - Description: {description}, Parameters: {json.dumps(parameters)}")
-        return self.tool_manager.register_tool(name, description, function, parameters)
+        tool_def = self.tool_manager.register_tool(
+            name, description, function, parameters,
+            execution_mode=execution_mode, cacheable=cacheable, cache_ttl=cache_ttl,
+            max_concurrency=max_concurrency, max_queued=max_queued, timeout=timeout, cost=cost
+        )
+        self.tools_version += 1
+        self._catalog = None
+        return tool_def
     
     async def start(self):
         """Start the MCP server."""
@@ -89,15 +205,16 @@ class MCPServer:
         self.app.router.add_get('/.well-known/mcp.json', self._handler_discovery)
         self.app.router.add_get('/tools', self._handler_list_tools)
         self.app.router.add_post('/execute', self._handler_execute_tool)
+        self.app.router.add_post('/execute/batch', self._handler_execute_batch)
+        self.app.router.add_post('/execute/stream', self._handler_execute_stream)
+        self.app.router.add_get('/metrics', self._handler_metrics)
         
         # Add CORS middleware
         logger.debug("Adding CORS middleware")
         @web.middleware
         async def cors_middleware(request, handler):
             resp = await handler(request)
-            resp.headers['Access-Control-Allow-Origin'] = '*'
-            resp.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-            resp.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+            resp.headers.update(CORS_HEADERS)
             return resp
             
         self.app.middlewares.append(cors_middleware)
@@ -134,12 +251,32 @@ class MCPServer:
             self.app = None
             self.site = None
             logger.info("MCP server stopped")
+        self.tool_manager.shutdown()
     
-    async def _handler_discovery(self, request):
-        """Handler for MCP discovery endpoint."""
-        logger.info("Received discovery request")
-        try:
-            discovery_data = {
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get tool execution metrics.
+        
+        Returns:
+            Metrics dictionary
+        """
+        metrics = self.tool_manager.get_metrics()
+        metrics["tools_version"] = self.tools_version
+        return metrics
+    
+    async def _handler_metrics(self, request):
+        """Handler for the metrics endpoint."""
+        return web.json_response(self.get_metrics())
+    
+    def _get_discovery(self) -> EncodedPayload:
+        """
+        Get the serialized discovery document, building it on first use.
+        
+        Returns:
+            The discovery payload
+        """
+        if self._discovery is None:
+            self._discovery = EncodedPayload({
                 "name": self.name,
                 "description": self.description,
                 "version": self.version,
@@ -149,51 +286,55 @@ class MCPServer:
                 },
                 "endpoints": {
                     "tools": "/tools",
-                    "execute": "/execute"
+                    "execute": "/execute",
+                    "batch_execute": "/execute/batch",
+                    "stream_execute": "/execute/stream"
                 }
-            }
-            
-            logger.debug(f"Returning discovery data: {json.dumps(discovery_data)}")
-            return web.json_response(discovery_data)
+            })
+        return self._discovery
+        
+    def _get_catalog(self) -> EncodedPayload:
+        """
+        Get the serialized tool catalog, building it if the catalog changed.
+        
+        Returns:
+            The catalog payload
+        """
+        catalog = self._catalog
+        if catalog is None:
+            tool_list = []
+            for tool in self.tool_manager.list_tools():
+                # Parameters in JSON Schema format
+                tool_data = tool.to_jsonschema()
+                tool_data["return"] = tool.return_schema
+                tool_data["streaming"] = self.tool_manager.tools[tool.name]["streaming"]
+                tool_list.append(tool_data)
+            catalog = EncodedPayload({"version": self.tools_version, "tools": tool_list})
+            logger.debug(f"Built tool catalog of {len(tool_list)} tools ({len(catalog.body)} bytes)")
+            self._catalog = catalog
+        return catalog
+    
+    async def _handler_discovery(self, request):
+        """Handler for MCP discovery endpoint."""
+        logger.info("Received discovery request")
+        try:
+            return self._get_discovery().response(request)
         except Exception as e:
             logger.error(f"Error handling discovery request: {e}")
             return web.json_response({"error": str(e)}, status=500)
     
     async def _handler_list_tools(self, request):
-        """Handler for listing tools endpoint."""
+        """
+        Handler for listing tools endpoint.
+        
+        The catalog is serialized and gzipped once and reused until a tool
+        is registered. The response carries an ETag derived from it, and a
+        request whose If-None-Match matches it gets an empty 304 response, so
+        clients can revalidate their cached catalog cheaply.
+        """
         logger.info("Received request to list tools")
         try:
-            tools = self.tool_manager.list_tools()
-            tool_list = []
-            
-            for tool in tools:
-                tool_data = {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    },
-                    "return": tool.return_schema
-                }
-                
-                # Convert parameters to JSON Schema format
-                for param in tool.parameters:
-                    param_name = param.get("name")
-                    tool_data["parameters"]["properties"][param_name] = {
-                        "type": param.get("type", "string"),
-                        "description": param.get("description", "")
-                    }
-                    
-                    if param.get("required", False):
-                        tool_data["parameters"]["required"].append(param_name)
-                        
-                tool_list.append(tool_data)
-                
-            response_data = {"tools": tool_list}
-            logger.debug(f"Returning {len(tool_list)} tools")
-            return web.json_response(response_data)
+            return self._get_catalog().response(request)
         except Exception as e:
             logger.error(f"Error handling list tools request: {e}")
             return web.json_response({"error": str(e)}, status=500)
@@ -215,7 +356,7 @@ class MCPServer:
             # Execute the tool
             result = await self.tool_manager.execute_tool(tool_name, parameters)
             
-            if "error" in result:
+            if isinstance(result, dict) and "error" in result:
                 logger.error(f"Error executing tool '{tool_name}': {result['error']}")
                 return web.json_response({"error": result["error"]}, status=400)
                 
@@ -226,6 +367,163 @@ class MCPServer:
         except json.JSONDecodeError:
             logger.error("Invalid JSON in request body")
             return web.json_response({"error": "Invalid JSON in request body"}, status=400)
+        except ToolBusyError as e:
+            logger.warning(str(e))
+            return web.json_response({"error": str(e)}, status=429)
+        except ToolTimeoutError as e:
+            logger.error(str(e))
+            return web.json_response({"error": str(e)}, status=504)
         except Exception as e:
             logger.error(f"Unexpected error handling tool execution: {e}")
-            return web.json_response({"error": str(e)}, status=500) 
\ No newline at end of file
+            return web.json_response({"error": str(e)}, status=500)
+    
+    async def _execute_call(self, call: Any, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute one call of a batch, capturing its error.
+        
+        Args:
+            call: The call, with name and parameters
+            timeout: Seconds the call may take (unlimited if None)
+            
+        Returns:
+            The call result entry (name, and result or error)
+        """
+        if not isinstance(call, dict) or not call.get("name"):
+            return {"name": call.get("name") if isinstance(call, dict) else None, "error": "Missing tool name"}
+            
+        tool_name = call["name"]
+        execution = asyncio.ensure_future(self.tool_manager.execute_tool(tool_name, call.get("parameters") or {}))
+        try:
+            await asyncio.wait({execution}, timeout=timeout)
+            if not execution.done():
+                logger.error(f"Tool '{tool_name}' in batch timed out after {timeout}s")
+                return {"name": tool_name, "error": f"Tool call timed out after {timeout}s"}
+            result = execution.result()
+        except Exception as e:
+            logger.error(f"Error executing tool '{tool_name}' in batch: {e}")
+            return {"name": tool_name, "error": str(e)}
+        finally:
+            execution.cancel()
+            
+        if isinstance(result, dict) and "error" in result:
+            logger.error(f"Error executing tool '{tool_name}' in batch: {result['error']}")
+            return {"name": tool_name, "error": result["error"]}
+        return {"name": tool_name, "result": result}
+    
+    async def _handler_execute_batch(self, request):
+        """
+        Handler for executing several tools in one request.
+        
+        The body is an array of {name, parameters} calls. The calls run
+        concurrently, at most batch_concurrency at a time, and the response
+        holds one entry per call, in order, with its result or error. The
+        optional "concurrency" query parameter lowers the number of calls
+        running at once, and "timeout" limits the seconds each call may take.
+        """
+        try:
+            calls = await request.json()
+            
+            if not isinstance(calls, list):
+                logger.warning("Batch request body is not an array")
+                return web.json_response({"error": "Expected an array of tool calls"}, status=400)
+                
+            try:
+                concurrency = int(request.query.get("concurrency", self.batch_concurrency))
+                timeout = float(request.query["timeout"]) if "timeout" in request.query else None
+            except ValueError:
+                concurrency = timeout = 0
+            if concurrency < 1 or (timeout is not None and not timeout > 0):
+                logger.warning("Invalid batch concurrency or timeout")
+                return web.json_response({"error": "Invalid batch concurrency or timeout"}, status=400)
+                
+            logger.info(f"Received batch of {len(calls)} tool calls")
+            
+            if len(calls) > self.max_batch_size:
+                logger.warning(f"Batch of {len(calls)} calls exceeds the limit of {self.max_batch_size}")
+                return web.json_response(
+                    {"error": f"Batch too large: {len(calls)} calls, maximum is {self.max_batch_size}"},
+                    status=413
+                )
+                
+            semaphore = asyncio.Semaphore(min(concurrency, self.batch_concurrency))
+            
+            async def run(call):
+                async with semaphore:
+                    return await self._execute_call(call, timeout)
+                    
+            results = await asyncio.gather(*(run(call) for call in calls))
+            
+            logger.info(f"Executed batch of {len(results)} tool calls")
+            return web.json_response({"results": results})
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON in request body")
+            return web.json_response({"error": "Invalid JSON in request body"}, status=400)
+        except Exception as e:
+            logger.error(f"Unexpected error handling batch execution: {e}")
+            return web.json_response({"error": str(e)}, status=500)
+    
+    async def _handler_execute_stream(self, request):
+        """
+        Handler for executing a tool with a streamed result.
+        
+        Chunks are written as the tool produces them, one JSON object per
+        line (NDJSON), or as server-sent events if the client accepts
+        text/event-stream. Each chunk is {"chunk": ...} and the stream ends
+        with {"done": true, "chunks": n} or {"error": ...}. Writes wait for
+        the client to read, so memory stays bounded for large results.
+        """
+        try:
+            request_data = await request.json()
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON in request body")
+            return web.json_response({"error": "Invalid JSON in request body"}, status=400)
+            
+        if not isinstance(request_data, dict):
+            logger.warning("Stream request body is not an object")
+            return web.json_response({"error": "Expected a tool call object"}, status=400)
+            
+        tool_name = request_data.get("name")
+        parameters = request_data.get("parameters", {})
+        
+        logger.info(f"Received request to stream tool: {tool_name}")
+        
+        if not tool_name:
+            logger.warning("Missing tool name in request")
+            return web.json_response({"error": "Missing tool name"}, status=400)
+        if self.tool_manager.get_tool_definition(tool_name) is None:
+            logger.error(f"Tool not found: {tool_name}")
+            return web.json_response({"error": f"Tool not found: {tool_name}"}, status=400)
+            
+        sse = "text/event-stream" in request.headers.get("Accept", "")
+        
+        def encode(payload: Dict[str, Any]) -> bytes:
+            data = json.dumps(payload, default=str)
+            return (f"data: {data}\n\n" if sse else data + "\n").encode("utf-8")
+            
+        response = web.StreamResponse(headers={
+            "Cache-Control": "no-cache",
+            # Set here because the CORS middleware runs after the headers are sent
+            **CORS_HEADERS
+        })
+        response.content_type = "text/event-stream" if sse else "application/x-ndjson"
+        await response.prepare(request)
+        
+        chunks = self.tool_manager.stream_tool(tool_name, parameters)
+        count = 0
+        try:
+            async for chunk in chunks:
+                await response.write(encode({"chunk": chunk}))
+                count += 1
+            await response.write(encode({"done": True, "chunks": count}))
+            logger.info(f"Tool '{tool_name}' streamed {count} chunks")
+        except ConnectionResetError:
+            logger.warning(f"Client disconnected while streaming tool '{tool_name}'")
+            return response
+        except Exception as e:
+            logger.error(f"Error streaming tool '{tool_name}': {e}")
+            await response.write(encode({"error": str(e)}))
+        finally:
+            await chunks.aclose()
+            
+        await response.write_eof()
+        return response
\ No newline at end of file
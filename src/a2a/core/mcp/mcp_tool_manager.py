@@ -4,16 +4,96 @@ MCP Tool Manager Module
 This module handles registration and management of MCP tools.
 """
 
-from typing import Dict, List, Optional, Any, Callable
+import json
+import time
+import pickle
+import asyncio
+import hashlib
+import inspect
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Any, Callable, AsyncIterator
 from a2a.core.mcp.mcp_schemas import MCPToolDefinition
+from a2a.core.concurrency import FairSemaphore, WeightedSemaphore
+from a2a.core.metrics import LatencyStats, DURATION_BUCKETS
+from a2a.core.response_cache import ResponseCache
+from a2a.core.single_flight import SingleFlight
+
+
+class ToolBusyError(Exception):
+    """Raised when a call is refused because the tool's queue is full."""
+
+
+class ToolTimeoutError(Exception):
+    """Raised when a tool call exceeds the tool's execution timeout."""
+
+
+class ToolResultError(Exception):
+    """Raised when a streamed tool returns an error result, {"error": ...}."""
 
 
 class MCPToolManager:
-    """Manager for registering and executing MCP tools."""
+    """
+    Manager for registering and executing MCP tools.
+    
+    Each tool runs in one of three execution modes, so that no tool stalls
+    the event loop serving requests:
     
-    def __init__(self):
-        """Initialize the Tool Manager."""
+    - "async": the function is called on the event loop and awaited if it
+      returns an awaitable. Meant for coroutine functions and cheap code.
+    - "thread": the function runs in a bounded thread pool. Meant for
+      blocking I/O.
+    - "process": the function runs in a process pool. Meant for CPU-heavy
+      work such as model inference; the function, its parameters and its
+      result must be picklable.
+    
+    Async generator functions are streaming tools: stream_tool yields their
+    chunks as they are produced, while execute_tool collects them in a list.
+    
+    Results of tools registered as cacheable are kept in an LRU cache keyed
+    by the tool and its canonicalized parameters, and identical calls
+    arriving while one is running share its result.
+    
+    Each tool can limit its concurrent executions, the calls queued behind
+    them and the duration of an execution, so a popular expensive tool
+    cannot exhaust the host while cheap tools wait. With max_total_cost,
+    calls also take their tool's cost weight from a capacity shared by all
+    tools.
+    """
+    
+    EXECUTION_MODES = ("async", "thread", "process")
+    
+    def __init__(
+        self,
+        max_thread_workers: int = 8,
+        max_process_workers: Optional[int] = None,
+        result_cache: Optional[ResponseCache] = None,
+        max_total_cost: Optional[int] = None
+    ):
+        """
+        Initialize the Tool Manager.
+        
+        Args:
+            max_thread_workers: Maximum threads running "thread" tools
+            max_process_workers: Maximum processes running "process" tools
+                (the number of CPUs if None)
+            result_cache: Cache for the results of cacheable tools
+            max_total_cost: Capacity shared by all tool executions, each
+                taking its tool's cost (unlimited if None)
+        """
         self.tools: Dict[str, Dict[str, Any]] = {}
+        self.max_thread_workers = max_thread_workers
+        self.max_process_workers = max_process_workers
+        self.result_cache = result_cache or ResponseCache()
+        self.single_flight = SingleFlight()
+        self.cost_limiter = WeightedSemaphore(max_total_cost) if max_total_cost else None
+        # Counts registrations, so re-registering a tool invalidates its cached results
+        self._registrations = 0
+        # Created on first use
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
     
     def register_tool(
         self, 
@@ -21,7 +101,14 @@ class MCPToolManager:
         description: str, 
         function: Callable, 
         parameters: List[Dict[str, Any]],
-        return_schema: Optional[Dict[str, Any]] = None
+        return_schema: Optional[Dict[str, Any]] = None,
+        execution_mode: str = "auto",
+        cacheable: bool = False,
+        cache_ttl: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        timeout: Optional[float] = None,
+        cost: int = 1
     ) -> MCPToolDefinition:
         """
         Register a function as an MCP tool.
@@ -32,10 +119,28 @@ class MCPToolManager:
             function: The function to execute when the tool is called
             parameters: Parameters for the tool
             return_schema: JSON Schema for the return value
+            execution_mode: "async", "thread" or "process"; "auto" awaits
+                coroutine functions and runs other functions in the thread pool
+            cacheable: Whether identical calls may be served from the cache;
+                only for deterministic tools
+            cache_ttl: Seconds a cached result stays valid (the cache's
+                default if None)
+            max_concurrency: Maximum concurrent executions (unlimited if None)
+            max_queued: Maximum calls waiting for an execution slot; further
+                calls are refused (unlimited if None)
+            timeout: Maximum duration of an execution, in seconds. Thread and
+                process executions cannot be interrupted and keep their worker
+                until they finish.
+            cost: Units of the shared capacity taken by an execution
             
         Returns:
             The tool definition
+            
+        Raises:
+            ValueError: If the execution mode does not suit the function
         """
+        execution_mode = self._resolve_execution_mode(function, execution_mode)
+        
         # Create parameter definitions from the parameter specs
         param_defs = []
         for param in parameters:
@@ -58,32 +163,399 @@ class MCPToolManager:
         # Store the tool
         self.tools[name] = {
             "definition": tool_def,
-            "function": function
+            "function": function,
+            "execution_mode": execution_mode,
+            "cacheable": cacheable,
+            "cache_ttl": cache_ttl,
+            "registration": self._registrations,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "streaming": inspect.isasyncgenfunction(function),
+            "max_concurrency": max_concurrency,
+            "max_queued": max_queued,
+            "timeout": timeout,
+            "cost": cost,
+            "semaphore": FairSemaphore(max_concurrency) if max_concurrency else None,
+            "in_flight": 0,
+            "queued": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "errors": 0,
+            "latency": LatencyStats(buckets=DURATION_BUCKETS),
+            "queue_wait": LatencyStats(buckets=DURATION_BUCKETS)
         }
+        self._registrations += 1
         
         return tool_def
         
-    def execute_tool(self, name: str, parameters: Dict[str, Any]) -> Any:
+    @classmethod
+    def _resolve_execution_mode(cls, function: Callable, execution_mode: str) -> str:
+        """
+        Check the execution mode of a tool, choosing one for "auto".
+        
+        Args:
+            function: The tool function
+            execution_mode: The requested execution mode
+        
+        Returns:
+            The execution mode
+        
+        Raises:
+            ValueError: If the execution mode does not suit the function
+        """
+        is_coroutine = inspect.iscoroutinefunction(function) or inspect.isasyncgenfunction(function)
+        if execution_mode == "auto":
+            return "async" if is_coroutine else "thread"
+        if execution_mode not in cls.EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {execution_mode}")
+        if is_coroutine and execution_mode != "async":
+            raise ValueError(f"Async functions must use the async execution mode, not {execution_mode}")
+        if execution_mode == "process":
+            try:
+                pickle.dumps(function)
+            except Exception as e:
+                raise ValueError(f"Process tools must be picklable module-level functions: {e}") from e
+        return execution_mode
+        
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_thread_workers, thread_name_prefix="mcp-tool"
+            )
+        return self._thread_pool
+        
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_process_workers)
+        return self._process_pool
+        
+    async def execute_tool(self, name: str, parameters: Dict[str, Any]) -> Any:
         """
-        Execute a registered tool.
+        Execute a registered tool in its execution mode.
+        
+        Calls to cacheable tools are served from the result cache when
+        possible. Failed calls are never cached. Identical concurrent calls
+        share one execution, which runs until its last caller is cancelled,
+        so a disconnecting caller does not fail the others.
         
         Args:
             name: Name of the tool to execute
             parameters: Parameters for the tool
-            
+        
         Returns:
             The result of the tool execution
+        
+        Raises:
+            ValueError: If the tool is not registered
         """
         if name not in self.tools:
             raise ValueError(f"Tool not found: {name}")
-            
+        
         tool = self.tools[name]
+        if not tool["cacheable"]:
+            return await self._run_tool(tool, parameters)
+            
+        key = self._cache_key(name, tool["registration"], parameters)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            tool["cache_hits"] += 1
+            return cached
+        tool["cache_misses"] += 1
+        
+        async def run():
+            result = await self._run_tool(tool, parameters)
+            if result is not None and not (isinstance(result, dict) and "error" in result):
+                self.result_cache.put(key, result, ttl=tool["cache_ttl"])
+            return result
+            
+        return await self.single_flight.ado(key, run)
+        
+    @staticmethod
+    def _cache_key(name: str, registration: int, parameters: Dict[str, Any]) -> str:
+        """
+        Build the cache key of a call from its canonicalized parameters.
+        
+        Args:
+            name: Name of the tool
+            registration: Registration number of the tool
+            parameters: Parameters for the tool
+            
+        Returns:
+            Hex digest identifying the call
+        """
+        payload = json.dumps(
+            {"tool": name, "registration": registration, "parameters": parameters},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        
+    async def _acquire(self, tool: Dict[str, Any]) -> Callable[[], None]:
+        """
+        Take an execution slot of a tool, and its cost.
+        
+        Args:
+            tool: The registered tool
+            
+        Returns:
+            The function returning the slot and cost, to call once
+            
+        Raises:
+            ToolBusyError: If the tool's queue is full
+        """
+        semaphore = tool["semaphore"]
+        if (
+            semaphore is not None
+            and tool["max_queued"] is not None
+            and tool["in_flight"] >= tool["max_concurrency"]
+            and tool["queued"] >= tool["max_queued"]
+        ):
+            tool["rejected"] += 1
+            raise ToolBusyError(f"Tool '{tool['definition'].name}' is busy, {tool['queued']} calls already queued")
+            
+        started = time.perf_counter()
+        tool["queued"] += 1
+        try:
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                cost = await self.cost_limiter.acquire(tool["cost"]) if self.cost_limiter else 0
+            except BaseException:
+                if semaphore is not None:
+                    semaphore.release()
+                raise
+        finally:
+            tool["queued"] -= 1
+            
+        tool["queue_wait"].record(time.perf_counter() - started)
+        tool["in_flight"] += 1
+        
+        def release() -> None:
+            tool["in_flight"] -= 1
+            if self.cost_limiter:
+                self.cost_limiter.release(cost)
+            if semaphore is not None:
+                semaphore.release()
+                
+        return release
+        
+    @asynccontextmanager
+    async def _admit(self, tool: Dict[str, Any]) -> AsyncIterator[None]:
+        """
+        Hold an execution slot of a tool, and its cost, for the duration of the context.
+        
+        Args:
+            tool: The registered tool
+            
+        Raises:
+            ToolBusyError: If the tool's queue is full
+        """
+        release = await self._acquire(tool)
+        try:
+            yield
+        finally:
+            release()
+            
+    async def _run_tool(self, tool: Dict[str, Any], parameters: Dict[str, Any]) -> Any:
+        """
+        Run a tool within its concurrency limits and timeout.
+        
+        Thread and process executions cannot be interrupted: one that times
+        out keeps its slot and cost until the function returns, so the
+        limits hold for the work actually running.
+        
+        Args:
+            tool: The registered tool
+            parameters: Parameters for the tool
+            
+        Returns:
+            The result of the tool function
+            
+        Raises:
+            ToolBusyError: If the tool's queue is full
+            ToolTimeoutError: If the execution exceeds the tool's timeout
+        """
+        release = await self._acquire(tool)
+        started = time.perf_counter()
+        submitted: Optional[Future] = None
+        execution: Optional[asyncio.Future] = None
+        try:
+            if tool["execution_mode"] == "async":
+                execution = asyncio.ensure_future(self._call_tool(tool, parameters))
+            else:
+                submitted = self._submit(tool, parameters)
+                execution = asyncio.wrap_future(submitted)
+            # Only the deadline times a call out; a TimeoutError raised by
+            # the tool itself is an ordinary tool error
+            await asyncio.wait({execution}, timeout=tool["timeout"] or None)
+            if execution.done():
+                return execution.result()
+            execution.cancel()
+            await asyncio.wait({execution})
+            tool["timeouts"] += 1
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); start a new pool for later calls
+            self._process_pool = None
+            tool["errors"] += 1
+            raise
+        except Exception:
+            tool["errors"] += 1
+            raise
+        finally:
+            if execution is not None and not execution.done():
+                execution.cancel()
+            tool["latency"].record(time.perf_counter() - started)
+            # A call still queued in the executor was cancelled with the wait
+            if submitted is not None and not submitted.done():
+                loop = asyncio.get_running_loop()
+                
+                def release_later(_: Future) -> None:
+                    if not loop.is_closed():
+                        loop.call_soon_threadsafe(release)
+                        
+                submitted.add_done_callback(release_later)
+            else:
+                release()
+                
+        raise ToolTimeoutError(f"Tool '{tool['definition'].name}' timed out after {tool['timeout']}s")
         
-        # Execute the tool function with the provided parameters
-        result = tool["function"](**parameters)
+    async def _call_tool(self, tool: Dict[str, Any], parameters: Dict[str, Any]) -> Any:
+        """
+        Call an "async" tool function on the event loop.
+        
+        Args:
+            tool: The registered tool
+            parameters: Parameters for the tool
+            
+        Returns:
+            The result of the tool function
+        """
+        function = tool["function"]
         
+        if tool["streaming"]:
+            return [chunk async for chunk in function(**parameters)]
+            
+        result = function(**parameters)
+        if inspect.isawaitable(result):
+            result = await result
         return result
         
+    def _submit(self, tool: Dict[str, Any], parameters: Dict[str, Any]) -> Future:
+        """
+        Submit a "thread" or "process" tool call to its executor.
+        
+        Args:
+            tool: The registered tool
+            parameters: Parameters for the tool
+            
+        Returns:
+            The executor future of the call
+        """
+        call = functools.partial(tool["function"], **parameters)
+        if tool["execution_mode"] == "thread":
+            return self._get_thread_pool().submit(call)
+        return self._get_process_pool().submit(call)
+        
+    async def stream_tool(self, name: str, parameters: Dict[str, Any]) -> AsyncIterator[Any]:
+        """
+        Execute a registered tool, yielding its result as it is produced.
+        
+        Streaming tools yield each chunk of their generator, and other tools
+        yield their whole result as a single chunk, or raise ToolResultError
+        if the result is an error. Closing the iterator
+        closes the tool's generator. A stream holds its execution slot until
+        it ends; the tool's timeout does not apply to it.
+        
+        Args:
+            name: Name of the tool to execute
+            parameters: Parameters for the tool
+            
+        Yields:
+            The chunks of the result
+            
+        Raises:
+            ValueError: If the tool is not registered
+            ToolResultError: If a non-streaming tool returns an error result
+        """
+        if name not in self.tools:
+            raise ValueError(f"Tool not found: {name}")
+            
+        tool = self.tools[name]
+        if not tool["streaming"]:
+            result = await self.execute_tool(name, parameters)
+            if isinstance(result, dict) and "error" in result:
+                raise ToolResultError(result["error"])
+            yield result
+            return
+            
+        async with self._admit(tool):
+            started = time.perf_counter()
+            chunks = tool["function"](**parameters)
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            except Exception:
+                tool["errors"] += 1
+                raise
+            finally:
+                await chunks.aclose()
+                tool["latency"].record(time.perf_counter() - started)
+            
+    def shutdown(self) -> None:
+        """Shut down the worker pools; they are created again when needed."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get tool execution and cache counters.
+        
+        Returns:
+            Metrics dictionary
+        """
+        metrics = {
+            "result_cache": self.result_cache.get_metrics(),
+            "coalescing": {
+                "executed": self.single_flight.executed,
+                "coalesced": self.single_flight.coalesced
+            },
+            "tools": {
+                name: {
+                    "execution_mode": tool["execution_mode"],
+                    "cacheable": tool["cacheable"],
+                    "cache_hits": tool["cache_hits"],
+                    "cache_misses": tool["cache_misses"],
+                    "streaming": tool["streaming"],
+                    "cache_hit_rate": (
+                        tool["cache_hits"] / (tool["cache_hits"] + tool["cache_misses"])
+                        if tool["cache_hits"] + tool["cache_misses"] else 0.0
+                    ),
+                    "max_concurrency": tool["max_concurrency"],
+                    "cost": tool["cost"],
+                    "in_flight": tool["in_flight"],
+                    "queued": tool["queued"],
+                    "timeouts": tool["timeouts"],
+                    "rejected": tool["rejected"],
+                    "errors": tool["errors"],
+                    "latency": tool["latency"].to_dict(),
+                    "queue_wait": tool["queue_wait"].to_dict()
+                }
+                for name, tool in self.tools.items()
+            }
+        }
+        if self.cost_limiter:
+            metrics["cost"] = {
+                "capacity": self.cost_limiter.capacity,
+                "in_use": self.cost_limiter.in_use,
+                "waiting": self.cost_limiter.waiting
+            }
+        return metrics
+        
     def get_tool_definition(self, name: str) -> Optional[MCPToolDefinition]:
         """
         Get the definition of a registered tool.
@@ -0,0 +1,193 @@
+"""
+MCP Validation Module
+
+This module compiles the JSON Schema of tool parameters into validators, so
+tool calls can be checked locally before they are sent to an MCP server.
+"""
+
+import re
+from typing import Dict, List, Optional, Any, Callable
+
+# A compiled check takes a value and its path and returns an error message,
+# or None if the value is valid
+Check = Callable[[Any, str], Optional[str]]
+
+# Validates a value, returning an error message or None
+Validator = Callable[[Any], Optional[str]]
+
+JSON_TYPES = {
+    "string": lambda value: isinstance(value, str),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "integer": lambda value: (
+        (isinstance(value, int) and not isinstance(value, bool))
+        or (isinstance(value, float) and value.is_integer())
+    ),
+    "boolean": lambda value: isinstance(value, bool),
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "null": lambda value: value is None
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _type_name(value: Any) -> str:
+    for name, matches in JSON_TYPES.items():
+        if name != "integer" and matches(value):
+            return name
+    return type(value).__name__
+
+
+def _compile(schema: Dict[str, Any]) -> Check:
+    """
+    Compile a schema into a check.
+
+    Supported keywords are type, enum, const, the numeric and length
+    bounds, pattern, items, properties, required and additionalProperties.
+    Other keywords and unknown type names are ignored, so a schema that
+    cannot be checked locally never rejects a call the server would accept.
+
+    Args:
+        schema: The JSON Schema
+
+    Returns:
+        The compiled check
+    """
+    checks: List[Check] = []
+
+    types = schema.get("type")
+    if isinstance(types, str):
+        types = [types]
+    if types and all(name in JSON_TYPES for name in types):
+        matchers = [JSON_TYPES[name] for name in types]
+        expected = " or ".join(types)
+
+        def check_type(value, path):
+            if not any(matches(value) for matches in matchers):
+                return f"{path}: expected {expected}, got {_type_name(value)}"
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(value, path):
+            if value not in allowed:
+                return f"{path}: {value!r} is not one of {allowed!r}"
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(value, path):
+            if value != const:
+                return f"{path}: expected {const!r}"
+        checks.append(check_const)
+
+    bounds = [
+        ("minimum", lambda value, bound: value < bound, "less than"),
+        ("maximum", lambda value, bound: value > bound, "greater than"),
+        ("exclusiveMinimum", lambda value, bound: value <= bound, "less than or equal to"),
+        ("exclusiveMaximum", lambda value, bound: value >= bound, "greater than or equal to")
+    ]
+    for keyword, violates, relation in bounds:
+        if _is_number(schema.get(keyword)):
+            def check_bound(value, path, bound=schema[keyword], violates=violates, relation=relation):
+                if _is_number(value) and violates(value, bound):
+                    return f"{path}: {value} is {relation} {bound}"
+            checks.append(check_bound)
+
+    lengths = [
+        ("minLength", str, lambda length, bound: length < bound, "is shorter than"),
+        ("maxLength", str, lambda length, bound: length > bound, "is longer than"),
+        ("minItems", list, lambda length, bound: length < bound, "has fewer items than"),
+        ("maxItems", list, lambda length, bound: length > bound, "has more items than")
+    ]
+    for keyword, kind, violates, relation in lengths:
+        if isinstance(schema.get(keyword), int):
+            def check_length(value, path, bound=schema[keyword], kind=kind, violates=violates, relation=relation):
+                if isinstance(value, kind) and violates(len(value), bound):
+                    return f"{path}: {relation} {bound}"
+            checks.append(check_length)
+
+    if isinstance(schema.get("pattern"), str):
+        try:
+            pattern = re.compile(schema["pattern"])
+        except re.error:
+            pattern = None
+        if pattern is not None:
+            def check_pattern(value, path):
+                if isinstance(value, str) and not pattern.search(value):
+                    return f"{path}: {value!r} does not match {pattern.pattern!r}"
+            checks.append(check_pattern)
+
+    if isinstance(schema.get("items"), dict):
+        check_item = _compile(schema["items"])
+
+        def check_items(value, path):
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    error = check_item(item, f"{path}[{i}]")
+                    if error:
+                        return error
+        checks.append(check_items)
+
+    required = schema.get("required")
+    if isinstance(required, list) and required:
+        def check_required(value, path):
+            if isinstance(value, dict):
+                for name in required:
+                    if name not in value:
+                        return f"{path}: missing required property '{name}'"
+        checks.append(check_required)
+
+    properties = {
+        name: _compile(subschema)
+        for name, subschema in (schema.get("properties") or {}).items()
+        if isinstance(subschema, dict)
+    }
+    additional = schema.get("additionalProperties", True)
+    check_additional = _compile(additional) if isinstance(additional, dict) else None
+    if properties or additional is False or check_additional:
+        def check_properties(value, path):
+            if not isinstance(value, dict):
+                return None
+            for name, item in value.items():
+                check_property = properties.get(name)
+                if check_property is None:
+                    if additional is False:
+                        return f"{path}: unexpected property '{name}'"
+                    check_property = check_additional
+                if check_property is not None:
+                    error = check_property(item, f"{path}.{name}")
+                    if error:
+                        return error
+        checks.append(check_properties)
+
+    if not checks:
+        return lambda value, path: None
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value, path):
+        for check in checks:
+            error = check(value, path)
+            if error:
+                return error
+    return check_all
+
+
+def compile_validator(schema: Optional[Dict[str, Any]], root: str = "parameters") -> Validator:
+    """
+    Compile a JSON Schema into a validator.
+
+    Args:
+        schema: The JSON Schema (anything is valid if None)
+        root: Name of the validated value in error messages
+
+    Returns:
+        A function returning the first error found in a value, or None
+    """
+    check = _compile(schema or {})
+    return lambda value: check(value, root)
@@ -0,0 +1,154 @@
+"""
+Metrics Module
+
+This module provides lightweight latency statistics for agent metrics.
+"""
+
+import bisect
+import threading
+from collections import deque
+from typing import Dict, Any, Deque, Optional, Sequence
+
+
+# Histogram bucket bounds for durations, in seconds
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Histogram bucket bounds for generation speeds, in tokens per second
+THROUGHPUT_BUCKETS = (5.0, 10.0, 20.0, 40.0, 80.0, 160.0, 320.0, 640.0, 1280.0)
+
+
+class LatencyStats:
+    """
+    Running latency statistics.
+
+    Count, mean, min and max cover every recorded value. Percentiles are
+    computed over a sliding window of the most recent values so memory
+    stays bounded. With bucket bounds, every value is also counted in a
+    histogram.
+    """
+
+    def __init__(self, window: int = 1024, buckets: Optional[Sequence[float]] = None):
+        """
+        Initialize the statistics.
+
+        Args:
+            window: Number of recent values used for percentiles
+            buckets: Sorted upper bounds of the histogram buckets (no histogram if None)
+        """
+        self.buckets = tuple(buckets) if buckets else ()
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self._values: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: The latency, in seconds
+        """
+        with self._lock:
+            self._values.append(value)
+            self.min = value if self.count == 0 else min(self.min, value)
+            self.max = max(self.max, value)
+            self.count += 1
+            self.total += value
+            if self.buckets:
+                self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Get a percentile of the recent values.
+
+        Args:
+            q: The percentile, between 0 and 100
+
+        Returns:
+            The percentile value, or 0.0 if nothing was recorded
+        """
+        with self._lock:
+            values = sorted(self._values)
+        if not values:
+            return 0.0
+        index = min(len(values) - 1, int(round(q / 100.0 * (len(values) - 1))))
+        return values[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the statistics to a dictionary.
+
+        Returns:
+            The statistics as a dictionary
+        """
+        stats = {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+        if self.buckets:
+            labels = [f"<={bound:g}" for bound in self.buckets] + [f">{self.buckets[-1]:g}"]
+            with self._lock:
+                stats["histogram"] = dict(zip(labels, self.bucket_counts))
+
+        return stats
+
+
+class GenerationMetrics:
+    """
+    Per-model timing of LLM generations.
+
+    Each generation contributes its queue wait, time to first token, total
+    time and prompt/eval throughput to the histograms of its model.
+    """
+
+    DURATIONS = ("queue_wait", "ttft", "total_time")
+    THROUGHPUTS = ("prompt_tokens_per_second", "tokens_per_second")
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, LatencyStats]] = {}
+
+    def _stats(self, model: str) -> Dict[str, LatencyStats]:
+        with self._lock:
+            stats = self._models.get(model)
+            if stats is None:
+                stats = {name: LatencyStats(buckets=DURATION_BUCKETS) for name in self.DURATIONS}
+                stats.update({name: LatencyStats(buckets=THROUGHPUT_BUCKETS) for name in self.THROUGHPUTS})
+                self._models[model] = stats
+            return stats
+
+    def record(self, timing: Dict[str, Any]) -> None:
+        """
+        Record the timing of a generation.
+
+        Args:
+            timing: Generation timing with a model name; missing values are skipped
+        """
+        stats = self._stats(timing["model"])
+        for name, values in stats.items():
+            if timing.get(name) is not None:
+                values.record(timing[name])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the metrics to a dictionary.
+
+        Returns:
+            Statistics by model and measure
+        """
+        with self._lock:
+            models = dict(self._models)
+        return {
+            model: {name: values.to_dict() for name, values in stats.items()}
+            for model, stats in models.items()
+        }
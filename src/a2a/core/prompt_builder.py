@@ -0,0 +1,172 @@
+"""
+Prompt Builder Module
+
+This module renders the system prompt and the MCP tool definitions sent to
+the model, caching them per tool-set version.
+"""
+
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+
+from a2a.core.mcp.mcp_schemas import MCPToolDefinition
+
+
+class PromptBuilder:
+    """
+    Cached rendering of the system prompt and tool definitions.
+
+    The tool description text and the native tool definitions are rendered
+    once per version of the tool set and reused until the tools change.
+    Request messages are built as a new list, so the conversation history is
+    never modified and a retried request is identical to the first attempt.
+    """
+
+    def __init__(self, agent_name: str, agent_description: str):
+        """
+        Initialize the builder.
+
+        Args:
+            agent_name: Name of the agent, used in a generated system message
+            agent_description: Description of the agent
+        """
+        self.agent_name = agent_name
+        self.agent_description = agent_description
+        self.version = 0
+        self.renders = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._tools: Tuple[MCPToolDefinition, ...] = ()
+        self._tools_description = ""
+        self._ollama_tools: List[Dict[str, Any]] = []
+
+    def _refresh(self, tools: Dict[str, MCPToolDefinition]) -> None:
+        """
+        Render the tool set again if it changed since the last render.
+
+        The tool set is identified by its definition objects; MCPClient
+        creates new ones when it discovers the tools again. The cache keeps
+        references to them, so their identities cannot be reused.
+
+        Args:
+            tools: The available tools by name
+        """
+        current = tuple(tools.values())
+        if len(current) == len(self._tools) and all(a is b for a, b in zip(current, self._tools)):
+            self.hits += 1
+            return
+
+        self._tools = current
+        self._tools_description = self._render_tools_description(tools)
+        self._ollama_tools = [
+            {"type": "function", "function": tool.to_jsonschema()}
+            for tool in tools.values()
+        ]
+        self.version += 1
+        self.renders += 1
+
+    @staticmethod
+    def _render_tools_description(tools: Dict[str, MCPToolDefinition]) -> str:
+        """
+        Describe the tools in text for models without native tool calling.
+
+        Args:
+            tools: The available tools by name
+
+        Returns:
+            Description of the tools, empty if there are none
+        """
+        if not tools:
+            return ""
+
+        tools_description = "You have access to the following tools:\n\n"
+
+        for name, tool in tools.items():
+            tools_description += f"- {name}: {tool.description}\n"
+
+            if tool.parameters:
+                tools_description += "  Parameters:\n"
+                for param in tool.parameters:
+                    required = " (required)" if param.required else ""
+                    tools_description += f"  - {param.name}{required}: {param.description}\n"
+
+            tools_description += "\n"
+
+        tools_description += "\nTo use a tool, respond with JSON in this format: {\"name\": \"tool_name\", \"parameters\": {\"param1\": \"value1\"}}\n"
+
+        return tools_description
+
+    def tools_description(self, tools: Dict[str, MCPToolDefinition]) -> str:
+        """
+        Get the text description of the tools.
+
+        Args:
+            tools: The available tools by name
+
+        Returns:
+            Description of the tools
+        """
+        with self._lock:
+            self._refresh(tools)
+            return self._tools_description
+
+    def ollama_tools(self, tools: Dict[str, MCPToolDefinition]) -> List[Dict[str, Any]]:
+        """
+        Get the tools in Ollama's function-calling format.
+
+        Args:
+            tools: The available tools by name
+
+        Returns:
+            Tool definitions for Ollama's tools parameter
+        """
+        with self._lock:
+            self._refresh(tools)
+            return self._ollama_tools
+
+    def build_messages(
+        self,
+        history: List[Dict[str, Any]],
+        tools: Optional[Dict[str, MCPToolDefinition]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the messages of a request without modifying the history.
+
+        When tools are given, their text description is added to the first
+        system message, or to a new system message if there is none.
+
+        Args:
+            history: Conversation messages in Ollama format
+            tools: Tools to describe in the system prompt (none in native mode)
+
+        Returns:
+            New list of messages for the request
+        """
+        messages = list(history)
+        if not tools:
+            return messages
+
+        description = self.tools_description(tools)
+
+        for i, message in enumerate(messages):
+            if message.get("role") == "system":
+                messages[i] = dict(message, content=message.get("content", "") + description)
+                return messages
+
+        messages.insert(0, {
+            "role": "system",
+            "content": f"You are {self.agent_name}, {self.agent_description}. {description}"
+        })
+        return messages
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get rendering counters.
+
+        Returns:
+            Metrics dictionary
+        """
+        return {
+            "tools_version": self.version,
+            "renders": self.renders,
+            "hits": self.hits
+        }
@@ -0,0 +1,345 @@
+"""
+Resilience Module
+
+This module provides the retry policy and the per-host circuit breakers used
+for LLM calls.
+"""
+
+import time
+import random
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Any, Callable, Iterator
+
+import httpx
+import ollama
+
+
+# Ollama status codes that indicate a transient condition on the host
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the host's circuit is open."""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Check whether an error is transient and the call may be retried.
+
+    Connection failures, timeouts and overload or server errors reported
+    by Ollama are retryable. Client errors such as an unknown model are not,
+    and neither is a call refused by an open circuit.
+
+    Args:
+        error: The error raised by the call
+
+    Returns:
+        True if the call may be retried
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, ollama.ResponseError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError, httpx.TransportError))
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter for retryable errors.
+
+    The delay before retry n is drawn uniformly between zero and
+    base_delay * multiplier ** (n - 1), capped at max_delay ("full
+    jitter"), which spreads the retries of concurrent callers.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        retryable: Callable[[BaseException], bool] = is_retryable_error
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Maximum number of attempts, including the first one
+            base_delay: Delay before the first retry, in seconds
+            max_delay: Maximum delay between attempts, in seconds
+            multiplier: Growth factor of the delay after each retry
+            jitter: Randomize delays between zero and the backoff value
+            retryable: Decides whether an error may be retried
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retryable = retryable
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+        self.non_retryable = 0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far
+
+        Returns:
+            Delay in seconds
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def should_retry(self, error: BaseException, attempt: int, failover: bool = False) -> bool:
+        """
+        Decide whether to retry after a failed attempt.
+
+        Args:
+            error: The error raised by the attempt
+            attempt: Number of attempts made so far
+            failover: Whether another host can take the retry. An open
+                circuit only concerns its own host, so it is retried then.
+
+        Returns:
+            True if another attempt should be made
+        """
+        with self._lock:
+            if not (self.retryable(error) or (failover and isinstance(error, CircuitOpenError))):
+                self.non_retryable += 1
+                return False
+            if attempt >= self.max_attempts:
+                self.exhausted += 1
+                return False
+            self.retries += 1
+            return True
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get retry counters.
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            return {
+                "max_attempts": self.max_attempts,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "non_retryable": self.non_retryable
+            }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one host.
+
+    The circuit opens after failure_threshold consecutive failures and
+    refuses calls for recovery_timeout seconds. It then lets a limited
+    number of probe calls through (half-open): a successful probe closes
+    the circuit, a failed one opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        is_failure: Callable[[BaseException], bool] = is_retryable_error
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            host: The host this breaker protects
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Probe calls allowed while half-open
+            is_failure: Decides whether an error counts against the host
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout passed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def acquire(self) -> None:
+        """
+        Ask permission for a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or has no probe left
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+
+            self.rejected += 1
+            retry_after = max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(self.host, retry_after)
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if needed."""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Return the permission of a call that ended without a verdict."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Wrap a call to the host.
+
+        Failures counted by is_failure trip the breaker. Any other error
+        means the host answered, so it counts as a success; cancellation
+        leaves the state unchanged.
+
+        Raises:
+            CircuitOpenError: If the call is not allowed
+        """
+        self.acquire()
+        try:
+            yield
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the breaker state to a dictionary.
+
+        Returns:
+            The breaker state and counters
+        """
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self.consecutive_failures,
+                "failures": self.failures,
+                "successes": self.successes,
+                "rejected": self.rejected,
+                "opened": self.opened
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers by host.
+
+    Agents sharing Ollama hosts can share a registry, so that they all stop
+    calling a host that is down.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Initialize the registry.
+
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds a circuit stays open before probing
+            half_open_max_calls: Probe calls allowed while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        """
+        Get the breaker of a host, creating it on first use.
+
+        Args:
+            host: The host URL
+
+        Returns:
+            The host's circuit breaker
+        """
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    host,
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                    half_open_max_calls=self.half_open_max_calls
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the state of every breaker.
+
+        Returns:
+            Breaker state by host
+        """
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {host: breaker.to_dict() for host, breaker in breakers}
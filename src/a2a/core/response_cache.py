@@ -0,0 +1,158 @@
+"""
+Response Cache Module
+
+This module provides an exact-match cache for LLM responses.
+"""
+
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache for LLM responses.
+
+    Entries are keyed by a hash of the model, the rendered messages and the
+    generation options, so only byte-identical requests share an answer.
+    The cache is bounded both by entry count and by an approximate memory
+    budget, and it is safe to use from several threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        max_bytes: int = 16 * 1024 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Time to live of an entry in seconds (None to never expire)
+            max_bytes: Approximate memory budget for cached responses
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: The model name
+            messages: Messages in Ollama format
+            options: Generation options that affect the output
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            {"model": model, "messages": messages, "options": options or {}},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached response or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, size, value = entry
+            if expires_at and expires_at < time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: The cache key
+            value: The response, which must be JSON serializable
+            ttl: Time to live of this entry in seconds (the cache's if None)
+        """
+        size = len(key) + len(json.dumps(value, default=str).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
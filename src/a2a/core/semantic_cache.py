@@ -0,0 +1,186 @@
+"""
+Semantic Cache Module
+
+This module provides an embedding-based cache that answers near-duplicate
+prompts with a previously generated response.
+"""
+
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Any, Sequence
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over prompt embeddings.
+
+    Embeddings are L2-normalized and kept in a preallocated NumPy matrix, so a
+    lookup is a single matrix-vector product. Entries are partitioned by a
+    context key (model and the conversation preceding the prompt), and only
+    entries with the same context can match. When the cache is full the least
+    recently used entry is replaced.
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = "nomic-embed-text",
+        threshold: float = 0.92,
+        max_entries: int = 512,
+        ttl: Optional[float] = 3600.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            embedding_model: Ollama model used to embed prompts
+            threshold: Minimum cosine similarity for a hit
+            max_entries: Maximum number of cached responses
+            ttl: Time to live of an entry in seconds (None to never expire)
+        """
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._vectors: Optional[np.ndarray] = None
+        self._contexts = np.zeros(max_entries, dtype=np.int64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._expires_at = np.zeros(max_entries, dtype=np.float64)
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.latency_saved = 0.0
+        self._generation_time: Dict[int, float] = {}
+
+    @staticmethod
+    def make_context_key(model: str, messages: List[Dict[str, Any]]) -> int:
+        """
+        Build the context key for a prompt.
+
+        Args:
+            model: The model name
+            messages: Messages preceding the prompt, in Ollama format
+
+        Returns:
+            Integer key identifying the context
+        """
+        payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, default=str)
+        return int(hashlib.sha256(payload.encode("utf-8")).hexdigest()[:15], 16)
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, context_key: int, embedding: Sequence[float]) -> Optional[str]:
+        """
+        Find a cached response for a similar prompt.
+
+        Args:
+            context_key: Key returned by make_context_key
+            embedding: Embedding of the prompt
+
+        Returns:
+            The cached response or None on a miss
+        """
+        query = self._normalize(embedding)
+
+        with self._lock:
+            if self._size == 0 or self._vectors.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            now = time.monotonic()
+            valid = self._contexts[:self._size] == context_key
+            if self.ttl:
+                valid &= self._expires_at[:self._size] > now
+
+            if not valid.any():
+                self.misses += 1
+                return None
+
+            similarities = self._vectors[:self._size] @ query
+            similarities[~valid] = -1.0
+            index = int(np.argmax(similarities))
+
+            if similarities[index] < self.threshold:
+                self.misses += 1
+                return None
+
+            self._last_used[index] = now
+            self.hits += 1
+            self.latency_saved += self._generation_time.get(index, 0.0)
+            return self._responses[index]
+
+    def store(
+        self,
+        context_key: int,
+        embedding: Sequence[float],
+        response: str,
+        generation_time: float = 0.0
+    ) -> None:
+        """
+        Store a response for a prompt.
+
+        Args:
+            context_key: Key returned by make_context_key
+            embedding: Embedding of the prompt
+            response: The generated response
+            generation_time: Time it took to generate the response, in seconds
+        """
+        vector = self._normalize(embedding)
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First entry, or the embedding model changed dimension
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._size = 0
+                self._generation_time.clear()
+
+            if self._size < self.max_entries:
+                index = self._size
+                self._size += 1
+            else:
+                index = int(np.argmin(self._last_used))
+                self.evictions += 1
+
+            now = time.monotonic()
+            self._vectors[index] = vector
+            self._contexts[index] = context_key
+            self._last_used[index] = now
+            self._expires_at[index] = now + self.ttl if self.ttl else 0.0
+            self._responses[index] = response
+            self._generation_time[index] = generation_time
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._size = 0
+            self._responses = [None] * self.max_entries
+            self._generation_time.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._size,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "latency_saved": self.latency_saved
+            }
@@ -0,0 +1,303 @@
+"""
+Single Flight Module
+
+This module coalesces identical concurrent calls so that only one of them
+reaches the backend and every caller shares its result.
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+from typing import Dict, List, Optional, Any, Callable, AsyncIterator, Awaitable, Set, Tuple
+
+
+_END = object()
+
+
+class StreamBroadcast:
+    """
+    Fan-out of one stream to any number of subscribers.
+
+    Chunks published before a subscriber joins are replayed to it, so every
+    subscriber sees the complete stream. Subscribers may live on different
+    threads or event loops.
+    """
+
+    def __init__(self):
+        """Initialize the broadcast."""
+        self._lock = threading.Lock()
+        self._chunks: List[Any] = []
+        self._finished = False
+        self._error: Optional[BaseException] = None
+        self._subscribers: Dict[int, Callable[[Any], None]] = {}
+        self._next_id = 0
+        # Stops the producer, set by whoever drives the stream
+        self.cancel: Optional[Callable[[], None]] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of subscribers still consuming the stream."""
+        return len(self._subscribers)
+
+    def subscribe(self, callback: Callable[[Any], None]) -> int:
+        """
+        Register a subscriber and replay the chunks published so far.
+
+        Args:
+            callback: Called with each chunk, then with the end marker or an exception
+
+        Returns:
+            Subscription ID for unsubscribe
+        """
+        with self._lock:
+            for chunk in self._chunks:
+                callback(chunk)
+            if self._finished:
+                callback(self._error or _END)
+
+            subscription_id = self._next_id
+            self._next_id += 1
+            if not self._finished:
+                self._subscribers[subscription_id] = callback
+            return subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> None:
+        """
+        Remove a subscriber.
+
+        Args:
+            subscription_id: ID returned by subscribe
+        """
+        with self._lock:
+            self._subscribers.pop(subscription_id, None)
+
+    def publish(self, chunk: Any) -> None:
+        """
+        Send a chunk to every subscriber.
+
+        Args:
+            chunk: The stream chunk
+        """
+        with self._lock:
+            self._chunks.append(chunk)
+            for callback in self._subscribers.values():
+                callback(chunk)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """
+        End the stream.
+
+        Args:
+            error: Exception that ended the stream, if any
+        """
+        with self._lock:
+            self._finished = True
+            self._error = error
+            for callback in self._subscribers.values():
+                callback(error or _END)
+            self._subscribers.clear()
+
+
+class _Call:
+    """A call in flight and the callers waiting for it."""
+
+    def __init__(self):
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.waiters = 1
+        # Cancels the shared work, set when it runs as a task
+        self.cancel: Optional[Callable[[], None]] = None
+
+
+class SingleFlight:
+    """
+    Coalescing of identical concurrent calls.
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight attach to it and receive the same result, exception or stream.
+    Once the call finishes the key is released, so later calls run again.
+    Results are shared through thread-safe futures, so callers on different
+    threads or event loops coalesce with each other.
+
+    A call or stream runs in its own task, so cancelling one caller never
+    cancels the others; the task is cancelled as soon as every caller left.
+    """
+
+    def __init__(self):
+        """Initialize the coalescer."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._streams: Dict[str, StreamBroadcast] = {}
+        # Keeps stream producer tasks alive, as the loop only holds weak references
+        self._producers: Set[asyncio.Task] = set()
+        self.executed = 0
+        self.coalesced = 0
+
+    def _join(self, key: str) -> Tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                return call, False
+
+            call = _Call()
+            self._calls[key] = call
+            self.executed += 1
+            return call, True
+
+    def _settle(self, key: str, call: _Call, result: Any = None,
+                error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        if call.future.done():
+            return
+        if error is not None:
+            call.future.set_exception(error)
+        else:
+            call.future.set_result(result)
+
+    def _leave(self, key: str, call: _Call) -> None:
+        """Drop a cancelled caller, cancelling the shared work if it was the last one."""
+        with self._lock:
+            call.waiters -= 1
+            if call.waiters > 0 or call.future.done():
+                return
+            # Later callers start afresh rather than joining a cancelled call
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        if call.cancel is not None:
+            call.cancel()
+
+    async def ado(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run an async call, or wait for the identical call already in flight.
+
+        The call runs as a task on the first caller's loop. Every caller,
+        including the first, waits for it through a shield, so a caller's
+        cancellation only affects that caller.
+
+        Args:
+            key: Identity of the call
+            function: Returns the awaitable to run
+
+        Returns:
+            The result of the call
+        """
+        call, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(function())
+            loop = task.get_loop()
+            call.cancel = lambda: loop.call_soon_threadsafe(task.cancel)
+
+            def done(task: asyncio.Future) -> None:
+                error = asyncio.CancelledError() if task.cancelled() else task.exception()
+                self._settle(key, call, result=None if error else task.result(), error=error)
+
+            task.add_done_callback(done)
+
+        try:
+            return await asyncio.shield(asyncio.wrap_future(call.future))
+        except asyncio.CancelledError:
+            self._leave(key, call)
+            raise
+
+    def _join_stream(self, key: str, callback: Callable[[Any], None]) -> Tuple[StreamBroadcast, int, bool]:
+        with self._lock:
+            broadcast = self._streams.get(key)
+            leader = broadcast is None
+            if leader:
+                broadcast = StreamBroadcast()
+                self._streams[key] = broadcast
+                self.executed += 1
+            else:
+                self.coalesced += 1
+            # Subscribe before the producer starts so it never sees zero subscribers
+            return broadcast, broadcast.subscribe(callback), leader
+
+    def _release_stream(self, key: str, broadcast: StreamBroadcast) -> None:
+        with self._lock:
+            if self._streams.get(key) is broadcast:
+                del self._streams[key]
+
+    def _leave_stream(self, key: str, broadcast: StreamBroadcast, subscription_id: int) -> None:
+        """Drop a subscriber, stopping the producer if it was the last one."""
+        with self._lock:
+            broadcast.unsubscribe(subscription_id)
+            if broadcast.subscriber_count > 0 or self._streams.get(key) is not broadcast:
+                return
+            # Later callers start afresh rather than joining a stopped stream
+            del self._streams[key]
+        if broadcast.cancel is not None:
+            broadcast.cancel()
+
+    async def astream(self, key: str, function: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Consume an async stream, sharing it with identical streams in flight.
+
+        The first caller starts a producer task on the running loop; all
+        callers, including the first, read from the broadcast. The producer
+        is cancelled as soon as every subscriber has gone away, even while
+        it still waits for its first chunk.
+
+        Args:
+            key: Identity of the call
+            function: Returns the async iterator to drive
+
+        Yields:
+            The stream chunks
+        """
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        broadcast, subscription_id, leader = self._join_stream(
+            key, lambda chunk: loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+        )
+
+        if leader:
+            async def produce():
+                error = None
+                iterator = None
+                try:
+                    iterator = function()
+                    async for chunk in iterator:
+                        broadcast.publish(chunk)
+                        if broadcast.subscriber_count == 0:
+                            break
+                except BaseException as e:
+                    error = e
+                finally:
+                    aclose = getattr(iterator, "aclose", None) if iterator else None
+                    if aclose:
+                        await aclose()
+                    self._release_stream(key, broadcast)
+                    broadcast.finish(error)
+
+            task = loop.create_task(produce())
+            self._producers.add(task)
+            task.add_done_callback(self._producers.discard)
+            broadcast.cancel = lambda: loop.call_soon_threadsafe(task.cancel)
+
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is _END:
+                    return
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+        finally:
+            self._leave_stream(key, broadcast, subscription_id)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._streams)
+            }
@@ -8,6 +8,8 @@ import uuid
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from a2a.core.event_loop import await_in_loop, run_coroutine
+
 
 class TaskManager:
     """
@@ -88,6 +90,50 @@ class TaskManager:
         
         return True
     
+    def record_usage(self, task_id: str, prompt_tokens: int, eval_tokens: int) -> bool:
+        """
+        Add the token counts of a model call to a task.
+        
+        Args:
+            task_id: The ID of the task
+            prompt_tokens: Prompt tokens evaluated by the model
+            eval_tokens: Tokens generated by the model
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if task_id not in self.tasks:
+            return False
+        
+        usage = self.tasks[task_id].setdefault("usage", {
+            "prompt_tokens": 0,
+            "eval_tokens": 0,
+            "model_calls": 0
+        })
+        usage["prompt_tokens"] += prompt_tokens
+        usage["eval_tokens"] += eval_tokens
+        usage["model_calls"] += 1
+        
+        return True
+    
+    def record_generation(self, task_id: str, timing: Dict[str, Any]) -> bool:
+        """
+        Add the timing of a model call to a task.
+        
+        Args:
+            task_id: The ID of the task
+            timing: Queue wait, time to first token, durations and token counts of the call
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if task_id not in self.tasks:
+            return False
+        
+        self.tasks[task_id].setdefault("generations", []).append(timing)
+        
+        return True
+    
     def list_tasks(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List tasks, optionally filtered by status.
@@ -107,6 +153,9 @@ class TaskManager:
         """
         Process a task, using MCP if appropriate.
         
+        MCP calls run on the shared background event loop so that MCP
+        sessions and connection pools are reused across calls.
+        
         Args:
             task_id: The ID of the task
             
@@ -121,7 +170,7 @@ class TaskManager:
         # If MCP is enabled and this task might be an MCP task
         if self.mcp_bridge and self._can_use_mcp_for_task(task):
             try:
-                return await self.mcp_bridge.process_a2a_task_with_mcp(task)
+                return await await_in_loop(self.mcp_bridge.process_a2a_task_with_mcp(task))
             except Exception as e:
                 # If MCP processing fails, log the error
                 print(f"Error processing task with MCP: {e}")
@@ -131,6 +180,18 @@ class TaskManager:
         # or MCP processing failed
         return {"status": "submitted", "message": "Task ready for normal processing"}
     
+    def process_task_sync(self, task_id: str) -> Dict[str, Any]:
+        """
+        Process a task from synchronous code, using MCP if appropriate.
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            Result of processing the task
+        """
+        return run_coroutine(self.process_task(task_id))
+    
     def _can_use_mcp_for_task(self, task: Dict[str, Any]) -> bool:
         """
         Check if a task can be handled by MCP.
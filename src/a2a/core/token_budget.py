@@ -0,0 +1,315 @@
+"""
+Token Budget Module
+
+This module counts prompt tokens locally and keeps requests within the
+context budget of each model.
+"""
+
+import json
+import math
+import threading
+from typing import Dict, List, Optional, Any
+
+
+class Tokenizer:
+    """Interface of the tokenizers used for token accounting."""
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        Args:
+            text: The text
+
+        Returns:
+            Number of tokens
+        """
+        raise NotImplementedError
+
+
+class ApproximateTokenizer(Tokenizer):
+    """
+    Cheap token estimate from the text length.
+
+    Most LLM tokenizers average three to four characters per token on
+    English text and code, which is accurate enough for budgeting.
+    """
+
+    def __init__(self, chars_per_token: float = 3.5):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            chars_per_token: Average number of characters per token
+        """
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token) if text else 0
+
+
+class HuggingFaceTokenizer(Tokenizer):
+    """Exact token counts with a Hugging Face ``tokenizers`` tokenizer."""
+
+    def __init__(self, name: str):
+        """
+        Load the tokenizer.
+
+        Args:
+            name: Tokenizer file path or Hugging Face Hub model id
+
+        Raises:
+            ImportError: If the tokenizers package is not installed
+        """
+        try:
+            from tokenizers import Tokenizer as _Tokenizer
+        except ImportError as e:
+            raise ImportError("HuggingFaceTokenizer requires the 'tokenizers' package") from e
+
+        if name.endswith(".json"):
+            self._tokenizer = _Tokenizer.from_file(name)
+        else:
+            self._tokenizer = _Tokenizer.from_pretrained(name)
+
+    def count(self, text: str) -> int:
+        return len(self._tokenizer.encode(text, add_special_tokens=False).ids) if text else 0
+
+
+def get_tokenizer(name: Optional[str] = None) -> Tokenizer:
+    """
+    Get a tokenizer, falling back to the approximate one.
+
+    Args:
+        name: Hugging Face tokenizer file or model id (approximate if None)
+
+    Returns:
+        The tokenizer
+    """
+    if not name:
+        return ApproximateTokenizer()
+
+    try:
+        return HuggingFaceTokenizer(name)
+    except Exception as e:
+        print(f"Error loading tokenizer {name}, using approximate token counts: {e}")
+        return ApproximateTokenizer()
+
+
+class TokenBudget:
+    """
+    Token accounting for prompt assembly.
+
+    The budget of a request is the context size of the model minus the
+    tokens reserved for the answer. Old conversation turns are dropped to
+    stay within it, and tool results are capped before they are sent back to
+    the model.
+    """
+
+    # Tokens added by the chat template around each message
+    MESSAGE_OVERHEAD = 4
+
+    def __init__(
+        self,
+        tokenizer: Optional[Tokenizer] = None,
+        context_tokens: int = 4096,
+        model_context_tokens: Optional[Dict[str, int]] = None,
+        reserve_tokens: int = 1024,
+        max_tool_result_tokens: int = 1024
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            tokenizer: Tokenizer used for counting (approximate if None)
+            context_tokens: Context size of models without their own entry
+            model_context_tokens: Context size by model name
+            reserve_tokens: Tokens kept free for the generated answer
+            max_tool_result_tokens: Maximum tokens of a single tool result
+        """
+        self.tokenizer = tokenizer or ApproximateTokenizer()
+        self.context_tokens = context_tokens
+        self.model_context_tokens = model_context_tokens or {}
+        self.reserve_tokens = reserve_tokens
+        self.max_tool_result_tokens = max_tool_result_tokens
+        self._lock = threading.Lock()
+        self._tools_count: Optional[tuple] = None
+        self.trimmed_requests = 0
+        self.trimmed_messages = 0
+        self.capped_tool_results = 0
+
+    def prompt_budget(self, model: str) -> int:
+        """
+        Get the prompt token budget of a model.
+
+        Args:
+            model: The model name
+
+        Returns:
+            Maximum prompt tokens
+        """
+        return self.model_context_tokens.get(model, self.context_tokens) - self.reserve_tokens
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        Args:
+            text: The text
+
+        Returns:
+            Number of tokens
+        """
+        return self.tokenizer.count(text)
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        """
+        Count the tokens of a message, including the template overhead.
+
+        Args:
+            message: Message in Ollama format
+
+        Returns:
+            Number of tokens
+        """
+        tokens = self.MESSAGE_OVERHEAD + self.count(message.get("content") or "")
+        if message.get("tool_calls"):
+            tokens += self.count(json.dumps(message["tool_calls"], default=str))
+        return tokens
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Count the tokens of a list of messages.
+
+        Args:
+            messages: Messages in Ollama format
+
+        Returns:
+            Number of tokens
+        """
+        return sum(self.count_message(message) for message in messages)
+
+    def count_tools(self, tools: Optional[List[Dict[str, Any]]]) -> int:
+        """
+        Count the tokens of native tool definitions.
+
+        The count of the last tool list is remembered, since the prompt
+        builder returns the same list until the tools change.
+
+        Args:
+            tools: Tool definitions for Ollama's tools parameter
+
+        Returns:
+            Number of tokens
+        """
+        if not tools:
+            return 0
+
+        with self._lock:
+            if self._tools_count and self._tools_count[0] is tools:
+                return self._tools_count[1]
+
+        tokens = self.count(json.dumps(tools))
+        with self._lock:
+            self._tools_count = (tools, tokens)
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Shorten a text to at most max_tokens tokens.
+
+        Args:
+            text: The text
+            max_tokens: Maximum number of tokens
+
+        Returns:
+            The text, cut and marked as truncated if it was too long
+        """
+        tokens = self.count(text)
+        if tokens <= max_tokens:
+            return text
+
+        marker = f"... [truncated, {tokens} tokens]"
+        limit = max(0, max_tokens - self.count(marker))
+        # Cut proportionally, then shrink until the tokenizer agrees
+        end = int(len(text) * limit / tokens)
+        while end > 0 and self.count(text[:end]) > limit:
+            end = int(end * 0.9)
+        return text[:end] + marker
+
+    def cap_tool_result(self, tool_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cap the size of a tool result entry sent to the model.
+
+        Args:
+            tool_result: The tool result entry (name, result, error)
+
+        Returns:
+            The entry, with an oversized result replaced by a truncated string
+        """
+        if tool_result.get("result") is None:
+            return tool_result
+
+        serialized = json.dumps(tool_result["result"], default=str)
+        if self.count(serialized) <= self.max_tool_result_tokens:
+            return tool_result
+
+        with self._lock:
+            self.capped_tool_results += 1
+        return dict(tool_result, result=self.truncate(serialized, self.max_tool_result_tokens))
+
+    def trim_messages(
+        self, messages: List[Dict[str, Any]], model: str, extra_tokens: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Drop the oldest conversation turns that do not fit the model budget.
+
+        System messages and the last message are always kept.
+
+        Args:
+            messages: Messages in Ollama format
+            model: The model name
+            extra_tokens: Tokens used outside the messages, such as tool definitions
+
+        Returns:
+            The messages that fit, in their original order
+        """
+        budget = self.prompt_budget(model) - extra_tokens
+        counts = [self.count_message(message) for message in messages]
+        if sum(counts) <= budget or len(messages) < 2:
+            return messages
+
+        keep = [message.get("role") == "system" for message in messages]
+        keep[-1] = True
+        used = sum(count for count, kept in zip(counts, keep) if kept)
+
+        # Fill the remaining budget with the most recent turns
+        for i in range(len(messages) - 2, -1, -1):
+            if keep[i]:
+                continue
+            if used + counts[i] > budget:
+                break
+            keep[i] = True
+            used += counts[i]
+
+        trimmed = [message for message, kept in zip(messages, keep) if kept]
+        with self._lock:
+            self.trimmed_requests += 1
+            self.trimmed_messages += len(messages) - len(trimmed)
+        return trimmed
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get budget counters.
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            return {
+                "tokenizer": type(self.tokenizer).__name__,
+                "context_tokens": self.context_tokens,
+                "reserve_tokens": self.reserve_tokens,
+                "trimmed_requests": self.trimmed_requests,
+                "trimmed_messages": self.trimmed_messages,
+                "capped_tool_results": self.capped_tool_results
+            }
@@ -0,0 +1,136 @@
+"""
+Tool Calls Module
+
+This module recognizes MCP tool calls written by a model as JSON objects in
+its text output, either incrementally while tokens stream in or on a
+complete response.
+"""
+
+import json
+from typing import Collection, Dict, List, Optional, Any
+
+
+class ToolCallDetector:
+    """
+    Incremental detector of tool-call JSON objects in streamed text.
+
+    Text is scanned character by character while tracking brace depth and
+    JSON string state, so a tool call is reported as soon as its closing
+    brace arrives, and parameters may contain nested objects. A tool call is
+    an object with a string ``name`` and an object ``parameters``; it may be
+    wrapped in other objects or arrays, such as ``{"response": {...}}``.
+    """
+
+    def __init__(self, max_object_chars: int = 65536, tool_names: Optional[Collection[str]] = None):
+        """
+        Initialize the detector.
+
+        Args:
+            max_object_chars: Give up on an object longer than this, which
+                protects against a stray opening brace in prose
+            tool_names: Names of the available tools; objects naming any
+                other tool are not tool calls (any name if None)
+        """
+        self.max_object_chars = max_object_chars
+        self.tool_names = tool_names
+        self.tool_calls: List[Dict[str, Any]] = []
+        self._chars: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Scan more text.
+
+        Args:
+            text: The next piece of model output
+
+        Returns:
+            Tool calls completed by this piece of text
+        """
+        completed = []
+
+        for char in text:
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._chars = [char]
+                continue
+
+            self._chars.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._parse("".join(self._chars)))
+                    self._chars = []
+
+            if len(self._chars) > self.max_object_chars:
+                self._reset()
+
+        self.tool_calls.extend(completed)
+        return completed
+
+    def _reset(self) -> None:
+        self._chars = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def _parse(self, candidate: str) -> List[Dict[str, Any]]:
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            return []
+
+        return self._find(data)
+
+    def _find(self, data: Any) -> List[Dict[str, Any]]:
+        if isinstance(data, list):
+            return [tool_call for item in data for tool_call in self._find(item)]
+        if not isinstance(data, dict):
+            return []
+
+        tool_call = self._as_tool_call(data)
+        if tool_call:
+            return [tool_call]
+
+        # Look for tool calls wrapped in an outer object
+        return [tool_call for value in data.values() for tool_call in self._find(value)]
+
+    def _as_tool_call(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        name = data.get("name")
+        if not isinstance(name, str) or not isinstance(data.get("parameters"), dict):
+            return None
+        if self.tool_names is not None and name not in self.tool_names:
+            return None
+
+        return {"name": name, "parameters": data["parameters"]}
+
+
+def extract_tool_calls(content: str, tool_names: Optional[Collection[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Extract tool calls from a complete model response.
+
+    Args:
+        content: The response content
+        tool_names: Names of the available tools (any name if None)
+
+    Returns:
+        List of extracted tool calls
+    """
+    detector = ToolCallDetector(tool_names=tool_names)
+    detector.feed(content)
+    return detector.tool_calls
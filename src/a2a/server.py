@@ -25,7 +25,8 @@ class A2AServer:
         port: int = 8000,
         endpoint: str = None,
         webhook_url: str = None,
-        iaAlgorithm: IA2AIAAlgorithm = None
+        iaAlgorithm: IA2AIAAlgorithm = None,
+        stream_heartbeat_interval: Optional[float] = 5.0
     ):
         """
         Initialize the A2A server.
@@ -39,9 +40,12 @@ class A2AServer:
             ollama_host: The Ollama host URL
             endpoint: The endpoint where this agent is accessible
             webhook_url: URL to send task status updates to (optional)
+            stream_heartbeat_interval: Seconds of stream inactivity after which a
+                heartbeat is sent, so disconnected clients are noticed
         """
         self.port = port
         self.webhook_url = webhook_url
+        self.stream_heartbeat_interval = stream_heartbeat_interval
         self.server_thread = None
         self.should_stop = False
         
@@ -99,6 +103,24 @@ class A2AServer:
         except Exception as e:
             print(f"Error sending webhook notification: {e}")
     
+    def _cancel_task(self, task_id: str) -> bool:
+        """
+        Cancel a task, stopping its in-flight work when the algorithm supports it.
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            True if the task was canceled, False if it does not exist or has finished
+        """
+        if hasattr(self.iaAlgorithm, "cancel_task"):
+            return self.iaAlgorithm.cancel_task(task_id)
+            
+        task = self.iaAlgorithm.task_manager.get_task(task_id)
+        if not task or task["status"] in ("completed", "failed", "canceled"):
+            return False
+        return self.iaAlgorithm.task_manager.update_task_status(task_id, "canceled")
+    
     def _setup_routes(self):
         """Set up Flask routes."""
         @self.app.route("/.well-known/agent.json", methods=["GET"])
@@ -199,9 +221,32 @@ class A2AServer:
                         )
                     
                     # Process the task with streaming
-                    for chunk in self.iaAlgorithm._process_task_stream(task_id):
-                        # Send each chunk as SSE data
-                        yield f"event: chunk\ndata: {json.dumps(chunk)}\n\n"
+                    if hasattr(self.iaAlgorithm, "cancel_task"):
+                        chunks = self.iaAlgorithm._process_task_stream(
+                            task_id, heartbeat_interval=self.stream_heartbeat_interval
+                        )
+                    else:
+                        chunks = self.iaAlgorithm._process_task_stream(task_id)
+                        
+                    finished = False
+                    try:
+                        for chunk in chunks:
+                            if chunk.get("heartbeat"):
+                                # SSE comment; writing it fails once the client has gone
+                                yield ": heartbeat\n\n"
+                                continue
+                                
+                            # Send each chunk as SSE data
+                            yield f"event: chunk\ndata: {json.dumps(chunk)}\n\n"
+                        finished = True
+                    finally:
+                        if not finished:
+                            # The client disconnected: stop the generation and tool calls
+                            close = getattr(chunks, "close", None)
+                            if close:
+                                close()
+                            if self._cancel_task(task_id) and self.webhook_url:
+                                self._send_webhook_notification(task_id, "canceled", {"reason": "client disconnected"})
                     
                     # Get final task status
                     final_status = self.iaAlgorithm.task_manager.get_task(task_id)["status"]
@@ -227,6 +272,29 @@ class A2AServer:
                 mimetype="text/event-stream"
             )
         
+        @self.app.route("/tasks/<task_id>/cancel", methods=["POST"])
+        def cancel_task(task_id):
+            task = self.iaAlgorithm.task_manager.get_task(task_id)
+            if not task:
+                return jsonify({"error": f"Task not found: {task_id}"}), 404
+                
+            if not self._cancel_task(task_id):
+                return jsonify({
+                    "error": f"Task already {task['status']}: {task_id}",
+                    "status": task["status"]
+                }), 409
+                
+            if self.webhook_url:
+                self._send_webhook_notification(task_id, "canceled", {"reason": "canceled by request"})
+                
+            return jsonify({"task_id": task_id, "status": "canceled"})
+        
+        @self.app.route("/metrics", methods=["GET"])
+        def metrics():
+            if not hasattr(self.iaAlgorithm, "get_metrics"):
+                return jsonify({"error": "Metrics not available for this agent"}), 404
+            return jsonify(self.iaAlgorithm.get_metrics())
+
         @self.app.route("/rpc", methods=["POST"])
         def handle_rpc():
             request_data = request.json
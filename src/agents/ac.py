@@ -13,6 +13,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from a2a.serverOllama import run_server
 from a2a.core.a2a_ollama import A2AOllama
+from a2a.core.response_cache import ResponseCache
+from a2a.core.semantic_cache import SemanticCache
+from a2a.core.token_budget import TokenBudget, get_tokenizer
 
 def main():
     """Run the AC agent server."""
@@ -20,6 +23,18 @@ def main():
     parser.add_argument("--model", type=str, default="llama3.2:latest", help="The Ollama model to use")
     parser.add_argument("--port", type=int, default=8002, help="The port to run the server on")
     parser.add_argument("--ollama-host", type=str, default="http://localhost:11434", help="The Ollama host URL")
+    parser.add_argument("--ollama-hosts", type=str, default=None, help="Comma-separated Ollama host URLs to balance over")
+    parser.add_argument("--load-balancing", choices=["least_outstanding", "latency"], default="least_outstanding", help="Host selection strategy")
+    parser.add_argument("--response-cache", action="store_true", help="Cache responses to identical prompts")
+    parser.add_argument("--cache-ttl", type=float, default=300.0, help="Response cache time to live in seconds")
+    parser.add_argument("--semantic-cache", action="store_true", help="Answer paraphrased prompts from a semantic cache")
+    parser.add_argument("--semantic-threshold", type=float, default=0.92, help="Minimum similarity for a semantic cache hit")
+    parser.add_argument("--embedding-model", type=str, default="nomic-embed-text", help="The Ollama embedding model")
+    parser.add_argument("--keep-alive", type=str, default="30m", help="How long Ollama keeps the model loaded after a request")
+    parser.add_argument("--no-preload", dest="preload", action="store_false", help="Do not load the model at startup")
+    parser.add_argument("--keep-warm-interval", type=float, default=None, help="Seconds between background keep-warm pings")
+    parser.add_argument("--context-tokens", type=int, default=4096, help="Context size of the model in tokens")
+    parser.add_argument("--tokenizer", type=str, default=None, help="Hugging Face tokenizer for exact token counts")
     
     args = parser.parse_args()
     
@@ -52,7 +67,22 @@ def main():
             skills=skills,
             description="An A2A agent that specializes in generating solar resume",
             host=args.ollama_host,
+            hosts=args.ollama_hosts.split(",") if args.ollama_hosts else None,
+            load_balancing=args.load_balancing,
+            health_check_interval=10.0 if args.ollama_hosts else None,
             endpoint=args.ollama_host,
+            response_cache=ResponseCache(ttl=args.cache_ttl) if args.response_cache else None,
+            semantic_cache=SemanticCache(
+                embedding_model=args.embedding_model,
+                threshold=args.semantic_threshold
+            ) if args.semantic_cache else None,
+            keep_alive=args.keep_alive,
+            preload=args.preload,
+            keep_warm_interval=args.keep_warm_interval,
+            token_budget=TokenBudget(
+                tokenizer=get_tokenizer(args.tokenizer),
+                context_tokens=args.context_tokens
+            ),
         )
     
     
@@ -0,0 +1,52 @@
+import time
+import asyncio
+
+from a2a.core.a2a_ollama import A2AOllama
+from a2a.core.concurrency import ConcurrencyLimiter
+
+
+class SlowClient:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def chat(self, model, messages, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.2)
+        self.in_flight -= 1
+        return {"message": {"role": "assistant", "content": "ok"}, "done": True}
+
+
+def test_model_limit_applies_per_host():
+    async def main():
+        limiter = ConcurrencyLimiter(max_in_flight_per_host=1)
+        async with limiter.slot("http://a", "m"):
+            # The same model on another host is not held up
+            await asyncio.wait_for(limiter.acquire("http://b", "m"), 0.1)
+            limiter.release("http://b", "m")
+
+    asyncio.run(main())
+
+
+def test_generations_run_in_parallel_across_hosts():
+    agent = A2AOllama(
+        "m", "agent", "An agent", [],
+        hosts=["http://localhost:11601", "http://localhost:11602"], max_in_flight=1, coalesce=False
+    )
+    clients = []
+    for host in agent.host_pool.hosts:
+        host.async_client = SlowClient()
+        clients.append(host.async_client)
+
+    async def main():
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            agent._achat([{"role": "user", "content": f"question {i}"}]) for i in range(4)
+        ))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(main())
+    # Two rounds of two parallel generations, not four in a row
+    assert elapsed < 0.6
+    assert [client.max_in_flight for client in clients] == [1, 1]
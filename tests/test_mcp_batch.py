@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from a2a.core.mcp.mcp_client import MCPClient
+from a2a.core.mcp.mcp_server import MCPServer
+from a2a.core.event_loop import run_coroutine
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = MCPServer(port=3963)
+    running = {"now": 0, "max": 0}
+
+    async def wait(seconds):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            running["now"] -= 1
+        return {"waited": seconds}
+
+    server.register_tool("wait", "Wait a while", wait, [])
+    server.running = running
+    run_coroutine(server.start())
+    yield server
+    run_coroutine(server.stop())
+
+
+@pytest.mark.parametrize("batch_supported", [None, False])
+def test_batch_limits_apply_to_each_call(server, batch_supported):
+    client = MCPClient("http://localhost:3963")
+    client.connect_sync()
+    client.batch_supported = batch_supported
+    server.running["max"] = 0
+
+    async def main():
+        return await client.execute_tools(
+            [
+                {"name": "wait", "parameters": {"seconds": 0.05}},
+                {"name": "wait", "parameters": {"seconds": 0.05}},
+                {"name": "wait", "parameters": {"seconds": 1}},
+            ],
+            max_parallel=1,
+            timeout=0.3
+        )
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        client.close_sync()
+    assert [result.result for result in results[:2]] == [{"waited": 0.05}, {"waited": 0.05}]
+    assert results[2].error == "Tool call timed out after 0.3s"
+    assert server.running["max"] == 1
@@ -0,0 +1,74 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from a2a.core.mcp.mcp_client import MCPClient, MCPToolError
+from a2a.core.mcp.mcp_schemas import MCPToolDefinition
+from a2a.core.mcp.mcp_server import MCPServer
+from a2a.core.event_loop import run_coroutine
+
+
+def test_stream_request_that_is_not_an_object_is_rejected():
+    server = MCPServer(port=3961)
+    run_coroutine(server.start())
+
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            async with session.post("http://localhost:3961/execute/stream", json=[]) as response:
+                return response.status, await response.json()
+
+    try:
+        status, body = asyncio.run(main())
+    finally:
+        run_coroutine(server.stop())
+    assert status == 400
+    assert "error" in body
+
+
+def test_malformed_stream_line_raises_tool_error():
+    async def stream(request):
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        await response.write(b'{"chunk": 1}\nnot json\n')
+        return response
+
+    async def start():
+        app = web.Application()
+        app.router.add_post("/execute/stream", stream)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "localhost", 3962).start()
+        return runner
+
+    runner = run_coroutine(start())
+    client = MCPClient("http://localhost:3962")
+    client.available_tools["predict"] = MCPToolDefinition(name="predict", description="Predict", parameters=[])
+    try:
+        chunks = []
+        with pytest.raises(MCPToolError):
+            for chunk in client.stream_tool_sync("predict", {}):
+                chunks.append(chunk)
+        assert chunks == [1]
+    finally:
+        client.close_sync()
+        run_coroutine(runner.cleanup())
+
+
+def test_error_result_of_a_streamed_tool_raises_tool_error():
+    server = MCPServer(port=3964)
+
+    def lookup(city):
+        return {"error": f"Unknown city: {city}"}
+
+    server.register_tool("lookup", "Look up a city", lookup, [])
+    run_coroutine(server.start())
+    client = MCPClient("http://localhost:3964")
+    try:
+        client.connect_sync()
+        with pytest.raises(MCPToolError, match="Unknown city: Atlantis"):
+            list(client.stream_tool_sync("lookup", {"city": "Atlantis"}))
+    finally:
+        client.close_sync()
+        run_coroutine(server.stop())
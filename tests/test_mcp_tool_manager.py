@@ -0,0 +1,79 @@
+import time
+import asyncio
+
+import pytest
+
+from a2a.core.mcp.mcp_tool_manager import MCPToolManager, ToolBusyError, ToolTimeoutError
+
+
+def test_cancelled_caller_does_not_fail_coalesced_callers():
+    async def main():
+        manager = MCPToolManager()
+        runs = []
+
+        async def lookup(city):
+            runs.append(city)
+            await asyncio.sleep(0.05)
+            return {"city": city}
+
+        manager.register_tool("lookup", "Look up a city", lookup, [], cacheable=True)
+        first = asyncio.ensure_future(manager.execute_tool("lookup", {"city": "Paris"}))
+        second = asyncio.ensure_future(manager.execute_tool("lookup", {"city": "Paris"}))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == {"city": "Paris"}
+        assert runs == ["Paris"]
+        # The shared execution still filled the cache
+        assert await manager.execute_tool("lookup", {"city": "Paris"}) == {"city": "Paris"}
+        assert manager.tools["lookup"]["cache_hits"] == 1
+        manager.shutdown()
+
+    asyncio.run(main())
+
+
+def test_timed_out_thread_call_keeps_its_slot_until_it_returns():
+    async def main():
+        manager = MCPToolManager()
+
+        def slow():
+            time.sleep(0.5)
+            return "done"
+
+        manager.register_tool(
+            "slow", "A slow tool", slow, [],
+            execution_mode="thread", max_concurrency=1, max_queued=0, timeout=0.2
+        )
+        with pytest.raises(ToolTimeoutError):
+            await manager.execute_tool("slow", {})
+        # The first call still runs in its thread, so the limit still holds
+        assert manager.tools["slow"]["in_flight"] == 1
+        with pytest.raises(ToolBusyError):
+            await manager.execute_tool("slow", {})
+
+        await asyncio.sleep(0.4)
+        assert manager.tools["slow"]["in_flight"] == 0
+        with pytest.raises(ToolTimeoutError):
+            await manager.execute_tool("slow", {})
+        manager.shutdown()
+
+    asyncio.run(main())
+
+
+def test_timeout_error_raised_by_a_tool_is_a_tool_error():
+    async def main():
+        manager = MCPToolManager()
+
+        def fetch():
+            raise TimeoutError("socket timed out")
+
+        manager.register_tool("fetch", "Fetch a page", fetch, [], execution_mode="thread")
+        with pytest.raises(TimeoutError, match="socket timed out"):
+            await manager.execute_tool("fetch", {})
+        assert manager.tools["fetch"]["timeouts"] == 0
+        assert manager.tools["fetch"]["errors"] == 1
+        manager.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+
+from a2a.core.a2a_ollama import A2AOllama
+from a2a.core.mcp.mcp_schemas import MCPParameterDefinition, MCPToolDefinition
+from a2a.core.prompt_builder import PromptBuilder
+from a2a.core.resilience import RetryPolicy
+
+
+def make_tools(description="Get the weather"):
+    return {
+        "get_weather": MCPToolDefinition(
+            name="get_weather",
+            description=description,
+            parameters=[MCPParameterDefinition(name="city", description="City name", type="string", required=True)]
+        )
+    }
+
+
+def test_tool_description_is_rendered_once_per_tool_set():
+    builder = PromptBuilder("Agent", "an agent")
+    tools = make_tools()
+
+    first = builder.tools_description(tools)
+    assert builder.tools_description(tools) is first
+    assert builder.ollama_tools(tools)[0]["function"]["name"] == "get_weather"
+    assert "- get_weather: Get the weather" in first
+    assert builder.get_metrics() == {"tools_version": 1, "renders": 1, "hits": 2}
+
+
+def test_new_tool_definitions_invalidate_the_rendering():
+    builder = PromptBuilder("Agent", "an agent")
+    builder.tools_description(make_tools())
+
+    description = builder.tools_description(make_tools("Get the forecast"))
+
+    assert "Get the forecast" in description
+    assert builder.version == 2
+    assert builder.renders == 2
+
+
+def test_build_messages_leaves_the_history_unchanged():
+    builder = PromptBuilder("Agent", "an agent")
+    history = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Weather in Paris?"}]
+
+    messages = builder.build_messages(history, make_tools())
+
+    assert messages[0]["content"].startswith("Be brief.You have access")
+    assert history[0] == {"role": "system", "content": "Be brief."}
+    assert builder.build_messages(history, make_tools()) == messages
+
+
+class FlakyClient:
+    def __init__(self, failures):
+        self.failures = failures
+        self.prompt_sizes = []
+
+    async def chat(self, model, messages, **kwargs):
+        self.prompt_sizes.append(sum(len(message["content"]) for message in messages))
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection reset")
+        return {"message": {"role": "assistant", "content": "Sunny"}, "done": True}
+
+
+def test_prompt_size_is_constant_across_retries():
+    agent = A2AOllama(
+        "m", "agent", "An agent", [],
+        tool_mode="text", retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01), coalesce=False
+    )
+    agent.configure_mcp_client(SimpleNamespace(available_tools=make_tools()))
+    client = FlakyClient(failures=2)
+    agent.host_pool.hosts[0].async_client = client
+    task_id = agent.task_manager.create_task({})
+    agent.message_handler.add_message(
+        task_id, {"role": "user", "parts": [{"type": "text", "content": "Weather in Paris?"}]}
+    )
+
+    result = asyncio.run(agent._aprocess_task(task_id))
+
+    assert result["status"] == "completed"
+    assert len(client.prompt_sizes) == 3
+    assert len(set(client.prompt_sizes)) == 1
+    assert agent.prompt_builder.renders == 1
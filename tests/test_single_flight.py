@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from a2a.core.single_flight import SingleFlight
+
+
+def test_cancelling_one_caller_keeps_the_shared_call():
+    async def main():
+        single_flight = SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.ensure_future(single_flight.ado("key", work))
+        second = asyncio.ensure_future(single_flight.ado("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "result"
+        assert len(runs) == 1
+        assert single_flight.get_metrics()["coalesced"] == 1
+
+    asyncio.run(main())
+
+
+def test_shared_call_is_cancelled_once_every_caller_left():
+    async def main():
+        single_flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.ensure_future(single_flight.ado("key", work)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert single_flight.get_metrics()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_errors_reach_every_caller():
+    async def main():
+        single_flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            single_flight.ado("key", work), single_flight.ado("key", work), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+    asyncio.run(main())
+
+
+def test_stream_producer_is_cancelled_once_every_subscriber_left():
+    async def main():
+        single_flight = SingleFlight()
+        stopped = asyncio.Event()
+
+        async def generate():
+            try:
+                # Still queued, no chunk produced yet
+                await asyncio.sleep(10)
+                yield "chunk"
+            finally:
+                stopped.set()
+
+        async def consume():
+            return [chunk async for chunk in single_flight.astream("key", generate)]
+
+        first = asyncio.ensure_future(consume())
+        second = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not stopped.is_set()
+
+        second.cancel()
+        await asyncio.wait_for(stopped.wait(), 1)
+        assert single_flight.get_metrics()["in_flight"] == 0
+
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+import asyncio
+
+from a2a.core.a2a_ollama import A2AOllama
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def chat(self, model, messages, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return self._stream()
+        return {"message": {"role": "assistant", "content": "ok"}, "done": True}
+
+    async def _stream(self):
+        yield {"message": {"role": "assistant", "content": "ok"}, "done": True}
+
+
+def make_agent():
+    agent = A2AOllama("m", "agent", "An agent", [], coalesce=False)
+    client = CountingClient()
+    agent.host_pool.hosts[0].async_client = client
+    task_id = agent.task_manager.create_task({})
+    agent.message_handler.add_message(task_id, {"role": "user", "parts": [{"type": "text", "content": "Hi"}]})
+    return agent, client, task_id
+
+
+def test_task_canceled_before_it_starts_is_not_run():
+    agent, client, task_id = make_agent()
+    assert agent.cancel_task(task_id)
+
+    result = asyncio.run(agent._aprocess_task(task_id))
+
+    assert result == {"task_id": task_id, "status": "canceled"}
+    assert client.calls == 0
+    assert agent.task_manager.get_task(task_id)["status"] == "canceled"
+
+
+def test_streamed_task_canceled_before_it_starts_is_not_run():
+    agent, client, task_id = make_agent()
+    assert agent.cancel_task(task_id)
+
+    async def main():
+        return [chunk async for chunk in agent._aprocess_task_stream(task_id)]
+
+    assert asyncio.run(main()) == [{"task_id": task_id, "status": "canceled", "done": True}]
+    assert client.calls == 0
+    assert agent.task_manager.get_task(task_id)["status"] == "canceled"
+
+
+def test_task_canceled_while_generating_keeps_its_status():
+    agent, client, task_id = make_agent()
+
+    async def chat(model, messages, **kwargs):
+        client.calls += 1
+        # Canceled as the generation finishes, before the result is stored
+        agent._mark_canceled(task_id)
+        return {"message": {"role": "assistant", "content": "ok"}, "done": True}
+
+    client.chat = chat
+    result = asyncio.run(agent._aprocess_task(task_id))
+
+    assert result["status"] == "canceled"
+    assert agent.task_manager.get_task(task_id)["status"] == "canceled"
@@ -0,0 +1,33 @@
+from a2a.core.tool_calls import ToolCallDetector, extract_tool_calls
+
+
+def test_tool_call_nested_in_an_outer_object_is_found():
+    content = 'Sure: {"response": {"name": "get_weather", "parameters": {"city": {"name": "Paris"}}}}'
+
+    assert extract_tool_calls(content) == [{"name": "get_weather", "parameters": {"city": {"name": "Paris"}}}]
+
+
+def test_nested_tool_call_is_reported_when_the_outer_object_closes():
+    detector = ToolCallDetector()
+
+    assert detector.feed('{"calls": [{"name": "a", "parameters": {}}') == []
+    assert detector.feed(', {"name": "b", "parameters": {"x": 1}}]}') == [
+        {"name": "a", "parameters": {}},
+        {"name": "b", "parameters": {"x": 1}},
+    ]
+
+
+def test_plain_json_answer_is_not_a_tool_call():
+    assert extract_tool_calls('The answer: {"name": "Alice", "age": 30}') == []
+
+
+def test_nested_object_with_a_name_is_not_a_tool_call():
+    assert extract_tool_calls('{"location": {"name": "Paris", "lat": 1}}') == []
+
+
+def test_only_available_tools_are_called():
+    content = '{"name": "Alice", "parameters": {}} {"name": "get_weather", "parameters": {"city": "Paris"}}'
+
+    assert extract_tool_calls(content, tool_names={"get_weather"}) == [
+        {"name": "get_weather", "parameters": {"city": "Paris"}}
+    ]
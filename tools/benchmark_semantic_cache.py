@@ -0,0 +1,152 @@
+"""
+Benchmark del caché semántico
+
+Mide la tasa de aciertos del SemanticCache frente a la latencia ahorrada
+para distintos umbrales de similitud. Las consultas son paráfrasis de las
+preguntas que reciben los agentes AC y dashboard; cada grupo de paráfrasis
+tiene una respuesta esperada, lo que permite contar también los aciertos
+incorrectos (respuestas de otro grupo). El ahorro es neto: descuenta el
+embedding que cada consulta paga, acierte o no.
+
+Por defecto los embeddings se calculan en proceso con el mismo algoritmo
+que tools/mock_ollama_server.py. Con --host se usa el endpoint de
+embeddings de un Ollama real.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from a2a.core.semantic_cache import SemanticCache
+from mock_ollama_server import embed_text
+
+
+PARAPHRASE_GROUPS: Dict[str, List[str]] = {
+    "ac_temperature": [
+        "Provide current temperature of the AC. Include important data points, historical context, and current state.",
+        "Provide the current temperature of the AC, including important data points, historical context and current state.",
+        "What is the current AC temperature? Include important data points, history and current state.",
+        "Give me the current temperature of the AC with important data points and its current state.",
+    ],
+    "ac_energy": [
+        "How can the AC save energy while keeping a comfortable temperature?",
+        "How can the AC save energy and still keep a comfortable temperature?",
+        "What AC settings save energy while keeping the temperature comfortable?",
+    ],
+    "solar_status": [
+        "Provide current status of the Solar panels. Include important data points.",
+        "Provide the current status of the solar panels, including important data points.",
+        "What is the current status of the Solar panels? Include the important data points.",
+    ],
+    "weather_status": [
+        "Provide current status of the Weather. Include important data points.",
+        "Provide the current weather status, including important data points.",
+        "What is the current status of the weather? Include important data points.",
+    ],
+    "dashboard_summary": [
+        "Summarize the dashboard: PV performance, traffic light status and alerts.",
+        "Give a summary of the dashboard with PV performance, traffic light status and alerts.",
+        "Dashboard summary please: PV performance, the traffic light status and any alerts.",
+    ],
+}
+
+
+def build_workload(size: int, seed: int) -> List[Tuple[str, str]]:
+    """Genera una secuencia aleatoria de (grupo, consulta)."""
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(size):
+        group = rng.choice(list(PARAPHRASE_GROUPS))
+        workload.append((group, rng.choice(PARAPHRASE_GROUPS[group])))
+    return workload
+
+
+def run(
+    workload: List[Tuple[str, str]],
+    embed: Callable[[str], List[float]],
+    threshold: float,
+    generation_time: float
+) -> Dict[str, float]:
+    """
+    Ejecuta la carga contra un caché nuevo.
+
+    Args:
+        workload: Lista de (grupo, consulta)
+        embed: Función de embedding
+        threshold: Umbral de similitud del caché
+        generation_time: Latencia simulada de una generación completa (s)
+    """
+    cache = SemanticCache(threshold=threshold, max_entries=256)
+    context_key = SemanticCache.make_context_key("llama3.2:latest", [])
+
+    wrong_hits = 0
+    embed_time = 0.0
+    lookup_time = 0.0
+    for group, prompt in workload:
+        # Como el agente, cada consulta se embebe antes de buscar en el caché
+        started = time.perf_counter()
+        embedding = embed(prompt)
+        embed_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        cached = cache.lookup(context_key, embedding)
+        lookup_time += time.perf_counter() - started
+
+        if cached is None:
+            cache.store(context_key, embedding, group, generation_time)
+        elif cached != group:
+            wrong_hits += 1
+
+    metrics = cache.get_metrics()
+    return {
+        "threshold": threshold,
+        "hit_rate": metrics["hit_rate"],
+        "wrong_hits": wrong_hits,
+        "latency_saved": metrics["latency_saved"] - embed_time - lookup_time,
+        "avg_embed_ms": embed_time / len(workload) * 1e3,
+        "avg_lookup_us": lookup_time / len(workload) * 1e6
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del caché semántico")
+    parser.add_argument("--requests", type=int, default=500, help="Número de consultas")
+    parser.add_argument("--generation-time", type=float, default=2.5, help="Latencia de una generación (s)")
+    parser.add_argument("--thresholds", type=str, default="0.80,0.85,0.90,0.95", help="Umbrales a evaluar")
+    parser.add_argument("--host", type=str, default=None, help="Host de Ollama para embeddings reales")
+    parser.add_argument("--embedding-model", type=str, default="nomic-embed-text", help="Modelo de embeddings")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de la carga")
+
+    args = parser.parse_args()
+
+    if args.host:
+        from ollama import Client
+        client = Client(host=args.host)
+        embed = lambda text: client.embed(model=args.embedding_model, input=text)["embeddings"][0]
+    else:
+        embed = embed_text
+
+    workload = build_workload(args.requests, args.seed)
+    baseline = args.requests * args.generation_time
+
+    print(
+        f"{'umbral':>8} {'aciertos':>9} {'erróneos':>9} {'ahorro neto (s)':>16} {'ahorro %':>9} "
+        f"{'embed (ms)':>11} {'lookup (µs)':>12}"
+    )
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        result = run(workload, embed, threshold, args.generation_time)
+        print(
+            f"{result['threshold']:>8.2f} {result['hit_rate']:>9.1%} {result['wrong_hits']:>9d} "
+            f"{result['latency_saved']:>16.1f} {result['latency_saved'] / baseline:>9.1%} "
+            f"{result['avg_embed_ms']:>11.2f} {result['avg_lookup_us']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
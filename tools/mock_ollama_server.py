@@ -0,0 +1,280 @@
+"""
+Mock Ollama Server - Simulador de la API de Ollama
+
+Servidor mock que implementa el subconjunto de la API HTTP de Ollama que
+usan los agentes (chat, generate y embeddings). Permite probar A2AOllama
+sin GPU ni modelos descargados: las respuestas son deterministas y los
+embeddings se calculan con un bag-of-words con hashing, de modo que las
+paráfrasis obtienen vectores cercanos.
+"""
+
+import re
+import json
+import math
+import time
+import zlib
+from typing import Dict, Any, List
+from flask import Flask, request, jsonify, Response
+
+app = Flask(__name__)
+
+EMBEDDING_DIM = 256
+
+
+def embed_text(text: str, dim: int = EMBEDDING_DIM) -> List[float]:
+    """
+    Calcula un embedding determinista y normalizado para un texto.
+
+    Usa palabras y trigramas de caracteres con hashing, por lo que
+    textos que comparten vocabulario tienen similitud coseno alta.
+
+    Args:
+        text: Texto a embeber
+        dim: Dimensión del vector
+    """
+    vector = [0.0] * dim
+    words = re.findall(r"\w+", text.lower())
+
+    for word in words:
+        vector[zlib.crc32(word.encode("utf-8")) % dim] += 1.0
+        padded = f"#{word}#"
+        for i in range(len(padded) - 2):
+            trigram = padded[i:i + 3]
+            vector[zlib.crc32(trigram.encode("utf-8")) % dim] += 0.3
+
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else vector
+
+
+def parse_keep_alive(value: Any, default: float = 300.0) -> float:
+    """
+    Convierte un keep_alive de Ollama ("30m", "10s", 120, -1) a segundos.
+
+    Un valor negativo mantiene el modelo cargado indefinidamente.
+    """
+    if value is None or value == "":
+        return default
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+
+    match = re.fullmatch(r"(-?[\d.]+)\s*([smh]?)", str(value).strip())
+    if not match:
+        return default
+    amount = float(match.group(1))
+    if amount < 0:
+        return float("inf")
+    return amount * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+class OllamaSimulator:
+    """Genera respuestas simuladas con los metadatos de tiempo de Ollama."""
+
+    def __init__(self, latency: float = 0.5, tokens_per_second: float = 50.0, load_time: float = 3.0):
+        """
+        Args:
+            latency: Tiempo base de evaluación del prompt (segundos)
+            tokens_per_second: Velocidad de generación simulada
+            load_time: Tiempo de carga de un modelo que no está en memoria (segundos)
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.load_time = load_time
+        self.requests = 0
+        # Modelo -> instante en que Ollama lo descargaría de memoria
+        self.loaded_until: Dict[str, float] = {}
+
+    def load(self, model: str, keep_alive: Any = None) -> float:
+        """
+        Simula la carga del modelo si no está en memoria.
+
+        Returns:
+            Duración de la carga en segundos (0 si ya estaba cargado)
+        """
+        now = time.monotonic()
+        load_duration = 0.0
+        if self.loaded_until.get(model, 0.0) < now:
+            time.sleep(self.load_time)
+            load_duration = self.load_time
+        self.loaded_until[model] = time.monotonic() + parse_keep_alive(keep_alive)
+        return load_duration
+
+    def _answer(self, messages: List[Dict[str, Any]]) -> str:
+        """Construye una respuesta determinista a partir del último mensaje."""
+        prompt = ""
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                prompt = message.get("content", "")
+                break
+        return f"Respuesta simulada a: {prompt.strip()[:200]}"
+
+    def chat(self, model: str, messages: List[Dict[str, Any]], keep_alive: Any = None) -> List[Dict[str, Any]]:
+        """
+        Genera la lista de fragmentos de una respuesta de chat.
+
+        El último fragmento lleva done=True y los contadores de Ollama.
+        """
+        self.requests += 1
+        load_duration = self.load(model, keep_alive)
+        prompt_tokens = sum(len(m.get("content", "").split()) for m in messages)
+        tokens = self._answer(messages).split(" ")
+
+        started = time.perf_counter()
+        time.sleep(self.latency)
+        prompt_eval_duration = time.perf_counter() - started
+
+        chunks = []
+        for i, token in enumerate(tokens):
+            chunks.append({
+                "model": model,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "message": {"role": "assistant", "content": token if i == 0 else f" {token}"},
+                "done": False
+            })
+
+        eval_duration = len(tokens) / self.tokens_per_second
+        chunks.append({
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((load_duration + prompt_eval_duration + eval_duration) * 1e9),
+            "load_duration": int(load_duration * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_eval_duration * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int(eval_duration * 1e9)
+        })
+        return chunks
+
+
+# Instancia global del simulador
+simulator = OllamaSimulator()
+
+
+def _stream_chunks(chunks: List[Dict[str, Any]]):
+    """Emite los fragmentos como NDJSON respetando la velocidad simulada."""
+    delay = 1.0 / simulator.tokens_per_second
+    for chunk in chunks:
+        if not chunk["done"]:
+            time.sleep(delay)
+        yield json.dumps(chunk) + "\n"
+
+
+def _merge_chunks(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combina los fragmentos en una única respuesta no-streaming."""
+    final = dict(chunks[-1])
+    final["message"] = {
+        "role": "assistant",
+        "content": "".join(chunk["message"]["content"] for chunk in chunks)
+    }
+    time.sleep(final["eval_duration"] / 1e9)
+    return final
+
+
+@app.route('/api/chat', methods=['POST'])
+def chat():
+    """Simula /api/chat (streaming NDJSON por defecto, como Ollama)."""
+    data = request.get_json(force=True)
+    chunks = simulator.chat(data.get("model", ""), data.get("messages", []), data.get("keep_alive"))
+
+    if data.get("stream", True):
+        return Response(_stream_chunks(chunks), mimetype="application/x-ndjson")
+    return jsonify(_merge_chunks(chunks))
+
+
+@app.route('/api/generate', methods=['POST'])
+def generate():
+    """Simula /api/generate; un prompt vacío solo carga el modelo."""
+    data = request.get_json(force=True)
+    prompt = data.get("prompt", "")
+
+    if not prompt:
+        load_duration = simulator.load(data.get("model", ""), data.get("keep_alive"))
+        return jsonify({
+            "model": data.get("model", ""),
+            "response": "",
+            "done": True,
+            "done_reason": "load",
+            "load_duration": int(load_duration * 1e9)
+        })
+
+    chunks = simulator.chat(data.get("model", ""), [{"role": "user", "content": prompt}], data.get("keep_alive"))
+    merged = _merge_chunks(chunks)
+    merged["response"] = merged.pop("message")["content"]
+    return jsonify(merged)
+
+
+@app.route('/api/embed', methods=['POST'])
+def embed():
+    """Simula /api/embed (entrada de texto o lista de textos)."""
+    data = request.get_json(force=True)
+    inputs = data.get("input", "")
+    if isinstance(inputs, str):
+        inputs = [inputs]
+
+    return jsonify({
+        "model": data.get("model", ""),
+        "embeddings": [embed_text(text) for text in inputs]
+    })
+
+
+@app.route('/api/embeddings', methods=['POST'])
+def embeddings():
+    """Simula el endpoint antiguo /api/embeddings."""
+    data = request.get_json(force=True)
+    return jsonify({"embedding": embed_text(data.get("prompt", ""))})
+
+
+@app.route('/api/tags', methods=['GET'])
+def tags():
+    """Lista de modelos disponibles."""
+    return jsonify({"models": [{"name": "llama3.2:latest", "model": "llama3.2:latest"}]})
+
+
+@app.route('/api/ps', methods=['GET'])
+def ps():
+    """Modelos cargados actualmente en memoria."""
+    now = time.monotonic()
+    return jsonify({"models": [
+        {"name": model, "model": model}
+        for model, until in simulator.loaded_until.items() if until > now
+    ]})
+
+
+@app.route('/api/version', methods=['GET'])
+def version():
+    """Versión de la API simulada."""
+    return jsonify({"version": "0.0.0-mock"})
+
+
+def run_mock_server(host: str = "0.0.0.0", port: int = 11435):
+    """Inicia el servidor mock."""
+    print("=" * 60)
+    print("🔧 Mock Ollama Server - Simulador de la API de Ollama")
+    print("=" * 60)
+    print(f"🌐 Servidor iniciado en http://{host}:{port}")
+    print(f"⏱️  Latencia simulada: {simulator.latency}s, {simulator.tokens_per_second} tokens/s")
+    print(f"📦 Carga de modelo en frío: {simulator.load_time}s")
+    print("=" * 60)
+
+    app.run(host=host, port=port, debug=False, threaded=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run Mock Ollama Server")
+    parser.add_argument("--host", default="0.0.0.0", help="Host para el servidor")
+    parser.add_argument("--port", type=int, default=11435, help="Puerto del servidor")
+    parser.add_argument("--latency", type=float, default=0.5, help="Latencia de evaluación del prompt (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Velocidad de generación simulada")
+    parser.add_argument("--load-time", type=float, default=3.0, help="Tiempo de carga del modelo en frío (s)")
+
+    args = parser.parse_args()
+
+    simulator.latency = args.latency
+    simulator.tokens_per_second = args.tokens_per_second
+    simulator.load_time = args.load_time
+
+    run_mock_server(host=args.host, port=args.port)